@@ -0,0 +1,207 @@
+"""
+Response Cache
+--------------
+In-process LRU cache for analytics responses. Answers only change when
+the dataset does, so serialized bodies are cached per endpoint, query
+string and dataset version, and served with ``ETag`` / ``Cache-Control``
+headers so clients can revalidate with a cheap 304, plus the dataset
+version in ``X-Dataset-Version``.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+from api.core.config import settings
+from api.core.engine import engine
+from api.core.metrics import CACHE_REQUESTS, TimedRoute, current_timer, registry, request_phase
+
+logger = logging.getLogger(__name__)
+
+# Response header naming the dataset version a response was computed from
+DATASET_VERSION_HEADER = "X-Dataset-Version"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    A serialized response body with its validator.
+
+    Attributes:
+        body (bytes): The encoded response payload.
+        media_type (str): Content type of ``body``.
+        etag (str): Strong entity tag derived from the body.
+        stored_at (float): Monotonic time the entry was created.
+    """
+    body: bytes
+    media_type: str
+    etag: str
+    stored_at: float
+
+    @classmethod
+    def from_body(cls, body: bytes, media_type: str) -> "CachedResponse":
+        """Builds an entry, hashing the body into its ETag."""
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        return cls(body=body, media_type=media_type, etag=f'"{digest}"', stored_at=time.monotonic())
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an ``If-None-Match`` header already names this entity."""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+    def respond(self, request: Request) -> Response:
+        """Returns the full body, or an empty 304 if the client is up to date."""
+        headers = {"ETag": self.etag, "Cache-Control": cache_control()}
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+
+def cache_control() -> str:
+    """``Cache-Control`` value for analytics responses."""
+    if settings.RESPONSE_CACHE_MAX_AGE > 0:
+        return f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}"
+    # Clients may store the response but must revalidate before reuse.
+    return "no-cache"
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU map from request keys to cached responses.
+
+    Entries are evicted when the cache exceeds ``max_entries`` or when
+    they are older than ``ttl`` seconds.
+
+    Attributes:
+        max_entries (int): Maximum number of cached responses (0 disables caching).
+        ttl (float): Maximum age of an entry in seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        """
+        Args:
+            max_entries (int): Maximum number of cached responses.
+            ttl (float): Maximum age of an entry in seconds.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """
+        Looks up a fresh entry and marks it as recently used.
+
+        Args:
+            key (Hashable): Request key.
+
+        Returns:
+            Optional[CachedResponse]: The entry, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> CachedResponse:
+        """
+        Stores an entry, evicting the least recently used ones if needed.
+
+        Args:
+            key (Hashable): Request key.
+            entry (CachedResponse): Response to cache.
+
+        Returns:
+            CachedResponse: The stored entry.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Drops every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+registry.gauge("movie_api_response_cache_entries", "Responses currently held by the response cache.",
+               callback=lambda: len(response_cache))
+
+
+class CachedRoute(TimedRoute):
+    """
+    Route class that serves GET responses from ``response_cache``.
+
+    The dataset snapshot is pinned on ``request.state`` before the
+    endpoint runs, so the cache key and the data always agree even if a
+    reload lands mid-request. Entries are keyed by the dataset version,
+    which is derived from the content, so reloading identical data keeps
+    them valid. On a hit, the endpoint, response validation and
+    serialization are all skipped. Lookups are counted per route as hits
+    or misses in the request metrics. Every response names the dataset
+    version it was computed from in the ``X-Dataset-Version`` header.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def versioned_handler(request: Request) -> Response:
+            response = await cached_handler(request)
+            snapshot = getattr(request.state, "snapshot", None)
+            if snapshot is not None:
+                response.headers[DATASET_VERSION_HEADER] = snapshot.version.tag
+            return response
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET" or not response_cache.enabled or engine.snapshot is None:
+                return await handler(request)
+
+            with request_phase("acquire"):
+                snapshot = engine.acquire()
+            request.state.snapshot = snapshot
+            key = (
+                request.url.path,
+                tuple(sorted(request.query_params.multi_items())),
+                snapshot.version.tag,
+            )
+            entry = response_cache.get(key)
+            result = "miss" if entry is None else "hit"
+            CACHE_REQUESTS.inc(route=self.path, result=result)
+            timer = current_timer()
+            if timer is not None:
+                timer.cache = result
+            if entry is None:
+                response = await handler(request)
+                if response.status_code != 200:
+                    return response
+                entry = response_cache.put(key, CachedResponse.from_body(bytes(response.body), response.media_type))
+            return entry.respond(request)
+
+        return versioned_handler
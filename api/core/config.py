@@ -6,6 +6,7 @@ Loads environment variables and defines global project constants.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Movie Analytics Platform"
@@ -15,6 +16,61 @@ class Settings(BaseSettings):
     BASE_DIR: Path = Path(__file__).resolve().parent.parent.parent
     RAW_DATA_PATH: Path = BASE_DIR / "data" / "raw_movies.csv"
     CLEANED_DATA_PATH: Path = BASE_DIR / "data" / "cleaned_movies.csv"
+    # Storage format for the cleaned dataset. CSV is always written as a
+    # fallback; "feather"/"parquet" add a memory-mapped columnar artifact.
+    DATA_FORMAT: Literal["csv", "feather", "parquet"] = "feather"
+
+    # Peak memory budget (MB) for the streaming preprocessing mode
+    PREPROCESS_MEMORY_MB: int = 512
+
+    # Dataset hot reload (seconds between on-disk change checks)
+    DATA_HOT_RELOAD: bool = True
+    DATA_POLL_INTERVAL: float = 2.0
+
+    # Directory (ideally on tmpfs, e.g. /dev/shm/movie-analytics) where the
+    # loaded dataset is published once and memory-mapped by every API
+    # worker on the host. Unset: each worker keeps a private copy.
+    SHARED_MEMORY_DIR: Optional[Path] = None
+
+    # Load only the columns the analytics read, with compact dtypes
+    # (categoricals, interned titles, lossless 32-bit numerics).
+    COMPACT_DATASET: bool = True
+
+    # Answer yearly-trends, language-stats and top-rated from the sketches
+    # built at preprocessing time, with error bounds, unless a request
+    # passes approximate=false. Requests can also opt in one by one.
+    APPROXIMATE_ANALYTICS: bool = False
+
+    # In-process response cache for analytics endpoints (0 entries disables
+    # it). Entries are keyed by dataset version, so the TTL only bounds memory
+    # held by rarely used queries. RESPONSE_CACHE_MAX_AGE > 0 lets clients
+    # reuse responses without revalidating.
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_CACHE_TTL: float = 300.0
+    RESPONSE_CACHE_MAX_AGE: int = 0
+
+    # Encode analytics results directly to JSON bytes (needs orjson);
+    # the output is identical to the validated Pydantic response.
+    FAST_JSON: bool = True
+
+    # Neighbours precomputed per movie for /movies/{id}/similar (0 computes
+    # every lookup on demand). The table build is quadratic in catalog size.
+    SIMILAR_TABLE_SIZE: int = 0
+
+    # Call every analytics endpoint once after the startup load, before
+    # /ready reports the process as ready.
+    STARTUP_WARMUP: bool = True
+
+    # Threads running analytics work off the event loop, and the number of
+    # distinct computations that may be queued or running before new
+    # requests are shed with 503 (0 never sheds).
+    ANALYTICS_WORKERS: int = 4
+    ANALYTICS_MAX_PENDING: int = 64
+
+    # Prometheus-text request metrics on /metrics, and per-phase timings
+    # (acquire, compute, serialize) in a Server-Timing response header.
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING: bool = False
     
     CORS_ORIGINS: list[str] = ["*"]
     
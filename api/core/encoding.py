@@ -0,0 +1,218 @@
+"""
+Fast Response Encoding
+----------------------
+Encodes analytics result frames straight from their column arrays to
+JSON bytes, skipping the per-row dicts, Pydantic validation and
+``json.dumps`` of the default FastAPI response path. The output is
+byte-identical to that path; whenever identity cannot be guaranteed the
+caller falls back to it.
+"""
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Type, Union
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from api.core.config import settings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Python's float repr (used by json.dumps) switches to exponent notation
+# below this magnitude earlier than orjson does.
+_MIN_PLAIN_FLOAT = 1e-4
+
+
+def _column_values(values: "pd.Series", annotation: type) -> Optional[list]:
+    """
+    Converts one column to the Python values Pydantic would emit for a field.
+
+    Returns:
+        Optional[list]: The values, or None if the column needs the slow path
+        (nulls, non-finite or tiny floats, or values Pydantic would reject).
+    """
+    # Deferred so that importing the API does not load pandas; the modules
+    # are cached after the first response.
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if annotation is str:
+        if pd.api.types.infer_dtype(values, skipna=False) != "string" or values.isna().any():
+            return None
+        return values.tolist()
+    if annotation == List[str]:
+        items = values.tolist()
+        if not all(isinstance(item, list) and all(isinstance(v, str) for v in item) for item in items):
+            return None
+        return items
+    if annotation is date:
+        if not pd.api.types.is_datetime64_any_dtype(values) or values.isna().any():
+            return None
+        if (values != values.dt.normalize()).any() or (values.dt.year < 1000).any():
+            return None
+        return [day.isoformat() for day in values.dt.date]
+    if annotation == Optional[float]:
+        try:
+            array = values.to_numpy(dtype="float64", na_value=np.nan)
+        except (TypeError, ValueError):
+            return None
+        missing = np.isnan(array)
+        magnitude = np.abs(array[~missing])
+        if not np.all(np.isfinite(magnitude)) or np.any((magnitude > 0) & (magnitude < _MIN_PLAIN_FLOAT)):
+            return None
+        items = array.tolist()
+        for i in np.flatnonzero(missing):
+            items[i] = None
+        return items
+
+    if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+        return None
+    array = values.to_numpy()
+    if annotation is int:
+        if array.dtype.kind == "f":
+            if not np.all(np.isfinite(array)) or not np.all(array == np.floor(array)):
+                return None
+            array = array.astype("int64")
+        return array.tolist()
+    if annotation is float:
+        array = array.astype("float64")
+        if not np.all(np.isfinite(array)):
+            return None
+        magnitude = np.abs(array)
+        if np.any((magnitude > 0) & (magnitude < _MIN_PLAIN_FLOAT)):
+            return None
+        return array.tolist()
+    return None
+
+
+def encode_records(df: "pd.DataFrame", model: Type[BaseModel], columns: Dict[str, str], **fields) -> Optional[bytes]:
+    """
+    Encodes ``{**fields, "results": [rows]}`` as compact JSON bytes.
+
+    Args:
+        df (pd.DataFrame): Result rows.
+        model (Type[BaseModel]): Schema of one row; its field order and types
+                                 define the row encoding.
+        columns (Dict[str, str]): DataFrame column to schema field name.
+        **fields: Scalar envelope fields placed before "results".
+
+    Returns:
+        Optional[bytes]: The encoded payload, or None if the fast path cannot
+        reproduce the standard response exactly.
+    """
+    if orjson is None:
+        return None
+    sources = {field: column for column, field in columns.items()}
+    names, arrays = [], []
+    for name, info in model.model_fields.items():
+        column = sources.get(name)
+        if column is None or column not in df.columns:
+            return None
+        values = _column_values(df[column], info.annotation)
+        if values is None:
+            return None
+        names.append(name)
+        arrays.append(values)
+
+    payload = dict(fields)
+    payload["results"] = [dict(zip(names, row)) for row in zip(*arrays)]
+    return orjson.dumps(payload)
+
+
+def records_payload(df: "pd.DataFrame", model: Type[BaseModel], columns: Dict[str, str], **fields) -> Union[bytes, dict]:
+    """
+    Builds an analytics payload, using the fast encoder when possible.
+
+    Args:
+        df (pd.DataFrame): Result rows.
+        model (Type[BaseModel]): Schema of one row.
+        columns (Dict[str, str]): DataFrame column to schema field name.
+        **fields: Scalar envelope fields placed before "results".
+
+    Returns:
+        Union[bytes, dict]: Encoded JSON, or the plain payload, which still
+        needs validating against the response model.
+    """
+    if settings.FAST_JSON:
+        body = encode_records(df, model, columns, **fields)
+        if body is not None:
+            return body
+    return {**fields, "results": df.rename(columns=columns).to_dict(orient="records")}
+
+
+def validated_payload(
+    df: "pd.DataFrame", model: Type[BaseModel], columns: Dict[str, str], response_model: Type[BaseModel], **fields
+) -> Union[bytes, dict]:
+    """
+    Builds an analytics payload that is ready to embed in a larger response.
+
+    Like ``records_payload``, but the plain payload is validated against
+    the response model and converted to JSON-compatible values.
+
+    Args:
+        df (pd.DataFrame): Result rows.
+        model (Type[BaseModel]): Schema of one row.
+        columns (Dict[str, str]): DataFrame column to schema field name.
+        response_model (Type[BaseModel]): Schema of the whole payload.
+        **fields: Scalar envelope fields placed before "results".
+
+    Returns:
+        Union[bytes, dict]: Encoded JSON, or the validated payload.
+    """
+    payload = records_payload(df, model, columns, **fields)
+    if isinstance(payload, bytes):
+        return payload
+    return response_model.model_validate(payload).model_dump(mode="json")
+
+
+def records_response(df: "pd.DataFrame", model: Type[BaseModel], columns: Dict[str, str], **fields) -> Union[Response, dict]:
+    """
+    Builds an analytics response, using the fast encoder when possible.
+
+    Args:
+        df (pd.DataFrame): Result rows.
+        model (Type[BaseModel]): Schema of one row.
+        columns (Dict[str, str]): DataFrame column to schema field name.
+        **fields: Scalar envelope fields placed before "results".
+
+    Returns:
+        Union[Response, dict]: Pre-encoded JSON, or the plain payload for
+        FastAPI to validate and serialize.
+    """
+    payload = records_payload(df, model, columns, **fields)
+    if isinstance(payload, bytes):
+        return Response(content=payload, media_type="application/json")
+    return payload
+
+
+def _embed_encoded(value: object) -> object:
+    """orjson ``default`` hook that splices pre-encoded JSON bytes in verbatim."""
+    if isinstance(value, bytes):
+        return orjson.Fragment(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def composite_response(payload: dict) -> Response:
+    """
+    Encodes a JSON object some of whose values are already-encoded JSON bytes.
+
+    Used to combine several ``records_payload`` results without decoding
+    them again. Byte values only occur when orjson is installed.
+
+    Args:
+        payload (dict): JSON-compatible values, or bytes holding encoded JSON.
+
+    Returns:
+        Response: The combined JSON response.
+    """
+    if orjson is not None:
+        return Response(content=orjson.dumps(payload, default=_embed_encoded), media_type="application/json")
+    return JSONResponse(content=payload)
@@ -0,0 +1,257 @@
+"""
+Analytics Engine Registry
+-------------------------
+Owns the single, process-wide MovieAnalytics instance used by the API.
+The dataset is loaded once at startup and swapped atomically whenever
+preprocessing publishes a new cleaned file.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from api.core.config import settings
+from api.core.metrics import record_dataset_load, registry
+from processing.manifest import dataset_version
+from processing.paths import resolve_source
+
+if TYPE_CHECKING:
+    from processing.analytics import MovieAnalytics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DatasetVersion:
+    """
+    Identifies one revision of the cleaned dataset.
+
+    Versions compare by tag only, so re-publishing identical data is not
+    a change, and every instance serving the same data reports the same tag.
+
+    Attributes:
+        tag (str): Short opaque identifier suitable for headers and cache
+            keys: the content hash from the dataset manifest, or the data
+            file's mtime and size for datasets written without one.
+        manifest (Optional[dict]): The dataset manifest, if there is one.
+    """
+    tag: str
+    manifest: Optional[dict] = field(default=None, compare=False)
+
+
+@dataclass(frozen=True)
+class EngineSnapshot:
+    """
+    An immutable pairing of a loaded analytics instance and its version.
+
+    Requests hold a reference to the snapshot they started with, so a
+    concurrent reload never changes the data underneath them.
+    """
+    analytics: "MovieAnalytics"
+    version: DatasetVersion
+    generation: int
+    loaded_at: datetime
+
+
+class AnalyticsEngine:
+    """
+    Process-wide holder for the active MovieAnalytics snapshot.
+
+    The engine reads the dataset manifest, a single small file, at most
+    once per ``poll_interval`` seconds; the data files themselves are not
+    touched until the version changes. When a change is detected the new data is
+    loaded on a background thread and published with a single reference
+    assignment; in-flight requests keep using the snapshot they acquired.
+
+    Attributes:
+        data_path (Path): Path to the cleaned dataset being served.
+        poll_interval (float): Minimum seconds between change checks.
+        hot_reload (bool): Whether on-disk changes are picked up automatically.
+    """
+
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        poll_interval: Optional[float] = None,
+        hot_reload: Optional[bool] = None,
+    ):
+        """
+        Initializes the engine without touching the filesystem.
+
+        Args:
+            data_path (Optional[Path]): Dataset path. Defaults to settings.CLEANED_DATA_PATH.
+            poll_interval (Optional[float]): Defaults to settings.DATA_POLL_INTERVAL.
+            hot_reload (Optional[bool]): Defaults to settings.DATA_HOT_RELOAD.
+        """
+        self.data_path = Path(data_path or settings.CLEANED_DATA_PATH)
+        self.poll_interval = settings.DATA_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.hot_reload = settings.DATA_HOT_RELOAD if hot_reload is None else hot_reload
+        self._snapshot: Optional[EngineSnapshot] = None
+        self._reload_lock = threading.Lock()
+        self._last_check = 0.0
+
+    @property
+    def snapshot(self) -> Optional[EngineSnapshot]:
+        """The currently published snapshot, or None before the first load."""
+        return self._snapshot
+
+    @property
+    def source_path(self) -> Path:
+        """The artifact actually loaded: the columnar file if present, else CSV."""
+        return resolve_source(self.data_path, settings.DATA_FORMAT)[0]
+
+    def _poll(self) -> Optional[DatasetVersion]:
+        """Returns the on-disk version of the dataset, or None if it is missing."""
+        tag, manifest = dataset_version(self.data_path, settings.DATA_FORMAT)
+        return None if tag is None else DatasetVersion(tag=tag, manifest=manifest)
+
+    def load(self, force: bool = False) -> EngineSnapshot:
+        """
+        Loads the dataset from disk and publishes it as the active snapshot.
+
+        Blocks the caller until the load finishes. Concurrent callers are
+        serialized so the file is parsed at most once per change.
+
+        Args:
+            force (bool): Re-read the file even if its version is unchanged.
+
+        Returns:
+            EngineSnapshot: The newly published snapshot.
+
+        Raises:
+            FileNotFoundError: If the cleaned data file does not exist.
+        """
+        with self._reload_lock:
+            return self._load_locked(force)
+
+    def _load_locked(self, force: bool = False) -> EngineSnapshot:
+        """Performs the load; the caller must hold ``_reload_lock``."""
+        version = self._poll()
+        if version is None:
+            raise FileNotFoundError(f"Cleaned data not found at {self.data_path}. Run preprocessing first.")
+
+        current = self._snapshot
+        if current is not None and current.version == version and not force:
+            return current
+
+        # Imported here so that importing the API does not load pandas
+        from processing.analytics import MovieAnalytics
+
+        started = time.perf_counter()
+        try:
+            analytics = MovieAnalytics(self.data_path, shared_dir=settings.SHARED_MEMORY_DIR).load()
+        except Exception:
+            record_dataset_load(time.perf_counter() - started, success=False)
+            raise
+        elapsed = time.perf_counter() - started
+        record_dataset_load(elapsed)
+        if analytics.version is not None:
+            # The version the analytics actually read, should it have moved on
+            version = DatasetVersion(tag=analytics.version, manifest=analytics.manifest)
+        snapshot = EngineSnapshot(
+            analytics=analytics,
+            version=version,
+            generation=(current.generation + 1) if current else 1,
+            loaded_at=datetime.now(timezone.utc),
+        )
+        # A single reference assignment is atomic, so readers see either
+        # the old snapshot or the new one, never a partial state.
+        self._snapshot = snapshot
+        self._last_check = time.monotonic()
+        logger.info(
+            f"Dataset version {version.tag} (generation {snapshot.generation}) "
+            f"loaded in {elapsed:.3f}s ({analytics.memory_footprint()['total'] / 2**20:.1f} MiB)"
+        )
+        return snapshot
+
+    def _reload_in_background(self) -> None:
+        """Reload target for the watcher thread; the caller already holds the lock."""
+        try:
+            self._load_locked()
+        except Exception as e:
+            logger.error(f"Background dataset reload failed, keeping previous snapshot: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def _check_for_update(self) -> None:
+        """Starts a background reload if the dataset changed since the last load."""
+        now = time.monotonic()
+        if now - self._last_check < self.poll_interval:
+            return
+        self._last_check = now
+
+        version = self._poll()
+        current = self._snapshot
+        if version is None or current is None or version == current.version:
+            return
+
+        # Only one reload at a time; everyone else keeps serving the old data.
+        if self._reload_lock.acquire(blocking=False):
+            logger.info(f"Dataset change detected ({current.version.tag} -> {version.tag}), reloading")
+            threading.Thread(
+                target=self._reload_in_background,
+                name="dataset-reload",
+                daemon=True,
+            ).start()
+
+    def acquire(self) -> EngineSnapshot:
+        """
+        Returns the active snapshot, loading it on first use.
+
+        Raises:
+            FileNotFoundError: If no dataset has been loaded and none exists on disk.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.load()
+        if self.hot_reload:
+            self._check_for_update()
+        return snapshot
+
+    def get_analytics(self) -> "MovieAnalytics":
+        """Shortcut for ``acquire().analytics``."""
+        return self.acquire().analytics
+
+    def info(self) -> dict:
+        """
+        Describes the dataset currently being served.
+
+        Returns:
+            dict: Version tag, content hash and build time from the manifest,
+            generation, load time, row count and memory footprint in bytes.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {
+                "version": None,
+                "content_hash": None,
+                "built_at": None,
+                "generation": 0,
+                "path": str(self.source_path),
+                "loaded_at": None,
+                "row_count": None,
+                "memory_bytes": None,
+            }
+        manifest = snapshot.version.manifest or {}
+        return {
+            "version": snapshot.version.tag,
+            "content_hash": manifest.get("content_hash"),
+            "built_at": manifest.get("built_at"),
+            "generation": snapshot.generation,
+            "path": str(self.source_path),
+            "loaded_at": snapshot.loaded_at,
+            "row_count": len(snapshot.analytics.df),
+            "memory_bytes": snapshot.analytics.memory_footprint(),
+        }
+
+
+engine = AnalyticsEngine()
+registry.gauge("movie_api_dataset_generation", "Generation of the dataset snapshot being served (0 before the first load).",
+               callback=lambda: engine.snapshot.generation if engine.snapshot else 0)
+registry.gauge("movie_api_dataset_rows", "Movies in the dataset snapshot being served.",
+               callback=lambda: len(engine.snapshot.analytics.df) if engine.snapshot else 0)
+registry.gauge("movie_api_dataset_memory_bytes", "Bytes held by the served dataset and its indexes.",
+               callback=lambda: engine.snapshot.analytics.memory_footprint()["total"] if engine.snapshot else 0)
@@ -0,0 +1,159 @@
+"""
+Analytics Executor
+------------------
+Runs CPU-bound analytics work off the event loop on a dedicated, bounded
+thread pool. Identical concurrent calls are coalesced into one
+computation (single-flight), and new requests are refused once the
+backlog is full, so overload surfaces as fast 503s instead of an
+ever-growing queue.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi import HTTPException
+
+from api.core.config import settings
+from api.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Seconds clients are asked to wait before retrying a shed request
+RETRY_AFTER_SECONDS = 1
+
+
+class AnalyticsExecutor:
+    """
+    Bounded thread pool with single-flight de-duplication of calls.
+
+    ``run`` is awaited from request handlers. A call is identified by
+    its function, the object it is bound to and its arguments; while one
+    is executing, identical calls await the same result instead of
+    queueing another computation. Results are shared, so callers must
+    treat them as read-only.
+
+    ``pending`` counts distinct computations queued or running. Once it
+    reaches ``max_pending`` the executor reports itself ``saturated``
+    and request handlers shed new work with a 503.
+
+    The pool is created on first use, so importing this module starts
+    no threads (uvicorn may fork workers after import).
+
+    Attributes:
+        workers (int): Threads in the pool.
+        max_pending (int): Backlog that saturates the executor (0 = unbounded).
+        pending (int): Distinct computations queued or running.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        """
+        Args:
+            workers (int): Threads in the pool.
+            max_pending (int): Backlog that saturates the executor (0 = unbounded).
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.pending = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._coalesced = registry.counter(
+            "movie_api_executor_coalesced_total", "Analytics calls answered by an identical in-flight computation.")
+        self._rejected = registry.counter(
+            "movie_api_executor_rejected_total", "Requests shed with 503 because the analytics backlog was full.")
+        self._queue_wait = registry.histogram(
+            "movie_api_executor_queue_seconds", "Time analytics computations waited for a pool thread.")
+        registry.gauge("movie_api_executor_pending", "Distinct analytics computations queued or running.",
+                       callback=lambda: self.pending)
+
+    @property
+    def saturated(self) -> bool:
+        """Whether the backlog is full."""
+        return 0 < self.max_pending <= self.pending
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analytics")
+        return self._pool
+
+    def admit(self) -> None:
+        """
+        Refuses a new request while the backlog is full.
+
+        Raises:
+            HTTPException: 503 with a ``Retry-After`` header if saturated.
+        """
+        if self.saturated:
+            self._rejected.inc()
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please retry shortly.",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+    @staticmethod
+    def _call_key(fn: Callable, args: tuple, kwargs: dict) -> Optional[Hashable]:
+        """Identity of a call, or None if its arguments are not hashable."""
+        owner = getattr(fn, "__self__", None)
+        key = (id(owner), getattr(fn, "__qualname__", repr(fn)), args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs ``fn(*args, **kwargs)`` on the pool and returns its result.
+
+        The caller's context variables (such as the request timer) are
+        visible to ``fn``. If the awaiting request is cancelled the
+        computation still completes for any other callers sharing it.
+
+        Args:
+            fn (Callable[..., Any]): The blocking function.
+            *args (Any): Positional arguments, hashable for coalescing.
+            **kwargs (Any): Keyword arguments, hashable for coalescing.
+
+        Returns:
+            Any: What ``fn`` returned; shared with coalesced callers.
+        """
+        key = self._call_key(fn, args, kwargs)
+        future = self._inflight.get(key) if key is not None else None
+        if future is not None:
+            self._coalesced.inc()
+            return await asyncio.shield(future)
+
+        context = contextvars.copy_context()
+        submitted = time.perf_counter()
+
+        def call() -> Any:
+            self._queue_wait.observe(time.perf_counter() - submitted)
+            return context.run(fn, *args, **kwargs)
+
+        future = asyncio.get_running_loop().run_in_executor(self._executor(), call)
+        self.pending += 1
+        if key is not None:
+            self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Optional[Hashable], future: asyncio.Future) -> None:
+        """Done callback of a computation; runs on the event loop."""
+        self.pending -= 1
+        if key is not None and self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            future.exception()
+
+    def shutdown(self) -> None:
+        """Stops the pool after the running computations finish."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+analytics_executor = AnalyticsExecutor(settings.ANALYTICS_WORKERS, settings.ANALYTICS_MAX_PENDING)
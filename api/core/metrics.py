@@ -0,0 +1,379 @@
+"""
+Request Metrics
+---------------
+Dependency-free Prometheus instrumentation for the API. A pure ASGI
+middleware times every request per route template, request handlers
+break that time down into phases (engine acquire, analytics compute and
+serialization), and ``/metrics`` renders everything in the Prometheus
+text exposition format. Optionally each response carries the phase
+timings in a ``Server-Timing`` header.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.core.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds in seconds. Most analytics requests finish in well
+# under a millisecond to a few milliseconds; loads take seconds.
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOAD_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Route label for requests that matched no route, so unknown paths
+# cannot grow the label set without bound.
+UNMATCHED_ROUTE = "unmatched"
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """
+    Base class of a labelled metric family.
+
+    Attributes:
+        name (str): Metric name.
+        help (str): Help text.
+        label_names (Tuple[str, ...]): Names of the labels.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        """Exposition lines of every series, without the header."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """The family in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Metric):
+    """
+    Point-in-time value, either set directly or read from a callback at
+    scrape time.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = (), callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, help, label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        if self._callback is not None:
+            return [f"{self.name} {_format_value(self._callback())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = REQUEST_BUCKETS):
+        super().__init__(name, help, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative) ..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Ordered collection of metric families rendered together.
+
+    Metrics are per process; with several workers each one reports its
+    own series.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, label_names))
+
+    def gauge(self, name: str, help: str, label_names: Sequence[str] = (), callback: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, help, label_names, callback))
+
+    def histogram(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = REQUEST_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, label_names, buckets))
+
+    def render(self) -> str:
+        """Every family in Prometheus text format, newline-terminated."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "movie_api_requests_total", "HTTP requests by route template, method and status code.",
+    ("method", "route", "status"),
+)
+REQUEST_DURATION = registry.histogram(
+    "movie_api_request_duration_seconds", "End-to-end HTTP request latency.",
+    ("method", "route"),
+)
+REQUEST_PHASES = registry.histogram(
+    "movie_api_request_phase_seconds",
+    "Time spent per request phase: acquire (engine snapshot and any load), compute (analytics) and serialize.",
+    ("route", "phase"),
+)
+IN_PROGRESS = registry.gauge("movie_api_requests_in_progress", "HTTP requests currently being served.")
+CACHE_REQUESTS = registry.counter(
+    "movie_api_response_cache_requests_total", "Response cache lookups by route and result (hit or miss).",
+    ("route", "result"),
+)
+DATASET_LOAD_DURATION = registry.histogram(
+    "movie_api_dataset_load_seconds", "Duration of dataset loads, including index builds.",
+    ("result",), buckets=LOAD_BUCKETS,
+)
+
+
+class RequestTimer:
+    """
+    Phase durations of one request.
+
+    Attributes:
+        phases (Dict[str, float]): Seconds spent per phase.
+        marks (Dict[str, float]): ``perf_counter`` time each phase last ended.
+        cache (Optional[str]): "hit" or "miss" when the response cache was consulted.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self.cache: Optional[str] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """``Server-Timing`` header value, durations in milliseconds."""
+        entries = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in self.phases.items()]
+        if self.cache is not None:
+            entries.append(f'cache;desc="{self.cache}"')
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("request_timer", default=None)
+
+
+def current_timer() -> Optional[RequestTimer]:
+    """The timer of the request being handled, or None outside one (or with metrics off)."""
+    return _current_timer.get()
+
+
+@contextmanager
+def request_phase(phase: str) -> Iterator[None]:
+    """
+    Adds the duration of the block to ``phase`` of the current request.
+
+    Does nothing outside an instrumented request, so analytics code can be
+    called from scripts unchanged.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        timer.add(phase, end - start)
+        timer.marks[phase] = end
+
+
+def record_dataset_load(seconds: float, success: bool = True) -> None:
+    """Records the duration of one dataset load."""
+    DATASET_LOAD_DURATION.observe(seconds, result="success" if success else "error")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that times requests and publishes their phases.
+
+    A pure ASGI middleware rather than ``BaseHTTPMiddleware``, so it adds
+    no extra task or response streaming per request. The request's
+    ``RequestTimer`` is exposed through a context variable, which the
+    thread pool running sync endpoints inherits.
+
+    Attributes:
+        app (ASGIApp): The wrapped application.
+        server_timing (bool): Add a ``Server-Timing`` header to responses.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: Optional[bool] = None):
+        self.app = app
+        self.server_timing = settings.SERVER_TIMING if server_timing is None else server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timer.server_timing(time.perf_counter() - start).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_PROGRESS.dec()
+            _current_timer.reset(token)
+            elapsed = time.perf_counter() - start
+            route = _route_template(scope)
+            method = scope.get("method", "")
+            REQUESTS.inc(method=method, route=route, status=str(status))
+            REQUEST_DURATION.observe(elapsed, method=method, route=route)
+            for phase, seconds in timer.phases.items():
+                REQUEST_PHASES.observe(seconds, route=route, phase=phase)
+
+
+class TimedRoute(APIRoute):
+    """
+    Route class that attributes post-compute handler time to serialization.
+
+    Endpoints mark their analytics call with ``request_phase("compute")``.
+    Everything the handler does after that phase ends (building the
+    payload, response-model validation and JSON encoding) is recorded as
+    the "serialize" phase.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            response = await handler(request)
+            timer = _current_timer.get()
+            if timer is not None and "compute" in timer.marks:
+                timer.add("serialize", time.perf_counter() - timer.marks["compute"])
+            return response
+
+        return timed_handler
+
+
+def _route_template(scope: Scope) -> str:
+    """Path template of the matched route (e.g. ``/api/v1/movies/{movie_id}/similar``)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
@@ -0,0 +1,142 @@
+"""
+Startup Warm-Up
+---------------
+Brings a new API process up to speed in the background: loads the
+dataset, builds its indexes and calls every analytics endpoint once, so
+the first real requests after a deploy do not pay for cold caches and
+first-call overheads. Readiness is reported only once this has finished,
+while liveness checks are answered from the moment the server starts.
+"""
+import logging
+import time
+from typing import Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+
+from api.core.config import settings
+from api.core.engine import engine
+from api.core.executor import analytics_executor
+from api.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Requests replayed during warm-up, relative to settings.API_V1_STR.
+# Together they touch every index and the fast and fallback encoders.
+WARMUP_PATHS: Tuple[str, ...] = (
+    "/movies/most-popular",
+    "/movies/ranked?by=vote_count",
+    "/movies/ranked?by=vote_average",
+    "/movies/top-rated",
+    "/movies/top-rated?approximate=true",
+    "/movies/query",
+    "/movies/query?genre=Drama&year_from=2000&min_votes=100&sort_by=release_date",
+    "/movies/search?q=the",
+    "/movies/search?q=lo",
+    "/movies/0/similar",
+    "/movies/by-genre",
+    "/movies/yearly-trends",
+    "/movies/language-stats",
+    "/movies/language-stats?approximate=true",
+    "/movies/timeseries/releases?freq=month&by=genre",
+    "/movies/timeseries/rolling?by=language&group=en",
+    "/dataset",
+)
+
+
+class Readiness:
+    """
+    Startup state of this process.
+
+    Attributes:
+        warmed_up (bool): Whether the startup warm-up has finished (or failed).
+        duration (Optional[float]): Seconds the warm-up took.
+    """
+
+    def __init__(self):
+        self.warmed_up = False
+        self.duration: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the process should receive traffic: warmed up and serving a dataset."""
+        return self.warmed_up and engine.snapshot is not None
+
+    @property
+    def status(self) -> str:
+        """"ready", "warming_up" or "no_data"."""
+        if not self.warmed_up:
+            return "warming_up"
+        return "ready" if engine.snapshot is not None else "no_data"
+
+
+readiness = Readiness()
+registry.gauge("movie_api_ready", "1 once the process has warmed up and is serving a dataset.",
+               callback=lambda: 1 if readiness.ready else 0)
+
+
+async def _get(app: FastAPI, url: str) -> int:
+    """
+    Sends one GET request through the app's router and returns its status.
+
+    The request goes straight to the router, skipping the middleware, so
+    warm-up traffic does not show up in the request metrics.
+    """
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"warmup")],
+        "client": None,
+        "server": None,
+        "app": app,
+    }
+    status = 500
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app.router(scope, receive, send)
+    return status
+
+
+async def warm_up(app: FastAPI, paths: Sequence[str] = WARMUP_PATHS) -> None:
+    """
+    Loads the dataset and, if STARTUP_WARMUP is set, calls each endpoint once.
+
+    Runs as a background task of the lifespan. The load goes through the
+    analytics executor, so requests arriving meanwhile share it rather
+    than starting their own. A missing dataset is not fatal: the process
+    stays live but not ready until a dataset is loaded.
+
+    Args:
+        app (FastAPI): The application to warm up.
+        paths (Sequence[str]): Requests to replay, relative to the API prefix.
+    """
+    started = time.perf_counter()
+    try:
+        await analytics_executor.run(engine.load)
+        if settings.STARTUP_WARMUP:
+            for path in paths:
+                status = await _get(app, settings.API_V1_STR + path)
+                if status != 200:
+                    logger.warning(f"Warm-up request {path} returned {status}")
+    except FileNotFoundError as e:
+        logger.warning(f"Starting without data: {e}")
+    except Exception as e:
+        logger.error(f"Startup warm-up failed: {e}")
+    finally:
+        readiness.duration = time.perf_counter() - started
+        readiness.warmed_up = True
+    logger.info(f"Startup warm-up finished in {readiness.duration:.3f}s ({readiness.status})")
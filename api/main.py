@@ -2,27 +2,52 @@
 Main API Entry Point
 --------------------
 Initializes the FastAPI application, configures CORS, and registers 
-all versioned route routers.
+all versioned route routers. Heavy data libraries (pandas, NumPy) are
+imported on the first dataset load, not when this module is imported.
 """
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import logging
 
 from api.core.config import settings
-from api.routes import router as movies_router
+from api.core.engine import engine
+from api.core.executor import analytics_executor
+from api.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+from api.core.warmup import readiness, warm_up
+from api.routes import router as movies_router, dataset_router
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts loading and warming up the shared analytics dataset.
+
+    The warm-up runs in the background, so the server accepts connections
+    (and answers the ``/`` liveness check) immediately; ``/ready`` reports
+    when it has finished. A missing dataset is not fatal: the API still
+    starts and analytics endpoints answer 503 until preprocessing has been
+    run. The analytics executor's threads are stopped on shutdown.
+    """
+    warmup = asyncio.create_task(warm_up(app))
+    yield
+    warmup.cancel()
+    analytics_executor.shutdown()
 
 def create_app() -> FastAPI:
     """
     Application factory for the Movie Analytics Platform.
 
     This function initializes the FastAPI instance, configures global 
-    middlewares (CORS), and attaches the versioned API routers.
+    middlewares (CORS, request metrics), and attaches the versioned API routers.
 
     Returns:
         FastAPI: A fully configured FastAPI application instance.
@@ -33,6 +58,7 @@ def create_app() -> FastAPI:
         version=settings.VERSION,
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # CORS Configuration
@@ -44,11 +70,26 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Request metrics; added last so it also times the CORS middleware
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING)
+
+        @app.get("/metrics", tags=["Health"], include_in_schema=False)
+        def metrics():
+            """
+            Exposes request, cache and dataset metrics for Prometheus.
+
+            Returns:
+                Response: Metrics in the Prometheus text exposition format.
+            """
+            return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
     # Include Routers
     app.include_router(movies_router, prefix=settings.API_V1_STR)
+    app.include_router(dataset_router, prefix=settings.API_V1_STR)
 
     @app.get("/", tags=["Health"])
-    def health_check():
+    async def health_check():
         """
         Public health check endpoint to verify API availability.
 
@@ -61,6 +102,23 @@ def create_app() -> FastAPI:
             "version": settings.VERSION
         }
 
+    @app.get("/ready", tags=["Health"])
+    async def readiness_check():
+        """
+        Readiness probe: succeeds once the dataset is loaded and warmed up.
+
+        Unlike the ``/`` liveness check, this fails while the process is
+        still starting or has no dataset, so load balancers can hold back
+        traffic until the first requests will be fast.
+
+        Returns:
+            dict: Status and the dataset version being served, or a 503
+            response with status "warming_up" or "no_data".
+        """
+        if not readiness.ready:
+            return JSONResponse(status_code=503, content={"status": readiness.status})
+        return {"status": readiness.status, "dataset_version": engine.info()["version"]}
+
     return app
 
 app = create_app()
\ No newline at end of file
@@ -4,37 +4,130 @@ Movie Analytics Routes
 Defines the RESTful API endpoints for movie analytics. 
 Integrates with the analytics engine via dependency injection.
 """
-from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Any
+from fastapi import APIRouter, Query, HTTPException, Depends, Request
+from datetime import date
+from typing import TYPE_CHECKING, List, Any, Literal, Optional, Union
 import logging
 
-from processing.analytics import MovieAnalytics
+from api.core.cache import CachedRoute
+from api.core.config import settings
+from api.core.encoding import composite_response, records_response, validated_payload
+from api.core.engine import EngineSnapshot, engine
+from api.core.executor import analytics_executor
+from api.core.metrics import request_phase
 from api.schemas import (
+    TopPopularMovie,
+    TopRatedMovie,
+    MovieQueryResult,
+    TitleSearchResult,
+    SimilarMovie,
+    MoviesByGenre,
+    MoviesPerYear,
+    MoviesByLanguage,
     TopPopularMoviesResponse,
+    RankedMoviesResponse,
     TopRatedMoviesResponse,
+    ApproximateTopRatedMoviesResponse,
+    MovieQueryResponse,
+    TitleSearchResponse,
+    SimilarMoviesResponse,
     MoviesByGenreResponse,
     MoviesPerYearResponse,
+    ApproximateMoviesPerYearResponse,
     MoviesByLanguageResponse,
+    ApproximateMoviesByLanguageResponse,
+    ReleaseCount,
+    RollingAverage,
+    ReleaseCountsResponse,
+    RollingAveragesResponse,
+    DatasetInfoResponse,
+    ErrorBound,
+    BatchRequest,
+    BatchResponse,
+    PanelSpec,
 )
 
-router = APIRouter(prefix="/movies", tags=["Analytics"])
+if TYPE_CHECKING:
+    # The analytics engine (and pandas) is imported on first load, not here
+    from processing.analytics import MovieAnalytics
+
+router = APIRouter(prefix="/movies", tags=["Analytics"], route_class=CachedRoute)
+dataset_router = APIRouter(prefix="/dataset", tags=["Dataset"])
 logger = logging.getLogger(__name__)
 
-# Dependency to get analytics instance
-def get_analytics():
+# DataFrame column -> response field name, per result type
+POPULAR_COLUMNS = {
+    "Title": "title",
+    "Popularity": "popularity",
+    "Vote_Average": "vote_average",
+    "Vote_Count": "vote_count",
+}
+TOP_RATED_COLUMNS = {
+    "Title": "title",
+    "Weighted_Rating": "weighted_rating",
+    "Vote_Average": "vote_average",
+    "Vote_Count": "vote_count",
+}
+QUERY_COLUMNS = {
+    "Movie_Id": "id",
+    "Title": "title",
+    "Release_Date": "release_date",
+    "Original_Language": "language",
+    "Genres": "genres",
+    "Popularity": "popularity",
+    "Vote_Average": "vote_average",
+    "Vote_Count": "vote_count",
+}
+SEARCH_COLUMNS = {
+    "Movie_Id": "id",
+    "Title": "title",
+    "Release_Date": "release_date",
+    "Popularity": "popularity",
+}
+SIMILAR_COLUMNS = {**QUERY_COLUMNS, "Distance": "distance"}
+GENRE_COLUMNS = {"Genre": "genre", "average_rating": "average_rating"}
+YEAR_COLUMNS = {"Year": "year", "movie_count": "movie_count"}
+LANGUAGE_COLUMNS = {"Original_Language": "language", "movie_count": "movie_count"}
+RELEASE_COUNT_COLUMNS = {"Group": "group", "Period": "period", "movie_count": "movie_count"}
+ROLLING_COLUMNS = {
+    **RELEASE_COUNT_COLUMNS,
+    "Vote_Average": "avg_vote_average",
+    "Popularity": "avg_popularity",
+}
+
+# Dependencies to get the dataset snapshot and its analytics instance
+async def get_snapshot(request: Request) -> EngineSnapshot:
     """
-    Dependency provider for the MovieAnalytics engine.
+    Dependency provider for the dataset snapshot serving this request.
 
-    Ensures the underlying data file is accessible before processing requests.
+    Returns the process-wide shared snapshot, which is loaded once and
+    hot-swapped when the cleaned dataset changes on disk. If the response
+    cache already pinned a snapshot for this request, that one is used;
+    otherwise the snapshot is pinned here, for the version header.
+    A first load runs on the analytics executor, so concurrent requests
+    share it and the event loop keeps serving.
+
+    Args:
+        request (Request): The incoming request.
 
     Returns:
-        MovieAnalytics: An instance of the analytics engine.
+        EngineSnapshot: The snapshot, with its analytics engine and version.
 
     Raises:
-        HTTPException: 503 error if the cleaned data file is missing.
+        HTTPException: 503 error if the analytics backlog is full or the
+        cleaned data file is missing.
     """
+    analytics_executor.admit()
+    snapshot = getattr(request.state, "snapshot", None)
+    if snapshot is not None:
+        return snapshot
     try:
-        return MovieAnalytics()
+        with request_phase("acquire"):
+            if engine.snapshot is None:
+                await analytics_executor.run(engine.load)
+            snapshot = engine.acquire()
+        request.state.snapshot = snapshot
+        return snapshot
     except FileNotFoundError as e:
         logger.error(f"Data dependency error: {e}")
         raise HTTPException(
@@ -42,10 +135,49 @@ def get_analytics():
             detail="Data layer not initialized. Please run preprocessing."
         )
 
+async def get_analytics(snapshot: EngineSnapshot = Depends(get_snapshot)):
+    """
+    Dependency provider for the MovieAnalytics engine.
+
+    Args:
+        snapshot (EngineSnapshot): Injected dataset snapshot.
+
+    Returns:
+        MovieAnalytics: The shared analytics engine instance.
+    """
+    return snapshot.analytics
+
+APPROXIMATE_QUERY = Query(
+    None,
+    description="Answer from preprocessing-time sketches, with error bounds "
+                "(defaults to the server's APPROXIMATE_ANALYTICS setting)",
+)
+
+# Exact response model -> response model of its approximate variant
+APPROXIMATE_RESPONSES = {
+    TopRatedMoviesResponse: ApproximateTopRatedMoviesResponse,
+    MoviesPerYearResponse: ApproximateMoviesPerYearResponse,
+    MoviesByLanguageResponse: ApproximateMoviesByLanguageResponse,
+}
+
+def use_approximation(requested: Optional[bool]) -> bool:
+    """Whether to answer from sketches: the request's choice, else the server default."""
+    return settings.APPROXIMATE_ANALYTICS if requested is None else requested
+
+def approximate_response(df: Any, model: type, columns: dict, response_model: type, bound: dict) -> Any:
+    """
+    Builds the response of an approximate variant: the exact endpoint's
+    rows preceded by an ``error_bound`` object.
+    """
+    error_bound = ErrorBound(**bound).model_dump()
+    return composite_response(validated_payload(
+        df, model, columns, APPROXIMATE_RESPONSES[response_model], error_bound=error_bound,
+    ))
+
 @router.get("/most-popular", response_model=TopPopularMoviesResponse)
-def get_most_popular_movies(
+async def get_most_popular_movies(
     limit: int = Query(10, ge=1, le=50),
-    analytics: MovieAnalytics = Depends(get_analytics)
+    analytics: "MovieAnalytics" = Depends(get_analytics)
 ):
     """
     Retrieves the top N movies based on their raw popularity score.
@@ -58,52 +190,203 @@ def get_most_popular_movies(
         dict: Wrapped list of popular movies.
     """
     try:
-        df = analytics.get_top_popular_movies(limit)
-        results = df.rename(columns={
-            "Title": "title",
-            "Popularity": "popularity",
-            "Vote_Average": "vote_average",
-            "Vote_Count": "vote_count",
-        }).to_dict(orient="records")
-        return {"results": results}
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_top_popular_movies, limit)
+        return records_response(df, TopPopularMovie, POPULAR_COLUMNS)
     except Exception as e:
         logger.exception("Error fetching popular movies")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/top-rated", response_model=TopRatedMoviesResponse)
-def get_top_rated_movies(
+@router.get("/ranked", response_model=RankedMoviesResponse)
+async def get_ranked_movies(
+    by: Literal["popularity", "vote_count", "vote_average"] = Query("popularity"),
+    limit: int = Query(10, ge=1, le=50),
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
+    """
+    Retrieves the top N movies ranked by a raw metric.
+
+    Served from pre-sorted, de-duplicated ranking indexes, so each call is
+    a slice rather than a sort.
+
+    Args:
+        by (str): Ranking metric: popularity, vote_count or vote_average.
+        limit (int): Max number of movies to return (1-50). Defaults to 10.
+        analytics (MovieAnalytics): Injected analytics engine instance.
+
+    Returns:
+        dict: The metric used and the wrapped list of movies.
+    """
+    try:
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_top_movies, limit, by=by)
+        return records_response(df, TopPopularMovie, POPULAR_COLUMNS, by=by)
+    except Exception as e:
+        logger.exception("Error fetching ranked movies")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/top-rated", response_model=Union[TopRatedMoviesResponse, ApproximateTopRatedMoviesResponse])
+async def get_top_rated_movies(
     limit: int = Query(10, ge=1, le=50),
     min_votes: int = Query(500, ge=0),
-    analytics: MovieAnalytics = Depends(get_analytics)
+    approximate: Optional[bool] = APPROXIMATE_QUERY,
+    analytics: "MovieAnalytics" = Depends(get_analytics)
 ):
     """
     Retrieves top rated movies using a Bayesian weighted rating formula.
 
     This endpoint filters out movies with low vote counts to ensure ranking credibility.
+    In approximate mode the vote-count prior comes from the quantile sketch
+    and the response carries its estimate and certain bounds.
 
     Args:
         limit (int): Max number of movies to return (1-50). Defaults to 10.
         min_votes (int): Minimum vote threshold. Defaults to 500.
+        approximate (Optional[bool]): Use the sketch-based prior.
         analytics (MovieAnalytics): Injected analytics engine instance.
 
     Returns:
         dict: Wrapped list of top-rated movies.
     """
     try:
-        df = analytics.get_top_rated_movies(limit, min_votes)
-        results = df.rename(columns={
-            "Title": "title",
-            "Weighted_Rating": "weighted_rating",
-            "Vote_Average": "vote_average",
-            "Vote_Count": "vote_count",
-        }).to_dict(orient="records")
-        return {"results": results}
+        if use_approximation(approximate):
+            with request_phase("compute"):
+                df, bound = await analytics_executor.run(analytics.estimate_top_rated_movies, limit, min_votes)
+            return approximate_response(df, TopRatedMovie, TOP_RATED_COLUMNS, TopRatedMoviesResponse, bound)
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_top_rated_movies, limit, min_votes)
+        return records_response(df, TopRatedMovie, TOP_RATED_COLUMNS)
     except Exception as e:
         logger.exception("Error fetching top rated movies")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/query", response_model=MovieQueryResponse)
+async def query_movies(
+    genre: Optional[str] = Query(None, description="Genre name, e.g. 'Science Fiction'"),
+    language: Optional[str] = Query(None, description="Original language code, e.g. 'ja'"),
+    year_from: Optional[int] = Query(None, ge=1800, le=2200),
+    year_to: Optional[int] = Query(None, ge=1800, le=2200),
+    min_votes: Optional[int] = Query(None, ge=0),
+    min_rating: Optional[float] = Query(None, ge=0, le=10),
+    sort_by: Literal["popularity", "vote_count", "vote_average", "release_date"] = Query("popularity"),
+    order: Literal["desc", "asc"] = Query("desc"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
+    """
+    Filters movies by genre, language, release years and vote thresholds.
+
+    Filters are answered from posting-list indexes built at load time, and
+    results are paginated with an opaque cursor.
+
+    Args:
+        genre (Optional[str]): Genre to match (case-insensitive).
+        language (Optional[str]): Original language to match.
+        year_from (Optional[int]): First release year, inclusive.
+        year_to (Optional[int]): Last release year, inclusive.
+        min_votes (Optional[int]): Minimum vote count.
+        min_rating (Optional[float]): Minimum vote average.
+        sort_by (str): Sort key. Defaults to popularity.
+        order (str): "desc" or "asc". Defaults to "desc".
+        limit (int): Page size (1-100). Defaults to 20.
+        cursor (Optional[str]): Continue after the previous page.
+        analytics (MovieAnalytics): Injected analytics engine instance.
+
+    Returns:
+        dict: Total matches, the next-page cursor and the page of movies.
+
+    Raises:
+        HTTPException: 400 error if the cursor is invalid.
+    """
+    try:
+        with request_phase("compute"):
+            df, total, next_cursor = await analytics_executor.run(
+                analytics.query,
+                genre=genre,
+                language=language,
+                year_from=year_from,
+                year_to=year_to,
+                min_votes=min_votes,
+                min_rating=min_rating,
+                sort_by=sort_by,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+            )
+        return records_response(df, MovieQueryResult, QUERY_COLUMNS, total=total, next_cursor=next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Error querying movies")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/search", response_model=TitleSearchResponse)
+async def search_titles(
+    q: str = Query(..., min_length=1, max_length=200, description="Title words; the last one may be partial"),
+    limit: int = Query(10, ge=1, le=50),
+    prefix: bool = Query(True, description="Match the last word as a prefix (typeahead)"),
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
+    """
+    Searches movie titles, ranked by popularity.
+
+    Served from a token and prefix index, so typeahead lookups never scan
+    the catalog.
+
+    Args:
+        q (str): Search text.
+        limit (int): Max number of movies to return (1-50). Defaults to 10.
+        prefix (bool): Treat the last word as a prefix. Defaults to True.
+        analytics (MovieAnalytics): Injected analytics engine instance.
+
+    Returns:
+        dict: The query and the wrapped list of matching movies.
+    """
+    try:
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.search_titles, q, limit=limit, prefix=prefix)
+        return records_response(df, TitleSearchResult, SEARCH_COLUMNS, query=q)
+    except Exception as e:
+        logger.exception("Error searching titles")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/{movie_id}/similar", response_model=SimilarMoviesResponse)
+async def get_similar_movies(
+    movie_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
+    """
+    Recommends the movies closest to a given one.
+
+    Closeness is a distance over shared genres, original language, vote
+    average and popularity, computed for the whole catalog in one
+    vectorized pass (or read from the precomputed neighbour table).
+
+    Args:
+        movie_id (int): Id of the reference movie, as returned by /query or /search.
+        limit (int): Max number of movies to return (1-50). Defaults to 10.
+        analytics (MovieAnalytics): Injected analytics engine instance.
+
+    Returns:
+        dict: The reference id and the wrapped list of similar movies.
+
+    Raises:
+        HTTPException: 404 error if the movie does not exist.
+    """
+    try:
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_similar_movies, movie_id, limit)
+        return records_response(df, SimilarMovie, SIMILAR_COLUMNS, id=movie_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Movie {movie_id} not found")
+    except Exception as e:
+        logger.exception("Error fetching similar movies")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @router.get("/by-genre", response_model=MoviesByGenreResponse)
-def get_movies_by_genre(analytics: MovieAnalytics = Depends(get_analytics)):
+async def get_movies_by_genre(analytics: "MovieAnalytics" = Depends(get_analytics)):
     """
     Calculates the average global rating for every movie genre.
 
@@ -114,56 +397,310 @@ def get_movies_by_genre(analytics: MovieAnalytics = Depends(get_analytics)):
         dict: Wrapped list of genre-based performance stats.
     """
     try:
-        df = analytics.get_average_rating_per_genre()
-        results = df.rename(columns={
-            "Genre": "genre",
-            "average_rating": "average_rating",
-        }).to_dict(orient="records")
-        return {"results": results}
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_average_rating_per_genre)
+        return records_response(df, MoviesByGenre, GENRE_COLUMNS)
     except Exception as e:
         logger.exception("Error fetching genre stats")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/yearly-trends", response_model=MoviesPerYearResponse)
-def get_yearly_trends(analytics: MovieAnalytics = Depends(get_analytics)):
+@router.get("/yearly-trends", response_model=Union[MoviesPerYearResponse, ApproximateMoviesPerYearResponse])
+async def get_yearly_trends(
+    approximate: Optional[bool] = APPROXIMATE_QUERY,
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
     """
     Retrieves historical movie release volume aggregated by year.
 
     Args:
+        approximate (Optional[bool]): Estimate the counts with HyperLogLog sketches.
         analytics (MovieAnalytics): Injected analytics engine instance.
 
     Returns:
         dict: Wrapped list of yearly counts.
     """
     try:
-        df = analytics.get_movies_per_year()
-        results = df.rename(columns={
-            "Year": "year",
-            "movie_count": "movie_count",
-        }).to_dict(orient="records")
-        return {"results": results}
+        if use_approximation(approximate):
+            with request_phase("compute"):
+                df, bound = await analytics_executor.run(analytics.estimate_movies_per_year)
+            return approximate_response(df, MoviesPerYear, YEAR_COLUMNS, MoviesPerYearResponse, bound)
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_movies_per_year)
+        return records_response(df, MoviesPerYear, YEAR_COLUMNS)
     except Exception as e:
         logger.exception("Error fetching yearly trends")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/language-stats", response_model=MoviesByLanguageResponse)
-def get_language_stats(analytics: MovieAnalytics = Depends(get_analytics)):
+@router.get("/language-stats", response_model=Union[MoviesByLanguageResponse, ApproximateMoviesByLanguageResponse])
+async def get_language_stats(
+    approximate: Optional[bool] = APPROXIMATE_QUERY,
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
     """
     Calculates movie distribution and volume by original language of production.
 
     Args:
+        approximate (Optional[bool]): Estimate the counts with HyperLogLog sketches.
         analytics (MovieAnalytics): Injected analytics engine instance.
 
     Returns:
         dict: Wrapped list of language statistics.
     """
     try:
-        df = analytics.get_language_diversity()
-        results = df.rename(columns={
-            "Original_Language": "language",
-            "movie_count": "movie_count",
-        }).to_dict(orient="records")
-        return {"results": results}
+        if use_approximation(approximate):
+            with request_phase("compute"):
+                df, bound = await analytics_executor.run(analytics.estimate_language_diversity)
+            return approximate_response(df, MoviesByLanguage, LANGUAGE_COLUMNS, MoviesByLanguageResponse, bound)
+        with request_phase("compute"):
+            df = await analytics_executor.run(analytics.get_language_diversity)
+        return records_response(df, MoviesByLanguage, LANGUAGE_COLUMNS)
     except Exception as e:
         logger.exception("Error fetching language stats")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/timeseries/releases", response_model=ReleaseCountsResponse)
+async def get_release_counts(
+    freq: Literal["month", "quarter", "year"] = Query("year", description="Period length"),
+    start: Optional[date] = Query(None, description="First release date, inclusive"),
+    end: Optional[date] = Query(None, description="Last release date, inclusive"),
+    by: Optional[Literal["genre", "language"]] = Query(None, description="One series per genre or language"),
+    group: Optional[str] = Query(None, description="Only this genre or language (requires by)"),
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
+    """
+    Counts movie releases per month, quarter or year over a date range.
+
+    Periods without releases are included with a count of zero, so each
+    series is continuous.
+
+    Args:
+        freq (str): "month", "quarter" or "year".
+        start (Optional[date]): First release date. Defaults to the earliest.
+        end (Optional[date]): Last release date. Defaults to the latest.
+        by (Optional[str]): "genre" or "language" to split the counts.
+        group (Optional[str]): Restrict to one genre or language.
+        analytics (MovieAnalytics): Injected analytics engine instance.
+
+    Returns:
+        dict: Release counts per group and period.
+
+    Raises:
+        HTTPException: 400 error if the range is empty or the result too large.
+    """
+    try:
+        with request_phase("compute"):
+            df = await analytics_executor.run(
+                analytics.get_release_counts, freq, start, end, by=by, group=group
+            )
+        return records_response(df, ReleaseCount, RELEASE_COUNT_COLUMNS, freq=freq, by=by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Error fetching release counts")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/timeseries/rolling", response_model=RollingAveragesResponse)
+async def get_rolling_averages(
+    freq: Literal["month", "quarter", "year"] = Query("month", description="Period length"),
+    window: int = Query(12, ge=1, le=120, description="Periods per trailing window"),
+    start: Optional[date] = Query(None, description="First release date, inclusive"),
+    end: Optional[date] = Query(None, description="Last release date, inclusive"),
+    by: Optional[Literal["genre", "language"]] = Query(None, description="One series per genre or language"),
+    group: Optional[str] = Query(None, description="Only this genre or language (requires by)"),
+    analytics: "MovieAnalytics" = Depends(get_analytics)
+):
+    """
+    Rolling averages of vote average and popularity over release periods.
+
+    Each period's window covers it and the ``window - 1`` periods before
+    it; empty windows have null averages.
+
+    Args:
+        freq (str): "month", "quarter" or "year".
+        window (int): Periods per window.
+        start (Optional[date]): First release date. Defaults to the earliest.
+        end (Optional[date]): Last release date. Defaults to the latest.
+        by (Optional[str]): "genre" or "language" to split the series.
+        group (Optional[str]): Restrict to one genre or language.
+        analytics (MovieAnalytics): Injected analytics engine instance.
+
+    Returns:
+        dict: Window movie counts and averages per group and period.
+
+    Raises:
+        HTTPException: 400 error if the range is empty or the result too large.
+    """
+    try:
+        with request_phase("compute"):
+            df = await analytics_executor.run(
+                analytics.get_rolling_averages, freq, window, start, end, by=by, group=group
+            )
+        return records_response(df, RollingAverage, ROLLING_COLUMNS, freq=freq, window=window, by=by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Error fetching rolling averages")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+def _query_panel(analytics: "MovieAnalytics", spec: PanelSpec) -> tuple:
+    """Runs a query panel, returning its page and envelope fields."""
+    df, total, next_cursor = analytics.query(**spec.model_dump(exclude={"id", "panel"}))
+    return df, {"total": total, "next_cursor": next_cursor}
+
+def _approximable(exact, estimate):
+    """Batch compute of a panel with an approximate variant, chosen by its spec."""
+    def compute(analytics: "MovieAnalytics", spec: PanelSpec) -> tuple:
+        if use_approximation(spec.approximate):
+            df, bound = estimate(analytics, spec)
+            return df, {"error_bound": ErrorBound(**bound).model_dump()}
+        return exact(analytics, spec), {}
+    return compute
+
+# Batch panel -> (compute, row model, columns, response model). ``compute``
+# returns the result frame and the envelope fields of the GET endpoint.
+BATCH_PANELS = {
+    "most-popular": (
+        lambda a, p: (a.get_top_popular_movies(p.limit), {}),
+        TopPopularMovie, POPULAR_COLUMNS, TopPopularMoviesResponse,
+    ),
+    "ranked": (
+        lambda a, p: (a.get_top_movies(p.limit, by=p.by), {"by": p.by}),
+        TopPopularMovie, POPULAR_COLUMNS, RankedMoviesResponse,
+    ),
+    "top-rated": (
+        _approximable(
+            lambda a, p: a.get_top_rated_movies(p.limit, p.min_votes),
+            lambda a, p: a.estimate_top_rated_movies(p.limit, p.min_votes),
+        ),
+        TopRatedMovie, TOP_RATED_COLUMNS, TopRatedMoviesResponse,
+    ),
+    "query": (_query_panel, MovieQueryResult, QUERY_COLUMNS, MovieQueryResponse),
+    "search": (
+        lambda a, p: (a.search_titles(p.q, limit=p.limit, prefix=p.prefix), {"query": p.q}),
+        TitleSearchResult, SEARCH_COLUMNS, TitleSearchResponse,
+    ),
+    "similar": (
+        lambda a, p: (a.get_similar_movies(p.movie_id, p.limit), {"id": p.movie_id}),
+        SimilarMovie, SIMILAR_COLUMNS, SimilarMoviesResponse,
+    ),
+    "by-genre": (
+        lambda a, p: (a.get_average_rating_per_genre(), {}),
+        MoviesByGenre, GENRE_COLUMNS, MoviesByGenreResponse,
+    ),
+    "yearly-trends": (
+        _approximable(lambda a, p: a.get_movies_per_year(), lambda a, p: a.estimate_movies_per_year()),
+        MoviesPerYear, YEAR_COLUMNS, MoviesPerYearResponse,
+    ),
+    "language-stats": (
+        _approximable(lambda a, p: a.get_language_diversity(), lambda a, p: a.estimate_language_diversity()),
+        MoviesByLanguage, LANGUAGE_COLUMNS, MoviesByLanguageResponse,
+    ),
+    "release-counts": (
+        lambda a, p: (
+            a.get_release_counts(p.freq, p.start, p.end, by=p.by, group=p.group),
+            {"freq": p.freq, "by": p.by},
+        ),
+        ReleaseCount, RELEASE_COUNT_COLUMNS, ReleaseCountsResponse,
+    ),
+    "rolling-averages": (
+        lambda a, p: (
+            a.get_rolling_averages(p.freq, p.window, p.start, p.end, by=p.by, group=p.group),
+            {"freq": p.freq, "window": p.window, "by": p.by},
+        ),
+        RollingAverage, ROLLING_COLUMNS, RollingAveragesResponse,
+    ),
+}
+
+def compute_batch(analytics: "MovieAnalytics", panels: tuple) -> tuple:
+    """
+    Computes and encodes every panel of a batch against one analytics instance.
+
+    Runs on the analytics executor. Panels that differ only in their id
+    are computed once. A failing panel is reported in the errors map
+    with the status its GET endpoint would return; the others still
+    succeed.
+
+    Args:
+        analytics (MovieAnalytics): The snapshot's analytics engine.
+        panels (tuple): Validated panel specs.
+
+    Returns:
+        tuple: Results (key -> encoded JSON bytes or a JSON-ready dict)
+        and errors (key -> status and detail).
+    """
+    results, errors, computed = {}, {}, {}
+    for spec in panels:
+        shared = spec.model_copy(update={"id": None})
+        try:
+            if shared not in computed:
+                compute, model, columns, response_model = BATCH_PANELS[spec.panel]
+                df, fields = compute(analytics, spec)
+                if "error_bound" in fields:
+                    response_model = APPROXIMATE_RESPONSES[response_model]
+                computed[shared] = validated_payload(df, model, columns, response_model, **fields)
+            results[spec.key] = computed[shared]
+        except KeyError:
+            errors[spec.key] = {"status": 404, "detail": f"Movie {getattr(spec, 'movie_id', '')} not found"}
+        except ValueError as e:
+            errors[spec.key] = {"status": 400, "detail": str(e)}
+        except Exception:
+            logger.exception(f"Error computing batch panel {spec.key}")
+            errors[spec.key] = {"status": 500, "detail": "Internal server error"}
+    return results, errors
+
+@router.post("/batch", response_model=BatchResponse)
+async def get_batch(batch: BatchRequest, snapshot: EngineSnapshot = Depends(get_snapshot)):
+    """
+    Computes several analytics panels in one round-trip.
+
+    Each panel takes the same parameters as its GET endpoint and its
+    entry in ``results`` has the same shape as that endpoint's response.
+    All panels are computed against one dataset snapshot in a single
+    executor task, so a dashboard render costs one request, one
+    dependency setup and one thread hop.
+
+    Args:
+        batch (BatchRequest): Up to 20 panel specs.
+        snapshot (EngineSnapshot): Injected dataset snapshot.
+
+    Returns:
+        Response: The dataset version, results per panel key and errors
+        per panel key for panels that failed.
+    """
+    with request_phase("compute"):
+        results, errors = await analytics_executor.run(compute_batch, snapshot.analytics, tuple(batch.panels))
+    return composite_response({"dataset_version": snapshot.version.tag, "results": results, "errors": errors})
+
+@dataset_router.get("", response_model=DatasetInfoResponse)
+async def get_dataset_info():
+    """
+    Reports the version of the dataset currently being served.
+
+    Returns:
+        dict: Dataset version, generation counter, load time and row count.
+    """
+    return engine.info()
+
+@dataset_router.post("/reload", response_model=DatasetInfoResponse)
+async def reload_dataset():
+    """
+    Forces the shared engine to re-read the cleaned dataset from disk.
+
+    Requests already in flight finish against the previous snapshot.
+    Concurrent reload requests share a single load.
+
+    Returns:
+        dict: Information about the newly loaded dataset.
+
+    Raises:
+        HTTPException: 503 error if the cleaned data file is missing.
+    """
+    try:
+        await analytics_executor.run(engine.load, force=True)
+    except FileNotFoundError as e:
+        logger.error(f"Data dependency error: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Data layer not initialized. Please run preprocessing."
+        )
+    return engine.info()
@@ -4,8 +4,9 @@ API Data Schemas
 Defines Pydantic models for request validation and structured API responses. 
 Ensures consistent data types across the network layer.
 """
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
+from datetime import date, datetime
 
 
 # -------------------------------------------------------------------
@@ -26,6 +27,28 @@ class TopRatedMovie(BaseModel):
     vote_count: int
 
 
+class MovieQueryResult(BaseModel):
+    id: int
+    title: str
+    release_date: date
+    language: str
+    genres: List[str]
+    popularity: float
+    vote_average: float
+    vote_count: int
+
+
+class SimilarMovie(MovieQueryResult):
+    distance: float
+
+
+class TitleSearchResult(BaseModel):
+    id: int
+    title: str
+    release_date: date
+    popularity: float
+
+
 # -------------------------------------------------------------------
 # Aggregation Schemas
 # -------------------------------------------------------------------
@@ -45,6 +68,40 @@ class MoviesByLanguage(BaseModel):
     movie_count: int
 
 
+# -------------------------------------------------------------------
+# Time-Series Schemas
+# -------------------------------------------------------------------
+
+class ReleaseCount(BaseModel):
+    group: str
+    period: str
+    movie_count: int
+
+
+class RollingAverage(BaseModel):
+    group: str
+    period: str
+    movie_count: int
+    avg_vote_average: Optional[float]
+    avg_popularity: Optional[float]
+
+
+# -------------------------------------------------------------------
+# Approximation Schemas
+# -------------------------------------------------------------------
+
+class ErrorBound(BaseModel):
+    method: Literal["hyperloglog", "quantile_sketch"]
+    confidence: float
+    relative_error: float
+    # Estimated quantity and its bounds, when a single value is estimated
+    # (the vote-count prior m of top-rated); counts are bounded per row
+    # by movie_count * (1 +/- relative_error).
+    estimate: Optional[float]
+    lower: Optional[float]
+    upper: Optional[float]
+
+
 # -------------------------------------------------------------------
 # Wrapper Response Schemas
 # -------------------------------------------------------------------
@@ -53,10 +110,36 @@ class TopPopularMoviesResponse(BaseModel):
     results: List[TopPopularMovie]
 
 
+class RankedMoviesResponse(BaseModel):
+    by: str
+    results: List[TopPopularMovie]
+
+
 class TopRatedMoviesResponse(BaseModel):
     results: List[TopRatedMovie]
 
 
+class ApproximateTopRatedMoviesResponse(BaseModel):
+    error_bound: ErrorBound
+    results: List[TopRatedMovie]
+
+
+class TitleSearchResponse(BaseModel):
+    query: str
+    results: List[TitleSearchResult]
+
+
+class MovieQueryResponse(BaseModel):
+    total: int
+    next_cursor: Optional[str]
+    results: List[MovieQueryResult]
+
+
+class SimilarMoviesResponse(BaseModel):
+    id: int
+    results: List[SimilarMovie]
+
+
 class MoviesByGenreResponse(BaseModel):
     results: List[MoviesByGenre]
 
@@ -65,5 +148,171 @@ class MoviesPerYearResponse(BaseModel):
     results: List[MoviesPerYear]
 
 
+class ApproximateMoviesPerYearResponse(BaseModel):
+    error_bound: ErrorBound
+    results: List[MoviesPerYear]
+
+
 class MoviesByLanguageResponse(BaseModel):
-    results: List[MoviesByLanguage]
\ No newline at end of file
+    results: List[MoviesByLanguage]
+
+
+class ApproximateMoviesByLanguageResponse(BaseModel):
+    error_bound: ErrorBound
+    results: List[MoviesByLanguage]
+
+
+class ReleaseCountsResponse(BaseModel):
+    freq: str
+    by: Optional[str]
+    results: List[ReleaseCount]
+
+
+class RollingAveragesResponse(BaseModel):
+    freq: str
+    window: int
+    by: Optional[str]
+    results: List[RollingAverage]
+
+
+# -------------------------------------------------------------------
+# Batch Schemas
+# -------------------------------------------------------------------
+# One spec per panel, with the same parameters and limits as the
+# corresponding GET endpoint. Specs are frozen so identical batches can
+# be coalesced.
+
+class PanelSpec(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    id: Optional[str] = Field(None, max_length=64, description="Key of the panel in the response; defaults to its name")
+
+    @property
+    def key(self) -> str:
+        return self.id or self.panel
+
+
+class MostPopularPanel(PanelSpec):
+    panel: Literal["most-popular"]
+    limit: int = Field(10, ge=1, le=50)
+
+
+class RankedPanel(PanelSpec):
+    panel: Literal["ranked"]
+    by: Literal["popularity", "vote_count", "vote_average"] = "popularity"
+    limit: int = Field(10, ge=1, le=50)
+
+
+class TopRatedPanel(PanelSpec):
+    panel: Literal["top-rated"]
+    limit: int = Field(10, ge=1, le=50)
+    min_votes: int = Field(500, ge=0)
+    approximate: Optional[bool] = None
+
+
+class QueryPanel(PanelSpec):
+    panel: Literal["query"]
+    genre: Optional[str] = None
+    language: Optional[str] = None
+    year_from: Optional[int] = Field(None, ge=1800, le=2200)
+    year_to: Optional[int] = Field(None, ge=1800, le=2200)
+    min_votes: Optional[int] = Field(None, ge=0)
+    min_rating: Optional[float] = Field(None, ge=0, le=10)
+    sort_by: Literal["popularity", "vote_count", "vote_average", "release_date"] = "popularity"
+    order: Literal["desc", "asc"] = "desc"
+    limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = None
+
+
+class SearchPanel(PanelSpec):
+    panel: Literal["search"]
+    q: str = Field(..., min_length=1, max_length=200)
+    limit: int = Field(10, ge=1, le=50)
+    prefix: bool = True
+
+
+class SimilarPanel(PanelSpec):
+    panel: Literal["similar"]
+    movie_id: int
+    limit: int = Field(10, ge=1, le=50)
+
+
+class ByGenrePanel(PanelSpec):
+    panel: Literal["by-genre"]
+
+
+class YearlyTrendsPanel(PanelSpec):
+    panel: Literal["yearly-trends"]
+    approximate: Optional[bool] = None
+
+
+class LanguageStatsPanel(PanelSpec):
+    panel: Literal["language-stats"]
+    approximate: Optional[bool] = None
+
+
+class ReleaseCountsPanel(PanelSpec):
+    panel: Literal["release-counts"]
+    freq: Literal["month", "quarter", "year"] = "year"
+    start: Optional[date] = None
+    end: Optional[date] = None
+    by: Optional[Literal["genre", "language"]] = None
+    group: Optional[str] = None
+
+
+class RollingAveragesPanel(PanelSpec):
+    panel: Literal["rolling-averages"]
+    freq: Literal["month", "quarter", "year"] = "month"
+    window: int = Field(12, ge=1, le=120)
+    start: Optional[date] = None
+    end: Optional[date] = None
+    by: Optional[Literal["genre", "language"]] = None
+    group: Optional[str] = None
+
+
+Panel = Annotated[
+    Union[
+        MostPopularPanel, RankedPanel, TopRatedPanel, QueryPanel, SearchPanel,
+        SimilarPanel, ByGenrePanel, YearlyTrendsPanel, LanguageStatsPanel,
+        ReleaseCountsPanel, RollingAveragesPanel,
+    ],
+    Field(discriminator="panel"),
+]
+
+
+class BatchRequest(BaseModel):
+    panels: List[Panel] = Field(..., min_length=1, max_length=20)
+
+    @model_validator(mode="after")
+    def check_unique_keys(self) -> "BatchRequest":
+        keys = [panel.key for panel in self.panels]
+        duplicates = sorted({key for key in keys if keys.count(key) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate panel keys {duplicates}; give repeated panels distinct 'id's")
+        return self
+
+
+class PanelError(BaseModel):
+    status: int
+    detail: str
+
+
+class BatchResponse(BaseModel):
+    dataset_version: str
+    results: Dict[str, Dict[str, Any]]
+    errors: Dict[str, PanelError]
+
+
+# -------------------------------------------------------------------
+# Dataset Schemas
+# -------------------------------------------------------------------
+
+class DatasetInfoResponse(BaseModel):
+    version: Optional[str]
+    content_hash: Optional[str]
+    built_at: Optional[datetime]
+    generation: int
+    path: str
+    loaded_at: Optional[datetime]
+    row_count: Optional[int]
+    memory_bytes: Optional[Dict[str, int]]
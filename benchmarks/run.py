@@ -0,0 +1,584 @@
+"""
+Benchmark Runner
+----------------
+Times the preprocessing pipeline, every MovieAnalytics query and every
+API route on synthetic datasets, and compares the results against a
+saved baseline.
+
+Usage:
+    python -m benchmarks.run --sizes 10k,100k --save baseline.json
+    python -m benchmarks.run --sizes 10k,100k --compare baseline.json
+"""
+import argparse
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generate import SyntheticMovieGenerator, format_size, parse_size
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - optional dependency (POSIX only)
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = "10k,100k"
+DEFAULT_WORKDIR = Path(tempfile.gettempdir()) / "movie-analytics-bench"
+PREPROCESS_MODES = ("run", "streaming", "parallel")
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Timings of one benchmarked operation on one dataset size.
+
+    Attributes:
+        group (str): "preprocess", "analytics" or "http".
+        name (str): Operation name, e.g. a method name or a route.
+        rows (int): Raw rows of the dataset it ran against.
+        samples (int): Number of timed calls.
+        mean_ms (float): Mean latency in milliseconds.
+        p50_ms (float): Median latency.
+        p95_ms (float): 95th percentile latency.
+        p99_ms (float): 99th percentile latency.
+        ops_per_sec (float): Throughput of back-to-back calls (rows per
+            second for preprocessing).
+        peak_mb (float): Peak memory of the operation. For preprocessing
+            the process' peak RSS; otherwise the peak traced Python and
+            NumPy allocations of one call.
+    """
+    group: str
+    name: str
+    rows: int
+    samples: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    ops_per_sec: float
+    peak_mb: float
+
+    @property
+    def key(self) -> str:
+        """Identifies the operation across runs."""
+        return f"{format_size(self.rows)}/{self.group}/{self.name}"
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    An operation to time repeatedly.
+
+    Attributes:
+        name (str): Operation name.
+        call (Callable[[], object]): Performs one operation.
+    """
+    name: str
+    call: Callable[[], object]
+
+
+@dataclass
+class Comparison:
+    """
+    A result compared against its baseline.
+
+    Attributes:
+        key (str): ``BenchmarkResult.key``.
+        baseline_ms (float): Baseline median latency.
+        current_ms (float): Current median latency.
+        regressed (bool): Whether the slowdown exceeds the threshold.
+    """
+    key: str
+    baseline_ms: float
+    current_ms: float
+    regressed: bool = field(default=False)
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median (0.1 means 10% slower)."""
+        return self.current_ms / self.baseline_ms - 1 if self.baseline_ms > 0 else 0.0
+
+
+def summarize(group: str, name: str, rows: int, timings_ns: List[int], peak_bytes: int) -> BenchmarkResult:
+    """
+    Reduces raw timings to a result.
+
+    Args:
+        group (str): Result group.
+        name (str): Operation name.
+        rows (int): Dataset size.
+        timings_ns (List[int]): Duration of each call in nanoseconds.
+        peak_bytes (int): Peak memory of the operation.
+
+    Returns:
+        BenchmarkResult: Percentiles, mean and throughput in milliseconds.
+    """
+    timings = np.asarray(timings_ns, dtype="float64") / 1e6
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    mean = float(timings.mean())
+    return BenchmarkResult(
+        group=group,
+        name=name,
+        rows=rows,
+        samples=len(timings),
+        mean_ms=round(mean, 4),
+        p50_ms=round(float(p50), 4),
+        p95_ms=round(float(p95), 4),
+        p99_ms=round(float(p99), 4),
+        ops_per_sec=round(1000 / mean, 1) if mean > 0 else 0.0,
+        peak_mb=round(peak_bytes / 2**20, 3),
+    )
+
+
+def measure(group: str, case: BenchmarkCase, rows: int, repeat: int, warmup: int) -> BenchmarkResult:
+    """
+    Times ``repeat`` calls of a case after ``warmup`` untimed ones.
+
+    Peak memory is traced on one extra call, since tracing slows every
+    allocation and would distort the timings.
+
+    Args:
+        group (str): Result group.
+        case (BenchmarkCase): The operation.
+        rows (int): Dataset size.
+        repeat (int): Number of timed calls.
+        warmup (int): Number of untimed calls first.
+
+    Returns:
+        BenchmarkResult: The summarized timings.
+    """
+    for _ in range(warmup):
+        case.call()
+
+    gc.collect()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        case.call()
+        timings.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    try:
+        case.call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return summarize(group, case.name, rows, timings, peak)
+
+
+def _preprocess_worker(raw_path: str, output_path: str, mode: str, queue) -> None:
+    """Runs one preprocessing pass in a fresh process and reports its time and peak RSS."""
+    from processing.preprocess import MovieDataPreprocessor
+
+    logging.disable(logging.INFO)
+    preprocessor = MovieDataPreprocessor(raw_path=Path(raw_path), output_path=Path(output_path))
+    start = time.perf_counter_ns()
+    if mode == "streaming":
+        preprocessor.run_streaming()
+    elif mode == "parallel":
+        preprocessor.run_parallel(os.cpu_count() or 1)
+    else:
+        preprocessor.run()
+    elapsed = time.perf_counter_ns() - start
+    peak = 0
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux; children are the parallel mode's workers
+        peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)) * 1024
+    queue.put((elapsed, peak))
+
+
+def bench_preprocess(raw_path: Path, output_path: Path, rows: int, mode: str, repeat: int) -> BenchmarkResult:
+    """
+    Times ``MovieDataPreprocessor`` end to end.
+
+    Each pass runs in a freshly spawned process, so its peak RSS belongs
+    to the pipeline alone and no parsed state is reused between passes.
+
+    Args:
+        raw_path (Path): Synthetic raw CSV.
+        output_path (Path): Cleaned CSV to write.
+        rows (int): Raw rows in ``raw_path``.
+        mode (str): "run", "streaming" or "parallel".
+        repeat (int): Number of passes.
+
+    Returns:
+        BenchmarkResult: Pass latencies, with throughput in raw rows per second.
+    """
+    context = multiprocessing.get_context("spawn")
+    timings, peak = [], 0
+    for _ in range(repeat):
+        queue = context.Queue()
+        process = context.Process(target=_preprocess_worker, args=(str(raw_path), str(output_path), mode, queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            raise RuntimeError(f"Preprocessing {raw_path} failed with exit code {process.exitcode}")
+        elapsed, process_peak = queue.get()
+        timings.append(elapsed)
+        peak = max(peak, process_peak)
+
+    result = summarize("preprocess", mode, rows, timings, peak)
+    result.ops_per_sec = round(rows / (result.mean_ms / 1000), 1)
+    return result
+
+
+def _sample_arguments(df: pd.DataFrame) -> Tuple[str, str, int]:
+    """Picks a realistic search query, genre and movie id from the loaded dataset."""
+    top = df.loc[df["Popularity"].idxmax()]
+    words = str(top["Title"]).split()
+    query = " ".join(words[:-1] + [words[-1][:3]]) if words else "the"
+    return query, "Drama", int(top["Movie_Id"])
+
+
+def analytics_cases(analytics, df: pd.DataFrame) -> List[BenchmarkCase]:
+    """
+    Builds one case per public ``MovieAnalytics`` query method.
+
+    Args:
+        analytics (MovieAnalytics): A loaded instance.
+        df (pd.DataFrame): Its movies table, used to pick arguments.
+
+    Returns:
+        List[BenchmarkCase]: The cases, in method order.
+    """
+    query, genre, movie_id = _sample_arguments(df)
+    return [
+        BenchmarkCase("get_movies_per_year", analytics.get_movies_per_year),
+        BenchmarkCase("get_average_rating_per_genre", analytics.get_average_rating_per_genre),
+        BenchmarkCase("get_top_popular_movies", lambda: analytics.get_top_popular_movies(10)),
+        BenchmarkCase("get_top_movies", lambda: analytics.get_top_movies(10, by="vote_count")),
+        BenchmarkCase("get_top_rated_movies", lambda: analytics.get_top_rated_movies(10)),
+        BenchmarkCase("calculate_weighted_rating", lambda: analytics.calculate_weighted_rating(df)),
+        BenchmarkCase("query", lambda: analytics.query(genre=genre, min_votes=100, sort_by="vote_average")),
+        BenchmarkCase("search_titles", lambda: analytics.search_titles(query)),
+        BenchmarkCase("get_similar_movies", lambda: analytics.get_similar_movies(movie_id)),
+        BenchmarkCase("get_language_diversity", analytics.get_language_diversity),
+        BenchmarkCase("get_release_counts", lambda: analytics.get_release_counts("month", by="genre")),
+        BenchmarkCase("get_rolling_averages", lambda: analytics.get_rolling_averages("month", 12, by="genre", group=genre)),
+    ]
+
+
+def http_cases(client, df: pd.DataFrame, prefix: str) -> List[BenchmarkCase]:
+    """
+    Builds one case per GET route of the API.
+
+    Args:
+        client (TestClient): In-process client of the application.
+        df (pd.DataFrame): The served movies table, used to pick arguments.
+        prefix (str): API version prefix, e.g. "/api/v1".
+
+    Returns:
+        List[BenchmarkCase]: The cases; each fails on a non-200 response.
+    """
+    query, genre, movie_id = _sample_arguments(df)
+    routes = [
+        ("/movies/most-popular", {"limit": 10}),
+        ("/movies/ranked", {"by": "vote_count", "limit": 10}),
+        ("/movies/top-rated", {"limit": 10}),
+        ("/movies/query", {"genre": genre, "min_votes": 100, "sort_by": "vote_average"}),
+        ("/movies/search", {"q": query}),
+        (f"/movies/{movie_id}/similar", {"limit": 10}),
+        ("/movies/by-genre", {}),
+        ("/movies/yearly-trends", {}),
+        ("/movies/language-stats", {}),
+        ("/movies/timeseries/releases", {"freq": "month", "by": "genre"}),
+        ("/movies/timeseries/rolling", {"by": "genre", "group": genre}),
+        ("/dataset", {}),
+    ]
+
+    def request(url: str, params: dict) -> Callable[[], object]:
+        def call():
+            response = client.get(url, params=params)
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {url} returned {response.status_code}: {response.text[:200]}")
+            return response
+        return call
+
+    cases = []
+    for path, params in routes:
+        name = "/movies/{id}/similar" if path.endswith("/similar") else path
+        cases.append(BenchmarkCase(f"GET {name}", request(prefix + path, params)))
+    return cases
+
+
+class BenchmarkSuite:
+    """
+    Runs the benchmarks for a list of dataset sizes.
+
+    For every size a synthetic raw CSV is generated (and cached in the
+    working directory), preprocessed, loaded into ``MovieAnalytics`` and
+    served through the FastAPI application with an in-process
+    ``TestClient``, so HTTP timings include routing, validation and
+    serialization but no network.
+
+    Attributes:
+        workdir (Path): Directory for generated and cleaned datasets.
+        repeat (int): Timed calls per analytics and HTTP case.
+        warmup (int): Untimed calls before each case.
+        seed (int): Seed of the synthetic data.
+        preprocess_mode (str): Pipeline entry point to time.
+        preprocess_repeat (int): Preprocessing passes per size.
+        response_cache (bool): Keep the API response cache enabled.
+    """
+
+    def __init__(
+        self,
+        workdir: Path = DEFAULT_WORKDIR,
+        repeat: int = 50,
+        warmup: int = 3,
+        seed: int = 42,
+        preprocess_mode: str = "run",
+        preprocess_repeat: int = 1,
+        response_cache: bool = False,
+    ):
+        self.workdir = Path(workdir)
+        self.repeat = repeat
+        self.warmup = warmup
+        self.seed = seed
+        self.preprocess_mode = preprocess_mode
+        self.preprocess_repeat = preprocess_repeat
+        self.response_cache = response_cache
+
+    def raw_dataset(self, rows: int) -> Path:
+        """Returns the synthetic raw CSV for ``rows``, generating it on first use."""
+        path = self.workdir / f"raw_{format_size(rows)}_seed{self.seed}.csv"
+        if not path.exists():
+            SyntheticMovieGenerator(self.seed).write_csv(path, rows)
+        return path
+
+    def run_size(self, rows: int) -> List[BenchmarkResult]:
+        """
+        Runs every benchmark against one dataset size.
+
+        Args:
+            rows (int): Raw rows to generate.
+
+        Returns:
+            List[BenchmarkResult]: Preprocessing, analytics and HTTP results.
+        """
+        raw_path = self.raw_dataset(rows)
+        cleaned_path = self.workdir / f"cleaned_{format_size(rows)}" / "cleaned_movies.csv"
+        cleaned_path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.info(f"[{format_size(rows)}] preprocessing ({self.preprocess_mode})")
+        results = [bench_preprocess(raw_path, cleaned_path, rows, self.preprocess_mode, self.preprocess_repeat)]
+
+        from processing.analytics import MovieAnalytics
+
+        logger.info(f"[{format_size(rows)}] analytics")
+        load = BenchmarkCase("load", lambda: MovieAnalytics(cleaned_path).load())
+        results.append(measure("analytics", load, rows, repeat=max(1, min(self.repeat, 5)), warmup=0))
+        analytics = MovieAnalytics(cleaned_path).load()
+        for case in analytics_cases(analytics, analytics.df):
+            results.append(measure("analytics", case, rows, self.repeat, self.warmup))
+
+        logger.info(f"[{format_size(rows)}] http")
+        results.extend(self._run_http(cleaned_path, rows))
+        return results
+
+    def _run_http(self, cleaned_path: Path, rows: int) -> List[BenchmarkResult]:
+        """Times every route against ``cleaned_path`` through an in-process client."""
+        try:
+            from fastapi.testclient import TestClient
+        except (ImportError, RuntimeError) as e:  # pragma: no cover - optional dependency (httpx)
+            logger.warning(f"Skipping HTTP benchmarks, TestClient is unavailable: {e}")
+            return []
+
+        from api.core.cache import response_cache
+        from api.core.config import settings
+        from api.core.engine import engine
+        from api.main import app
+
+        engine.data_path = cleaned_path
+        engine.hot_reload = False
+        engine.load(force=True)
+        max_entries = response_cache.max_entries
+        if not self.response_cache:
+            response_cache.max_entries = 0
+        try:
+            with TestClient(app) as client:
+                df = engine.get_analytics().df
+                return [measure("http", case, rows, self.repeat, self.warmup)
+                        for case in http_cases(client, df, settings.API_V1_STR)]
+        finally:
+            response_cache.max_entries = max_entries
+
+    def run(self, sizes: List[int]) -> dict:
+        """
+        Runs the benchmarks for every size.
+
+        Args:
+            sizes (List[int]): Raw row counts.
+
+        Returns:
+            dict: JSON-serializable report with environment details and results.
+        """
+        results = []
+        for rows in sizes:
+            results.extend(self.run_size(rows))
+        return {
+            "version": RESULTS_VERSION,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "environment": environment(),
+            "settings": {
+                "seed": self.seed,
+                "repeat": self.repeat,
+                "warmup": self.warmup,
+                "preprocess_mode": self.preprocess_mode,
+                "response_cache": self.response_cache,
+            },
+            "results": [asdict(result) for result in results],
+        }
+
+
+def environment() -> dict:
+    """Describes the interpreter and machine, for judging whether two reports are comparable."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[Comparison]:
+    """
+    Compares median latencies with a baseline report.
+
+    Args:
+        report (dict): The current report.
+        baseline (dict): A report saved with ``--save``.
+        threshold (float): Relative slowdown that counts as a regression.
+
+    Returns:
+        List[Comparison]: One entry per operation present in both reports.
+    """
+    previous = {BenchmarkResult(**entry).key: entry for entry in baseline.get("results", [])}
+    comparisons = []
+    for entry in report["results"]:
+        result = BenchmarkResult(**entry)
+        if result.key not in previous:
+            continue
+        comparison = Comparison(result.key, previous[result.key]["p50_ms"], result.p50_ms)
+        comparison.regressed = comparison.change > threshold
+        comparisons.append(comparison)
+    return comparisons
+
+
+def format_report(report: dict) -> str:
+    """Renders a report's results as a fixed-width table."""
+    lines = [f"{'size':>6}  {'group':<10}  {'operation':<30}  {'p50 ms':>10}  {'p95 ms':>10}  "
+             f"{'p99 ms':>10}  {'ops/s':>12}  {'peak MB':>9}"]
+    for entry in report["results"]:
+        result = BenchmarkResult(**entry)
+        lines.append(
+            f"{format_size(result.rows):>6}  {result.group:<10}  {result.name:<30}  {result.p50_ms:>10.3f}  "
+            f"{result.p95_ms:>10.3f}  {result.p99_ms:>10.3f}  {result.ops_per_sec:>12,.1f}  {result.peak_mb:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparisons: List[Comparison]) -> str:
+    """Renders a comparison as a fixed-width table, flagging regressions."""
+    lines = [f"{'operation':<50}  {'baseline ms':>12}  {'current ms':>12}  {'change':>8}"]
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison.regressed else ""
+        lines.append(
+            f"{comparison.key:<50}  {comparison.baseline_ms:>12.3f}  {comparison.current_ms:>12.3f}  "
+            f"{comparison.change:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the benchmark suite.
+
+    Args:
+        argv (Optional[List[str]]): Arguments, defaults to sys.argv.
+
+    Returns:
+        int: Exit status; 1 if ``--compare`` found a regression.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing, analytics and the API on synthetic data.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"Comma-separated raw row counts, 10k to 10m (default: {DEFAULT_SIZES}).")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed calls per analytics/HTTP case (default: 50).")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls before each case (default: 3).")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic data (default: 42).")
+    parser.add_argument("--preprocess", choices=PREPROCESS_MODES, default="run",
+                        help="Pipeline entry point to time; use streaming for the largest sizes (default: run).")
+    parser.add_argument("--preprocess-repeat", type=int, default=1, help="Preprocessing passes per size (default: 1).")
+    parser.add_argument("--response-cache", action="store_true",
+                        help="Keep the API response cache enabled (measures cache hits).")
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR,
+                        help=f"Directory for generated datasets (default: {DEFAULT_WORKDIR}).")
+    parser.add_argument("--save", type=Path, default=None, help="Write the report to this JSON file.")
+    parser.add_argument("--compare", type=Path, default=None, help="Compare against a report saved with --save.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Median slowdown flagged as a regression by --compare (default: 0.10).")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+    if args.repeat < 1 or args.preprocess_repeat < 1 or args.warmup < 0:
+        parser.error("--repeat and --preprocess-repeat must be positive, --warmup non-negative")
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    # The analytics and API layers log every load; keep the output to the suite's progress
+    for name in ("processing", "api", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    suite = BenchmarkSuite(
+        workdir=args.workdir,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        seed=args.seed,
+        preprocess_mode=args.preprocess,
+        preprocess_repeat=args.preprocess_repeat,
+        response_cache=args.response_cache,
+    )
+    report = suite.run(sizes)
+    print(format_report(report))
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(report, indent=2))
+        logger.info(f"Saved report to {args.save}")
+
+    if baseline is None:
+        return 0
+    if baseline.get("environment") != report["environment"]:
+        logger.warning("Baseline was recorded on a different interpreter or machine; differences may not be meaningful")
+    comparisons = compare(report, baseline, args.threshold)
+    print()
+    print(format_comparison(comparisons))
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        logger.error(f"{len(regressions)} operation(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
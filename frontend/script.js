@@ -4,9 +4,15 @@
 
 const API_BASE = "http://127.0.0.1:8000/api/v1/movies";
 
+// Dashboard panels, fetched together in one /batch request
+const DASHBOARD_PANELS = ['most-popular', 'top-rated', 'by-genre', 'yearly-trends', 'language-stats'];
+
 const MovieUI = {
     // Current state
     activeEndpoint: null,
+    panels: null,
+    panelErrors: {},
+    panelsLimit: null,
 
     /**
      * Get the limit value from input
@@ -26,6 +32,26 @@ const MovieUI = {
         output.innerHTML = '<div class="loader"></div>';
     },
 
+    /**
+     * Fetch every dashboard panel in a single batch request
+     */
+    async fetchDashboard(limit) {
+        const panels = DASHBOARD_PANELS.map(panel =>
+            this.isRankedType(panel) ? { panel, limit } : { panel }
+        );
+        const response = await fetch(`${API_BASE}/batch`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ panels }),
+        });
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+
+        const data = await response.json();
+        this.panels = data.results;
+        this.panelErrors = data.errors;
+        this.panelsLimit = limit;
+    },
+
     /**
      * Main data loading orchestration
      */
@@ -34,17 +60,15 @@ const MovieUI = {
         this.updateUIState(type);
         this.showLoading();
 
-        let url = `${API_BASE}/${type}`;
-        if (this.isRankedType(type)) {
-            url += `?limit=${this.getLimit()}`;
-        }
-
         try {
-            const response = await fetch(url);
-            if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+            const limit = this.getLimit();
+            if (!this.panels || this.panelsLimit !== limit) {
+                await this.fetchDashboard(limit);
+            }
 
-            const data = await response.json();
-            this.render(data.results);
+            const error = this.panelErrors[type];
+            if (error) throw new Error(error.detail);
+            this.render(this.panels[type].results);
         } catch (error) {
             console.error("Fetch error:", error);
             this.renderError(error.message);
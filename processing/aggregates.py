@@ -0,0 +1,254 @@
+"""
+Materialized Aggregates
+-----------------------
+Dataset-level aggregations (genre ratings, yearly volume, language mix)
+computed once at preprocessing time and persisted next to the cleaned
+data, so the API can serve them without a groupby per request.
+"""
+import json
+import logging
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from processing.dataset import MovieDataset
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_SCHEMA_VERSION = 2
+
+# Movie columns the aggregations (and their fingerprint) read
+AGGREGATE_COLUMNS = ["Release_Date", "Title", "Original_Language", "Vote_Average", "Vote_Count"]
+
+
+def movies_per_year(dataset: MovieDataset) -> pd.DataFrame:
+    """
+    Counts distinct titles released per year.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns ['Year', 'movie_count'].
+    """
+    movies = dataset.movies
+    return (
+        movies.groupby(movies["Release_Date"].dt.year.rename("Year"))["Title"]
+        .nunique()
+        .reset_index(name="movie_count")
+        .sort_values("Year")
+    )
+
+
+def average_rating_per_genre(dataset: MovieDataset) -> pd.DataFrame:
+    """
+    Computes the mean vote rating for each genre over the genre bridge.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns ['Genre', 'average_rating'].
+    """
+    ratings = dataset.movies["Vote_Average"].to_numpy()[dataset.genre_movie_ids()]
+    return (
+        pd.Series(ratings, name="Vote_Average")
+        .groupby(dataset.genres["Genre"], observed=True)
+        .mean()
+        .round(2)
+        .reset_index(name="average_rating")
+        .sort_values("average_rating", ascending=False)
+    )
+
+
+def language_diversity(dataset: MovieDataset) -> pd.DataFrame:
+    """
+    Counts distinct titles per original language.
+
+    Returns:
+        pd.DataFrame: DataFrame with columns ['Original_Language', 'movie_count'].
+    """
+    return (
+        dataset.movies.groupby("Original_Language", observed=True)["Title"]
+        .nunique()
+        .reset_index(name="movie_count")
+        .sort_values("movie_count", ascending=False)
+    )
+
+
+AGGREGATES: Dict[str, Callable[[MovieDataset], pd.DataFrame]] = {
+    "by_genre": average_rating_per_genre,
+    "yearly_trends": movies_per_year,
+    "language_stats": language_diversity,
+}
+
+# Group key and final (column, ascending) row order of each aggregate,
+# as produced by the functions above.
+AGGREGATE_LAYOUT = {
+    "by_genre": ("Genre", "average_rating", False),
+    "yearly_trends": ("Year", "Year", True),
+    "language_stats": ("Original_Language", "movie_count", False),
+}
+
+
+def changed_keys(dataset: MovieDataset, movie_ids: Iterable[int]) -> Dict[str, Set]:
+    """
+    Collects the aggregate groups that a set of movies contributes to.
+
+    Args:
+        dataset (MovieDataset): Dataset the ids refer to.
+        movie_ids (Iterable[int]): Ids of the changed movies.
+
+    Returns:
+        Dict[str, Set]: Aggregate name to the group keys it must refresh.
+    """
+    ids = np.asarray(list(movie_ids), dtype="int64")
+    movies = dataset.movies.iloc[ids]
+    in_changed = np.isin(dataset.genre_movie_ids(), ids)
+    return {
+        "by_genre": set(dataset.genres.loc[in_changed, "Genre"].astype(str)),
+        "yearly_trends": set(movies["Release_Date"].dt.year.astype(int)),
+        "language_stats": set(movies["Original_Language"].astype(str)),
+    }
+
+
+def _restrict(dataset: MovieDataset, name: str, keys: Set) -> MovieDataset:
+    """Narrows a dataset to the rows feeding the given groups of one aggregate."""
+    movies, genres = dataset.movies, dataset.genres
+    if name == "by_genre":
+        # Ratings are looked up by Movie_Id, so the movies table stays whole.
+        return MovieDataset(movies=movies, genres=genres[genres["Genre"].isin(keys)].reset_index(drop=True))
+    if name == "yearly_trends":
+        return MovieDataset(movies=movies[movies["Release_Date"].dt.year.isin(keys)], genres=genres.iloc[:0])
+    return MovieDataset(movies=movies[movies["Original_Language"].isin(keys)], genres=genres.iloc[:0])
+
+
+def dataset_fingerprint(dataset: MovieDataset) -> dict:
+    """
+    Cheap summary used to check that an aggregates file matches a dataset.
+
+    Returns:
+        dict: Movie and genre-link counts, total votes and latest release date.
+    """
+    movies = dataset.movies
+    return {
+        "movies": int(len(movies)),
+        "genre_links": int(len(dataset.genres)),
+        "total_votes": int(movies["Vote_Count"].sum()),
+        "latest_release": str(movies["Release_Date"].max()),
+    }
+
+
+def compute_aggregates(dataset: MovieDataset) -> Dict[str, pd.DataFrame]:
+    """
+    Runs every registered aggregation over the cleaned dataset.
+
+    Args:
+        dataset (MovieDataset): The cleaned dataset.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Aggregate name to result frame.
+    """
+    return {name: func(dataset) for name, func in AGGREGATES.items()}
+
+
+def write_aggregates(dataset: MovieDataset, path: Path, aggregates: Optional[Dict[str, pd.DataFrame]] = None) -> None:
+    """
+    Computes and persists all aggregates as a single JSON artifact.
+
+    Args:
+        dataset (MovieDataset): The cleaned dataset the aggregates describe.
+        path (Path): Destination of the JSON artifact.
+        aggregates (Optional[Dict[str, pd.DataFrame]]): Already computed
+            results to store. Defaults to computing them from ``dataset``.
+    """
+    if aggregates is None:
+        aggregates = compute_aggregates(dataset)
+    payload = {
+        "schema_version": AGGREGATES_SCHEMA_VERSION,
+        "fingerprint": dataset_fingerprint(dataset),
+        "aggregates": {
+            name: result.to_dict(orient="records")
+            for name, result in aggregates.items()
+        },
+    }
+    logger.info(f"Saving materialized aggregates to {path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def read_aggregates(path: Path, dataset: MovieDataset) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Loads a previously materialized aggregates artifact.
+
+    Args:
+        path (Path): Location of the JSON artifact.
+        dataset (MovieDataset): The dataset currently loaded, used to reject
+                                artifacts that were built from different data.
+
+    Returns:
+        Optional[Dict[str, pd.DataFrame]]: The aggregates, or None if the
+        artifact is missing, unreadable or stale.
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable aggregates artifact {path}: {e}")
+        return None
+
+    if payload.get("schema_version") != AGGREGATES_SCHEMA_VERSION:
+        return None
+    if payload.get("fingerprint") != dataset_fingerprint(dataset):
+        logger.warning(f"Aggregates artifact {path} does not match the loaded dataset; recomputing")
+        return None
+    stored = payload.get("aggregates", {})
+    if set(stored) != set(AGGREGATES):
+        return None
+    return {name: pd.DataFrame.from_records(records) for name, records in stored.items()}
+
+
+def refresh_aggregates(
+    path: Path, previous: MovieDataset, dataset: MovieDataset, touched: Dict[str, Set], target: Optional[Path] = None
+) -> None:
+    """
+    Updates a materialized aggregates artifact after an incremental change.
+
+    Only the groups listed in ``touched`` are recomputed, over the rows of
+    ``dataset`` that feed them; every other group is carried over from the
+    stored artifact. The result equals a full recomputation. If the stored
+    artifact is missing or does not describe ``previous``, everything is
+    recomputed instead.
+
+    Args:
+        path (Path): Location of the JSON artifact.
+        previous (MovieDataset): Dataset the stored artifact was built from.
+        dataset (MovieDataset): The updated dataset.
+        touched (Dict[str, Set]): Aggregate name to the group keys that changed.
+        target (Optional[Path]): Where to write the result, e.g. a staging
+                                 path. Defaults to ``path``.
+    """
+    target = target or path
+    stored = read_aggregates(path, previous)
+    if stored is None:
+        logger.info("No reusable aggregates artifact; recomputing all aggregates")
+        write_aggregates(dataset, target)
+        return
+
+    refreshed = {}
+    for name, func in AGGREGATES.items():
+        key, order_by, ascending = AGGREGATE_LAYOUT[name]
+        keys = touched.get(name, set())
+        current = stored[name]
+        if not keys:
+            refreshed[name] = current
+            continue
+        fresh = func(_restrict(dataset, name, keys))
+        parts = [fresh]
+        if len(current):
+            parts.insert(0, current[~current[key].isin(keys)])
+        # Rebuild the group-ordered frame the full computation sorts from,
+        # so ties in the final order resolve the same way.
+        parts = [part for part in parts if len(part)] or [fresh]
+        merged = pd.concat(parts, ignore_index=True).sort_values(key).reset_index(drop=True)
+        refreshed[name] = merged.sort_values(order_by, ascending=ascending)
+        logger.info(f"Refreshed {len(keys)} {name} groups")
+    write_aggregates(dataset, target, aggregates=refreshed)
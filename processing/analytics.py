@@ -5,13 +5,61 @@ Provides high-level analytical functions for the movie dataset using Pandas.
 Core features include popularity rankings, weighted rating calculations, 
 and demographic trends.
 """
+import numpy as np
 import pandas as pd
 import logging
-from typing import Optional
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 from api.core.config import settings
+from processing.storage import resolve_source, read_dataset, aggregates_path, search_index_path, sketches_path
+from processing.dataset import MovieDataset
+from processing.aggregates import compute_aggregates, dataset_fingerprint, read_aggregates
+from processing.manifest import dataset_version
+from processing.indexes import MovieFilterIndex, RankingIndex, WeightedRatingIndex, RANKING_METRICS
+from processing.search import TitleSearchIndex
+from processing.sketches import MovieSketches
+from processing.similarity import SimilarityIndex
+from processing.timeseries import ReleaseTimeline
+from processing.shared import SharedDatasetStore, release_scratch_memory
 
 logger = logging.getLogger(__name__)
 
+# Movie columns read by the analytics and their indexes; the rest of the
+# cleaned file (overviews, poster URLs) is not loaded by the API.
+ANALYTICS_COLUMNS = ["Release_Date", "Title", "Popularity", "Vote_Count", "Vote_Average", "Original_Language"]
+
+
+def _nbytes(obj: object, seen: set) -> int:
+    """
+    Bytes of the NumPy and Arrow buffers reachable from an index object.
+
+    Arrays sharing one base buffer, or already in ``seen``, are counted once.
+    """
+    if isinstance(obj, np.ndarray):
+        base = obj
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if id(base) in seen:
+            return 0
+        seen.add(id(base))
+        return base.nbytes
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.arrays.ArrowStringArray):
+        return obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(obj.memory_usage(index=False, deep=True).sum())
+    if isinstance(obj, dict):
+        return sum(_nbytes(value, seen) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(value, seen) for value in obj)
+    if hasattr(obj, "__dict__"):
+        return _nbytes(vars(obj), seen)
+    return 0
+
+
 class MovieAnalytics:
     """
     Core analytics engine for processing cleaned movie data.
@@ -19,49 +67,318 @@ class MovieAnalytics:
     This class provides a suite of analytics methods using Pandas to derive
     insights such as popularity rankings, yearly trends, and genre analysis.
     It uses lazy loading to ensure data is only read when an analytics method
-    is called.
+    is called. Data is held in normalized form: a movies table with one row
+    per movie and a compact movie-genre bridge.
 
     Attributes:
         data_path (Path): Path to the cleaned CSV dataset.
+        data_format (str): Preferred storage format to load from.
+        shared_dir (Optional[Path]): Shared dataset store to load through, if any.
+        version (Optional[str]): Version tag of the loaded dataset (see
+            processing.manifest.dataset_version); None until loaded.
+        manifest (Optional[dict]): Manifest of the loaded dataset, if it has one.
     """
 
-    def __init__(self, data_path: Optional[str] = None):
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        data_format: Optional[str] = None,
+        shared_dir: Optional[Path] = None,
+    ):
         """
         Initializes the analytics engine.
 
         Args:
             data_path (Optional[str]): Custom path to the cleaned dataset. 
                                        Defaults to settings.CLEANED_DATA_PATH.
+            data_format (Optional[str]): "csv", "feather" or "parquet".
+                                         Defaults to settings.DATA_FORMAT.
+            shared_dir (Optional[Path]): Load through a SharedDatasetStore at
+                                         this directory so that processes on
+                                         the same host share one copy.
         """
         self.data_path = data_path or settings.CLEANED_DATA_PATH
-        self._df = None
+        self.data_format = data_format or settings.DATA_FORMAT
+        self.shared_dir = shared_dir
+        self.version: Optional[str] = None
+        self.manifest: Optional[dict] = None
+        self._shared_key: Optional[str] = None
+        self._dataset: Optional[MovieDataset] = None
+        self._aggregates: Optional[Dict[str, pd.DataFrame]] = None
+        self._rankings: Dict[str, RankingIndex] = {}
+        self._weighted: Optional[WeightedRatingIndex] = None
+        self._filters: Optional[MovieFilterIndex] = None
+        self._search: Optional[TitleSearchIndex] = None
+        self._similarity: Optional[SimilarityIndex] = None
+        self._timeline: Optional[ReleaseTimeline] = None
+        self._sketches: Optional[MovieSketches] = None
+        self._footprint: Optional[Dict[str, int]] = None
+
+    @property
+    def dataset(self) -> MovieDataset:
+        """
+        Provides access to the loaded dataset, triggering load if necessary.
+
+        Returns:
+            MovieDataset: The movies table and genre bridge.
+        """
+        if self._dataset is None:
+            self._load_data()
+        return self._dataset
 
     @property
     def df(self) -> pd.DataFrame:
         """
-        Provides access to the loaded DataFrame, triggering load if necessary.
+        Provides access to the movies table (one row per movie).
+
+        Returns:
+            pd.DataFrame: The loaded cleaned movies.
+        """
+        return self.dataset.movies
+
+    @property
+    def genres(self) -> pd.DataFrame:
+        """
+        Provides access to the movie-genre bridge.
+
+        Returns:
+            pd.DataFrame: Bridge rows with columns ['Movie_Id', 'Genre'].
+        """
+        return self.dataset.genres
+
+    def load(self) -> "MovieAnalytics":
+        """
+        Eagerly loads the dataset and builds its indexes so the first
+        request does not pay for either.
 
         Returns:
-            pd.DataFrame: The loaded cleaned dataset.
+            MovieAnalytics: The same instance, with its data loaded.
+
+        Raises:
+            FileNotFoundError: If the cleaned data file does not exist.
         """
-        if self._df is None:
+        if self._dataset is None:
             self._load_data()
-        return self._df
+        self._build_indexes()
+        # Columnar reads and index builds leave freed blocks in pyarrow's pool
+        release_scratch_memory()
+        self._footprint = footprint = self._measure_footprint()
+        logger.info(
+            f"Loaded {len(self.df)} movies: {footprint['dataset'] / 2**20:.1f} MiB data, "
+            f"{footprint['indexes'] / 2**20:.1f} MiB indexes"
+        )
+        return self
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        Reports the memory held by the loaded dataset and its indexes.
+
+        Counts the movies table and genre bridge (string payloads
+        included) and the buffers of the indexes built so far; index
+        arrays that are views of dataset columns are not counted twice.
+        With a shared store these are mapped pages, shared between workers.
+        Measured once by ``load``.
+
+        Returns:
+            Dict[str, int]: Bytes under 'movies', 'genres', 'dataset'
+            (their sum), 'indexes' and 'total'.
+        """
+        if self._footprint is not None:
+            return self._footprint
+        return self._measure_footprint()
+
+    def _measure_footprint(self) -> Dict[str, int]:
+        """Walks the dataset and index buffers for ``memory_footprint``."""
+        usage = self.dataset.memory_usage()
+        seen = set()
+        for table in (self.df, self.genres):
+            for column in table.columns:
+                values = table[column].array
+                _nbytes(values if isinstance(values, pd.arrays.ArrowStringArray) else table[column].to_numpy(), seen)
+        indexes = [self._rankings, self._weighted, self._filters, self._search, self._similarity, self._timeline]
+        footprint = {
+            **usage,
+            "dataset": usage["movies"] + usage["genres"],
+            "indexes": _nbytes(indexes, seen),
+        }
+        footprint["total"] = footprint["dataset"] + footprint["indexes"]
+        return footprint
+
+    def _build_indexes(self) -> None:
+        """
+        Builds every load-time index over the current dataset. With a shared
+        store, the indexes are built by one process and mapped by the rest.
+        """
+        if self._shared_key is None:
+            self._local_indexes()
+            return
+        store = SharedDatasetStore(self.shared_dir)
+        name = f"indexes-k{settings.SIMILAR_TABLE_SIZE}"
+        indexes = store.share(self._shared_key, name, self.dataset, self._local_indexes)
+        self._rankings, self._weighted, self._filters, self._search, self._similarity, self._timeline = indexes
+
+    def _local_indexes(self) -> tuple:
+        """Builds the indexes in this process and returns them."""
+        for column in RANKING_METRICS.values():
+            self.ranking(column)
+        self.weighted_index()
+        self.filter_index()
+        self.search_index()
+        self.similarity_index()
+        self.timeline()
+        return self._rankings, self._weighted, self._filters, self._search, self._similarity, self._timeline
+
+    def ranking(self, column: str) -> RankingIndex:
+        """
+        Returns the per-title ranking index for a column, building it once.
+
+        Args:
+            column (str): One of the columns in RANKING_METRICS.
+
+        Returns:
+            RankingIndex: Titles pre-sorted by ``column`` in descending order.
+        """
+        index = self._rankings.get(column)
+        if index is None:
+            index = RankingIndex(self.df, column)
+            self._rankings[column] = index
+        return index
 
     def _load_data(self) -> None:
         """
         Loads the preprocessed dataset from the filesystem.
 
+        Prefers the memory-mapped columnar artifact and falls back to CSV
+        when it is not present. With COMPACT_DATASET only ANALYTICS_COLUMNS
+        are read, in compact dtypes. With ``shared_dir`` the dataset is taken
+        from the shared store, publishing it there first if this process
+        is the first to load this version. The version is read before the
+        data, as the manifest is published after it.
+
         Raises:
             FileNotFoundError: If the cleaned data file does not exist.
         """
         try:
-            logger.info(f"Loading analytics data from {self.data_path}")
-            self._df = pd.read_csv(self.data_path, parse_dates=["Release_Date"])
+            self.version, self.manifest = dataset_version(self.data_path, self.data_format)
+            path, data_format = resolve_source(self.data_path, self.data_format)
+            logger.info(f"Loading analytics data from {path} ({data_format}, version {self.version})")
+            if self.shared_dir is None:
+                self._dataset = self._read(path, data_format)
+            else:
+                self._shared_key = f"{path}:{self.version}:{int(settings.COMPACT_DATASET)}"
+                store = SharedDatasetStore(self.shared_dir)
+                self._dataset = store.open(self._shared_key, lambda: self._read(path, data_format))
         except Exception as e:
             logger.error(f"Error loading cleaned data: {e}")
             raise FileNotFoundError(f"Cleaned data not found at {self.data_path}. Run preprocessing first.")
 
+    @staticmethod
+    def _read(path: Path, data_format: str) -> MovieDataset:
+        """Reads a dataset artifact, projected and compacted if COMPACT_DATASET is set."""
+        if not settings.COMPACT_DATASET:
+            return read_dataset(path, data_format)
+        return read_dataset(path, data_format, columns=ANALYTICS_COLUMNS).compact(ANALYTICS_COLUMNS)
+
+    def _aggregate(self, name: str) -> pd.DataFrame:
+        """
+        Returns a dataset-level aggregate without recomputing it.
+
+        Aggregates are read from the artifact materialized by the
+        preprocessor; if it is missing or stale they are computed once
+        from the loaded data and kept for the lifetime of this instance.
+
+        Args:
+            name (str): Aggregate key (see processing.aggregates.AGGREGATES).
+
+        Returns:
+            pd.DataFrame: A copy of the cached aggregate result.
+        """
+        if self._aggregates is None:
+            aggregates = read_aggregates(aggregates_path(self.data_path), self.dataset)
+            if aggregates is None:
+                logger.info("Materialized aggregates unavailable; computing from loaded data")
+                aggregates = compute_aggregates(self.dataset)
+            self._aggregates = aggregates
+        return self._aggregates[name].copy()
+
+    def weighted_index(self) -> WeightedRatingIndex:
+        """
+        Returns the vote-sorted weighted-rating index, building it once.
+
+        Returns:
+            WeightedRatingIndex: Index answering top-rated queries for any threshold.
+        """
+        if self._weighted is None:
+            self._weighted = WeightedRatingIndex(self.dataset)
+        return self._weighted
+
+    def filter_index(self) -> MovieFilterIndex:
+        """
+        Returns the posting-list index used by ``query``, building it once.
+
+        Returns:
+            MovieFilterIndex: Index over genre, language, release date and votes.
+        """
+        if self._filters is None:
+            self._filters = MovieFilterIndex(self.dataset)
+        return self._filters
+
+    def search_index(self) -> TitleSearchIndex:
+        """
+        Returns the title search index, loading the persisted copy if it
+        matches the dataset and building it otherwise.
+
+        Returns:
+            TitleSearchIndex: Token and prefix index over titles.
+        """
+        if self._search is None:
+            index = TitleSearchIndex.load(search_index_path(self.data_path), self.df)
+            if index is None:
+                logger.info("Persisted search index unavailable; building from loaded data")
+                index = TitleSearchIndex.build(self.df)
+            self._search = index
+        return self._search
+
+    def similarity_index(self) -> SimilarityIndex:
+        """
+        Returns the feature-space index used by ``get_similar_movies``,
+        building it once.
+
+        Returns:
+            SimilarityIndex: Index over genres, language, rating and popularity.
+        """
+        if self._similarity is None:
+            self._similarity = SimilarityIndex(self.dataset, table_size=settings.SIMILAR_TABLE_SIZE)
+        return self._similarity
+
+    def timeline(self) -> ReleaseTimeline:
+        """
+        Returns the release-date index used by the time-series methods,
+        building it once.
+
+        Returns:
+            ReleaseTimeline: Date-ordered index with rating and popularity prefix sums.
+        """
+        if self._timeline is None:
+            self._timeline = ReleaseTimeline(self.dataset)
+        return self._timeline
+
+    def sketches(self) -> MovieSketches:
+        """
+        Returns the sketches behind the approximate methods, loading the
+        persisted copy if it matches the dataset and building it otherwise.
+
+        Returns:
+            MovieSketches: Distinct-title counters and the vote-count sketch.
+        """
+        if self._sketches is None:
+            sketches = MovieSketches.load(sketches_path(self.data_path), dataset_fingerprint(self.dataset))
+            if sketches is None:
+                logger.info("Persisted sketches unavailable; building from loaded data")
+                sketches = MovieSketches.from_dataset(self.dataset)
+            self._sketches = sketches
+        return self._sketches
+
     def get_movies_per_year(self) -> pd.DataFrame:
         """
         Calculates the volume of movie releases aggregated by year.
@@ -69,14 +386,7 @@ class MovieAnalytics:
         Returns:
             pd.DataFrame: DataFrame with columns ['Year', 'movie_count'].
         """
-        df = self.df.copy()
-        df["Year"] = df["Release_Date"].dt.year
-        return (
-            df.groupby("Year")["Title"]
-            .nunique()
-            .reset_index(name="movie_count")
-            .sort_values("Year")
-        )
+        return self._aggregate("yearly_trends")
 
     def get_average_rating_per_genre(self) -> pd.DataFrame:
         """
@@ -85,13 +395,7 @@ class MovieAnalytics:
         Returns:
             pd.DataFrame: DataFrame with columns ['Genre', 'average_rating'].
         """
-        return (
-            self.df.groupby("Genre")["Vote_Average"]
-            .mean()
-            .round(2)
-            .reset_index(name="average_rating")
-            .sort_values("average_rating", ascending=False)
-        )
+        return self._aggregate("by_genre")
 
     def get_top_popular_movies(self, limit: int = 10) -> pd.DataFrame:
         """
@@ -103,12 +407,25 @@ class MovieAnalytics:
         Returns:
             pd.DataFrame: Top N popular movies.
         """
-        return (
-            self.df.sort_values("Popularity", ascending=False)
-            .drop_duplicates(subset=["Title"])
-            .head(limit)[["Title", "Popularity", "Vote_Average", "Vote_Count"]]
-            .reset_index(drop=True)
-        )
+        return self.ranking("Popularity").top(limit)
+
+    def get_top_movies(self, limit: int = 10, by: str = "popularity") -> pd.DataFrame:
+        """
+        Ranks movies by popularity, vote count or raw vote average.
+
+        Args:
+            limit (int): Number of top records to return. Defaults to 10.
+            by (str): Metric name, one of RANKING_METRICS. Defaults to "popularity".
+
+        Returns:
+            pd.DataFrame: Top N movies ordered by the chosen metric.
+
+        Raises:
+            ValueError: If ``by`` is not a supported metric.
+        """
+        if by not in RANKING_METRICS:
+            raise ValueError(f"Unsupported ranking metric '{by}'. Expected one of {list(RANKING_METRICS)}")
+        return self.ranking(RANKING_METRICS[by]).top(limit)
 
     @staticmethod
     def calculate_weighted_rating(df: pd.DataFrame) -> pd.Series:
@@ -140,19 +457,153 @@ class MovieAnalytics:
         Returns:
             pd.DataFrame: Top N rated movies by weighted score.
         """
-        df_filtered = self.df[self.df["Vote_Count"] >= min_votes].copy()
-        if df_filtered.empty:
-            return pd.DataFrame(columns=["Title", "Weighted_Rating", "Vote_Average", "Vote_Count"])
-            
-        df_filtered["Weighted_Rating"] = self.calculate_weighted_rating(df_filtered)
-        return (
-            df_filtered.sort_values("Weighted_Rating", ascending=False)
-            .drop_duplicates(subset=["Title"])
-            .head(limit)[["Title", "Weighted_Rating", "Vote_Average", "Vote_Count"]]
-            .round(2)
-            .reset_index(drop=True)
+        return self.weighted_index().top(limit, min_votes)
+
+    def query(
+        self,
+        genre: Optional[str] = None,
+        language: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        min_votes: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        sort_by: str = "popularity",
+        order: str = "desc",
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[pd.DataFrame, int, Optional[str]]:
+        """
+        Filters the catalog and returns one sorted page of matching movies.
+
+        Args:
+            genre (Optional[str]): Genre name (case-insensitive).
+            language (Optional[str]): Original language code.
+            year_from (Optional[int]): First release year, inclusive.
+            year_to (Optional[int]): Last release year, inclusive.
+            min_votes (Optional[int]): Minimum vote count.
+            min_rating (Optional[float]): Minimum vote average.
+            sort_by (str): "popularity", "vote_count", "vote_average" or "release_date".
+            order (str): "desc" or "asc". Defaults to "desc".
+            limit (int): Page size. Defaults to 20.
+            cursor (Optional[str]): Cursor from the previous page.
+
+        Returns:
+            Tuple[pd.DataFrame, int, Optional[str]]: The page, the total number
+            of matches and the cursor for the next page (None on the last page).
+
+        Raises:
+            ValueError: If ``sort_by``, ``order`` or ``cursor`` is invalid.
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unsupported order '{order}'. Expected 'asc' or 'desc'")
+        return self.filter_index().query(
+            sort_by=sort_by,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            genre=genre,
+            language=language,
+            year_from=year_from,
+            year_to=year_to,
+            min_votes=min_votes,
+            min_rating=min_rating,
         )
 
+    def search_titles(self, query: str, limit: int = 10, prefix: bool = True) -> pd.DataFrame:
+        """
+        Finds movies whose title contains every word of ``query``.
+
+        Matching ignores case and accents. With ``prefix`` the last word may
+        be incomplete, for typeahead. Results are ordered by popularity.
+
+        Args:
+            query (str): Search text.
+            limit (int): Maximum number of results. Defaults to 10.
+            prefix (bool): Match the last word as a prefix. Defaults to True.
+
+        Returns:
+            pd.DataFrame: Columns ['Movie_Id', 'Title', 'Release_Date', 'Popularity'].
+        """
+        ids = self.search_index().search(query, limit=limit, prefix=prefix)
+        return self.df.iloc[ids][["Movie_Id", "Title", "Release_Date", "Popularity"]].reset_index(drop=True)
+
+    def get_similar_movies(self, movie_id: int, limit: int = 10) -> pd.DataFrame:
+        """
+        Finds the movies most similar to a given one.
+
+        Similarity combines shared genres, original language, vote average
+        and popularity (see processing.similarity).
+
+        Args:
+            movie_id (int): Id of the reference movie.
+            limit (int): Number of similar movies to return. Defaults to 10.
+
+        Returns:
+            pd.DataFrame: The query columns plus 'Distance', closest first.
+
+        Raises:
+            KeyError: If ``movie_id`` does not exist.
+        """
+        ids, distances = self.similarity_index().similar(movie_id, limit)
+        similar = self.filter_index().rows(ids)
+        similar["Distance"] = distances.astype("float64")
+        return similar
+
+    def get_release_counts(
+        self,
+        freq: str = "year",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        by: Optional[str] = None,
+        group: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Counts releases per month, quarter or year within a date range.
+
+        Args:
+            freq (str): "month", "quarter" or "year". Defaults to "year".
+            start (Optional[date]): First release date, inclusive.
+            end (Optional[date]): Last release date, inclusive.
+            by (Optional[str]): "genre" or "language" for one series per group.
+            group (Optional[str]): Restrict to one genre or language.
+
+        Returns:
+            pd.DataFrame: Columns ['Group', 'Period', 'movie_count'].
+
+        Raises:
+            ValueError: If a parameter is invalid or the result too large.
+        """
+        return self.timeline().release_counts(freq, start, end, by=by, group=group)
+
+    def get_rolling_averages(
+        self,
+        freq: str = "month",
+        window: int = 12,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        by: Optional[str] = None,
+        group: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Computes trailing-window averages of vote average and popularity.
+
+        Args:
+            freq (str): "month", "quarter" or "year". Defaults to "month".
+            window (int): Periods per window. Defaults to 12.
+            start (Optional[date]): First release date, inclusive.
+            end (Optional[date]): Last release date, inclusive.
+            by (Optional[str]): "genre" or "language" for one series per group.
+            group (Optional[str]): Restrict to one genre or language.
+
+        Returns:
+            pd.DataFrame: Columns ['Group', 'Period', 'movie_count',
+            'Vote_Average', 'Popularity'].
+
+        Raises:
+            ValueError: If a parameter is invalid or the result too large.
+        """
+        return self.timeline().rolling_averages(freq, window, start, end, by=by, group=group)
+
     def get_language_diversity(self) -> pd.DataFrame:
         """
         Analyzes the distribution of movies across different languages.
@@ -160,9 +611,71 @@ class MovieAnalytics:
         Returns:
             pd.DataFrame: DataFrame with columns ['Original_Language', 'movie_count'].
         """
-        return (
-            self.df.groupby("Original_Language")["Title"]
-            .nunique()
-            .reset_index(name="movie_count")
-            .sort_values("movie_count", ascending=False)
-        )
\ No newline at end of file
+        return self._aggregate("language_stats")
+
+    def estimate_distinct_titles(self, dimension: str) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Estimates distinct titles per year, language or genre from the
+        HyperLogLog sketches, without touching the movies table.
+
+        Args:
+            dimension (str): "year", "language" or "genre".
+
+        Returns:
+            Tuple[pd.DataFrame, Dict]: Columns ['key', 'movie_count'] in key
+            order, and the error bound of every count.
+
+        Raises:
+            ValueError: If ``dimension`` is unknown.
+        """
+        sketches = self.sketches()
+        counts = sketches.distinct_titles(dimension)
+        frame = pd.DataFrame({"key": counts.index, "movie_count": counts.to_numpy()})
+        return frame, sketches.titles[dimension].error_bound()
+
+    def estimate_movies_per_year(self) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Approximate ``get_movies_per_year``.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict]: Columns ['Year', 'movie_count'] and
+            the error bound of the counts.
+        """
+        frame, bound = self.estimate_distinct_titles("year")
+        return frame.rename(columns={"key": "Year"}), bound
+
+    def estimate_language_diversity(self) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Approximate ``get_language_diversity``.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict]: Columns ['Original_Language',
+            'movie_count'] by descending count, and the error bound of the counts.
+        """
+        frame, bound = self.estimate_distinct_titles("language")
+        frame = frame.rename(columns={"key": "Original_Language"})
+        return frame.sort_values("movie_count", ascending=False, kind="stable"), bound
+
+    def estimate_top_rated_movies(self, limit: int = 10, min_votes: int = 500) -> Tuple[pd.DataFrame, Dict]:
+        """
+        ``get_top_rated_movies`` with the vote-count prior m taken from the
+        quantile sketch instead of the exact 70th percentile.
+
+        Args:
+            limit (int): Number of top records to return. Defaults to 10.
+            min_votes (int): Minimum vote threshold for eligibility. Defaults to 500.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict]: Top N rated movies, and the estimate
+            of m with bounds that are certain to contain the exact value.
+        """
+        votes = self.sketches().votes
+        prior = votes.threshold_quantile(WeightedRatingIndex.quantile, min_votes)
+        bound = {
+            "method": "quantile_sketch",
+            "confidence": 1.0,
+            "relative_error": votes.accuracy,
+            **(prior or {"estimate": None, "lower": None, "upper": None}),
+        }
+        m = prior["estimate"] if prior is not None else None
+        return self.weighted_index().top(limit, min_votes, m=m), bound
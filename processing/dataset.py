@@ -0,0 +1,210 @@
+"""
+Normalized Movie Dataset
+------------------------
+Container for the cleaned catalog in normalized form: a movies table
+with one row per movie and an integer ``Movie_Id``, plus a compact
+movie-genre bridge holding genre membership as categorical codes.
+"""
+import logging
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Columns that identify a movie row in the legacy exploded layout
+_LEGACY_MOVIE_KEYS = ["Release_Date", "Title", "Popularity", "Vote_Count", "Vote_Average", "Original_Language"]
+
+# Compact in-memory dtype of each movie column (see MovieDataset.compact).
+# "interned" keeps Python strings, with repeated values sharing one object;
+# they stay faster to gather per request than Arrow strings. Numeric
+# columns are only narrowed when lossless.
+COMPACT_DTYPES = {
+    "Movie_Id": "int32",
+    "Vote_Count": "int32",
+    "Popularity": "float32",
+    "Vote_Average": "float32",
+    "Original_Language": "category",
+    "Title": "interned",
+}
+
+
+def _narrow(values: pd.Series, dtype: str) -> pd.Series:
+    """Converts a numeric column to ``dtype`` if every value survives the round trip."""
+    if values.dtype == dtype or not pd.api.types.is_numeric_dtype(values.dtype):
+        return values
+    array = values.to_numpy()
+    with np.errstate(invalid="ignore", over="ignore"):
+        narrowed = array.astype(dtype)
+        exact = np.array_equal(narrowed.astype(array.dtype), array, equal_nan=narrowed.dtype.kind == "f")
+    if not exact:
+        logger.debug(f"Keeping {values.name} as {values.dtype}; {dtype} would lose precision")
+        return values
+    return pd.Series(narrowed, index=values.index, name=values.name)
+
+
+def _intern_strings(values: pd.Series) -> pd.Series:
+    """Makes repeated text values share one Python string object."""
+    if isinstance(values.array, pd.arrays.ArrowStringArray):
+        return values
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return values
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == len(values):
+        return values
+    interned = np.asarray(uniques, dtype=object)[codes]
+    interned[codes < 0] = None
+    return pd.Series(interned, index=values.index, name=values.name)
+
+
+@dataclass
+class MovieDataset:
+    """
+    The cleaned catalog as two tables.
+
+    Attributes:
+        movies (pd.DataFrame): One row per movie. ``Movie_Id`` equals the
+            row position, so ids can be used directly as array indexes.
+        genres (pd.DataFrame): Bridge table with columns ['Movie_Id', 'Genre'],
+            ordered by movie and by the genre order in the source data.
+    """
+    movies: pd.DataFrame
+    genres: pd.DataFrame
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    @staticmethod
+    def build_bridge(movie_ids: np.ndarray, genre_lists: pd.Series) -> pd.DataFrame:
+        """
+        Builds the bridge table from per-movie genre lists.
+
+        Args:
+            movie_ids (np.ndarray): Id of each movie, aligned with ``genre_lists``.
+            genre_lists (pd.Series): Lists of already-stripped genre names.
+
+        Returns:
+            pd.DataFrame: Bridge with columns ['Movie_Id', 'Genre'].
+        """
+        lengths = genre_lists.str.len().to_numpy()
+        names = np.concatenate(genre_lists.to_numpy()) if len(genre_lists) else np.array([], dtype=object)
+        bridge = pd.DataFrame({
+            "Movie_Id": np.repeat(np.asarray(movie_ids, dtype="int32"), lengths),
+            "Genre": pd.Series(names, dtype=object).replace("", "Unknown"),
+        })
+        bridge["Genre"] = bridge["Genre"].astype("category")
+        return bridge
+
+    @classmethod
+    def from_exploded(cls, df: pd.DataFrame) -> "MovieDataset":
+        """
+        Normalizes a legacy cleaned file that has one row per (movie, genre).
+
+        Rows of the same movie are adjacent in those files, so a new movie
+        starts wherever the identifying columns change.
+
+        Args:
+            df (pd.DataFrame): Exploded, sorted cleaned data.
+
+        Returns:
+            MovieDataset: The equivalent normalized dataset.
+        """
+        keys = [col for col in _LEGACY_MOVIE_KEYS if col in df.columns]
+        starts = (df[keys] != df[keys].shift()).any(axis=1).to_numpy()
+        if len(starts):
+            starts[0] = True
+        movie_ids = np.cumsum(starts) - 1
+
+        movies = df.loc[starts].drop(columns=["Genre"]).reset_index(drop=True)
+        movies.insert(0, "Movie_Id", np.arange(len(movies), dtype="int32"))
+        genres = pd.DataFrame({
+            "Movie_Id": movie_ids.astype("int32"),
+            "Genre": df["Genre"].astype(str).to_numpy(),
+        })
+        genres["Genre"] = genres["Genre"].astype("category")
+        return cls(movies=movies, genres=genres)
+
+    def compact(self, columns: Optional[List[str]] = None) -> "MovieDataset":
+        """
+        Returns the dataset projected to ``columns`` with compact dtypes.
+
+        Columns are converted as listed in COMPACT_DTYPES: low-cardinality
+        text becomes categorical codes, repeated titles share one string
+        object, and numeric columns are narrowed to 32 bits when every
+        value is preserved exactly. Columns already in a compact form
+        (such as memory-mapped Arrow strings) are kept as-is.
+
+        Args:
+            columns (Optional[List[str]]): Movie columns to keep, besides
+                                           ``Movie_Id``. Defaults to all.
+
+        Returns:
+            MovieDataset: The compacted dataset.
+        """
+        movies = self.movies
+        if columns is not None:
+            movies = movies[["Movie_Id"] + [c for c in columns if c in movies.columns and c != "Movie_Id"]]
+        compacted = {}
+        for column in movies.columns:
+            values = movies[column]
+            dtype = COMPACT_DTYPES.get(column)
+            if dtype == "category" and not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype("category")
+            elif dtype == "interned":
+                values = _intern_strings(values)
+            elif dtype is not None:
+                values = _narrow(values, dtype)
+            compacted[column] = values
+        genres = self.genres
+        if genres["Movie_Id"].dtype != "int32":
+            genres = genres.astype({"Movie_Id": "int32"})
+        return MovieDataset(movies=pd.DataFrame(compacted, copy=False), genres=genres)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Bytes held by each table, including string payloads.
+
+        Returns:
+            Dict[str, int]: Keys 'movies' and 'genres'.
+        """
+        return {
+            "movies": int(self.movies.memory_usage(index=False, deep=True).sum()),
+            "genres": int(self.genres.memory_usage(index=False, deep=True).sum()),
+        }
+
+    def schema(self) -> Dict[str, Dict[str, str]]:
+        """
+        Column dtypes of each table, as recorded in the dataset manifest.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Keys 'movies' and 'genres', each
+            mapping column names to dtype names.
+        """
+        return {
+            "movies": {column: str(dtype) for column, dtype in self.movies.dtypes.items()},
+            "genres": {column: str(dtype) for column, dtype in self.genres.dtypes.items()},
+        }
+
+    def genre_movie_ids(self) -> np.ndarray:
+        """Movie id of every bridge row, as a plain integer array."""
+        return self.genres["Movie_Id"].to_numpy()
+
+    def exploded(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Materializes the legacy one-row-per-genre view of selected columns.
+
+        Only the requested movie columns are repeated, so this stays cheap
+        for narrow projections.
+
+        Args:
+            columns (Optional[List[str]]): Movie columns to include.
+                                           Defaults to all movie columns.
+
+        Returns:
+            pd.DataFrame: One row per bridge entry with a 'Genre' column.
+        """
+        columns = list(self.movies.columns) if columns is None else columns
+        view = self.movies[columns].iloc[self.genre_movie_ids()].reset_index(drop=True)
+        view["Genre"] = self.genres["Genre"].to_numpy()
+        return view
@@ -0,0 +1,514 @@
+"""
+Analytics Indexes
+-----------------
+In-memory index structures built once when a dataset is loaded, so that
+per-request analytics become slices or lookups instead of full-frame
+sorts and scans.
+"""
+import base64
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from processing.dataset import MovieDataset
+
+RANKING_COLUMNS = ["Title", "Popularity", "Vote_Average", "Vote_Count"]
+
+# Public metric name -> dataset column
+RANKING_METRICS = {
+    "popularity": "Popularity",
+    "vote_count": "Vote_Count",
+    "vote_average": "Vote_Average",
+}
+
+
+def column_arrays(movies: pd.DataFrame, columns: List[str]) -> Dict[str, object]:
+    """
+    Views of movie columns that can be gathered by id without copying the table.
+
+    Plain arrays gather rows far faster than ``DataFrame.iloc``. Arrow
+    text columns are kept as-is rather than copied into Python objects.
+
+    Returns:
+        Dict[str, object]: Column name to ndarray or ArrowStringArray.
+    """
+    arrays = {}
+    for column in columns:
+        values = movies[column].array
+        arrays[column] = values if isinstance(values, pd.arrays.ArrowStringArray) else movies[column].to_numpy()
+    return arrays
+
+
+def gather_rows(arrays: Dict[str, object], ids: np.ndarray) -> pd.DataFrame:
+    """Builds a frame of the rows ``ids`` from ``column_arrays`` output."""
+    return pd.DataFrame({column: values[ids] for column, values in arrays.items()})
+
+
+class RankingIndex:
+    """
+    One row per title, pre-sorted in descending order of a metric.
+
+    A naive top-N sorts the whole catalog and de-duplicates titles on each
+    call. This index does that work once and keeps only the resulting
+    movie ids; a top-N query gathers the first ``limit`` of them. Ties keep
+    catalog (release date, title) order.
+
+    Attributes:
+        column (str): The dataset column the index is ordered by.
+    """
+
+    def __init__(self, movies: pd.DataFrame, column: str):
+        """
+        Builds the index.
+
+        Args:
+            movies (pd.DataFrame): The movies table (one row per movie).
+            column (str): Column to rank by (descending).
+        """
+        self.column = column
+        self._columns = column_arrays(movies, RANKING_COLUMNS)
+        order = np.argsort(-movies[column].to_numpy(dtype="float64"), kind="stable")
+        titles = pd.factorize(movies["Title"])[0][order]
+        _, first = np.unique(titles, return_index=True)
+        self._order = order[np.sort(first)]
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def top(self, limit: int) -> pd.DataFrame:
+        """
+        Returns the top ``limit`` titles.
+
+        Args:
+            limit (int): Number of rows to return.
+
+        Returns:
+            pd.DataFrame: Independent copy of the leading rows.
+        """
+        return gather_rows(self._columns, self._order[:limit])
+
+
+class WeightedRatingIndex:
+    """
+    Answers weighted-rating queries for any ``min_votes`` threshold.
+
+    Rows are kept sorted by vote count, so the rows that pass a threshold
+    are always a suffix of the arrays. With a suffix sum of ratings, the
+    Bayesian prior (m = 70th percentile of votes, C = mean rating) for any
+    threshold is found with one binary search instead of a filter, copy,
+    quantile and mean over the frame.
+
+    Statistics are taken over the genre bridge (each movie counts once per
+    genre), matching the historical one-row-per-genre computation of
+    ``MovieAnalytics.calculate_weighted_rating``.
+
+    Attributes:
+        quantile (float): Vote-count quantile used for m.
+    """
+
+    quantile = 0.70
+
+    def __init__(self, dataset: MovieDataset):
+        """
+        Builds the index.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset.
+        """
+        movies = dataset.movies
+        movie_ids = dataset.genre_movie_ids()
+        votes = movies["Vote_Count"].to_numpy(dtype="float64")[movie_ids]
+        order = np.argsort(votes, kind="stable")
+        self._votes = votes[order]
+        self._ratings = movies["Vote_Average"].to_numpy(dtype="float64")[movie_ids][order]
+        # Extended precision keeps the suffix means as close as possible to
+        # a direct mean over the filtered rows.
+        self._rating_suffix = np.cumsum(self._ratings[::-1], dtype=np.longdouble)[::-1]
+        self._movie_ids = movie_ids[order]
+        self._title_codes = pd.factorize(movies["Title"])[0][self._movie_ids]
+        self._columns = column_arrays(movies, ["Title", "Vote_Average", "Vote_Count"])
+
+    def __len__(self) -> int:
+        return len(self._votes)
+
+    def _quantile(self, start: int) -> float:
+        """
+        Linear-interpolated quantile of the sorted suffix ``votes[start:]``.
+
+        Mirrors numpy's default ("linear") method so m is bit-identical to
+        ``Series.quantile``.
+        """
+        votes = self._votes[start:]
+        position = (len(votes) - 1) * self.quantile
+        lower = int(np.floor(position))
+        if lower >= len(votes) - 1:
+            return float(votes[-1])
+        gamma = position - lower
+        a, b = votes[lower], votes[lower + 1]
+        diff = b - a
+        if gamma >= 0.5:
+            return float(b - diff * (1 - gamma))
+        return float(a + diff * gamma)
+
+    def prior(self, min_votes: int) -> Optional[Tuple[int, float, float]]:
+        """
+        Locates the eligible rows and the rating prior for a threshold.
+
+        Args:
+            min_votes (int): Minimum vote count for eligibility.
+
+        Returns:
+            Optional[Tuple[int, float, float]]: ``(start, m, C)`` where the
+            eligible rows are ``[start:]``, or None if no row qualifies.
+        """
+        start = int(np.searchsorted(self._votes, min_votes, side="left"))
+        count = len(self._votes) - start
+        if count == 0:
+            return None
+        m = self._quantile(start)
+        C = float(self._rating_suffix[start] / count)
+        return start, m, C
+
+    def top(self, limit: int, min_votes: int, m: Optional[float] = None) -> pd.DataFrame:
+        """
+        Returns the top titles by weighted rating among eligible rows.
+
+        The scores are computed vectorized over the eligible suffix and the
+        leaders are selected with ``argpartition``; only the candidates are
+        sorted, never the whole frame.
+
+        Args:
+            limit (int): Number of titles to return.
+            min_votes (int): Minimum vote count for eligibility.
+            m (Optional[float]): Vote-count prior to use instead of the exact
+                                 quantile, e.g. a sketch estimate.
+
+        Returns:
+            pd.DataFrame: Columns ['Title', 'Weighted_Rating', 'Vote_Average',
+            'Vote_Count'], rounded to two decimals.
+        """
+        columns = ["Title", "Weighted_Rating", "Vote_Average", "Vote_Count"]
+        prior = self.prior(min_votes)
+        if prior is None:
+            return pd.DataFrame(columns=columns)
+        start, exact_m, C = prior
+        if m is None:
+            m = exact_m
+
+        v = self._votes[start:]
+        R = self._ratings[start:]
+        scores = (v / (v + m) * R) + (m / (v + m) * C)
+        codes = self._title_codes[start:]
+
+        # Each title appears once per genre, so grow the candidate pool
+        # until it holds ``limit`` distinct titles.
+        total = len(scores)
+        pool = min(total, limit * 4)
+        while True:
+            if pool < total:
+                candidates = np.sort(np.argpartition(-scores, pool - 1)[:pool])
+            else:
+                candidates = np.arange(total)
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            _, first = np.unique(codes[candidates], return_index=True)
+            if len(first) >= limit or pool >= total:
+                break
+            pool = min(total, pool * 4)
+
+        chosen = candidates[np.sort(first)][:limit]
+        result = gather_rows(self._columns, self._movie_ids[chosen + start])
+        result.insert(1, "Weighted_Rating", scores[chosen])
+        return result[columns].round(2)
+
+
+# Public sort key name -> movies column for MovieFilterIndex.query
+QUERY_SORT_KEYS = {
+    "popularity": "Popularity",
+    "vote_count": "Vote_Count",
+    "vote_average": "Vote_Average",
+    "release_date": "Release_Date",
+}
+
+QUERY_COLUMNS = ["Movie_Id", "Title", "Release_Date", "Original_Language", "Genres", "Popularity", "Vote_Average", "Vote_Count"]
+
+
+def encode_cursor(value, movie_id: int) -> str:
+    """
+    Encodes the sort position of the last returned row as an opaque token.
+
+    Args:
+        value: Sort value of the row (a float or an integer).
+        movie_id (int): Id of the row, the tie-breaker.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps([value, int(movie_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decodes a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, movie_id = json.loads(raw)
+        if not isinstance(value, (int, float)) or not isinstance(movie_id, int):
+            raise TypeError
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+    return value, movie_id
+
+
+class MovieFilterIndex:
+    """
+    Answers filtered, sorted and paginated movie queries without full scans.
+
+    Filters are backed by load-time structures:
+
+    - genre and language: inverted posting lists of sorted movie ids;
+    - release year: ids are assigned in release-date order, so a year
+      range is a contiguous id range found by binary search;
+    - vote count and rating thresholds: ids sorted by the metric, so the
+      rows passing a threshold are a suffix.
+
+    Each filter's candidate count is known in O(log n). The smallest set
+    is materialized and the remaining filters are applied as probes on it
+    (binary searches or gathers), so a query costs O(k log n) for the
+    smallest candidate set k rather than O(n).
+
+    Attributes:
+        genres (List[str]): Genre names available for filtering.
+    """
+
+    def __init__(self, dataset: MovieDataset):
+        """
+        Builds the index.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset.
+        """
+        movies = dataset.movies
+        self._size = len(movies)
+        self._columns = column_arrays(movies, [column for column in QUERY_COLUMNS if column != "Genres"])
+        self._columns["Original_Language"] = movies["Original_Language"].to_numpy(dtype=object)
+        self._values = {
+            name: movies[column].to_numpy().view("int64") if name == "release_date"
+            else movies[column].to_numpy(dtype="float64")
+            for name, column in QUERY_SORT_KEYS.items()
+        }
+
+        dates = self._values["release_date"]
+        self._dates_monotonic = bool(np.all(dates[1:] >= dates[:-1]))
+        self._date_order = np.arange(self._size) if self._dates_monotonic else np.argsort(dates, kind="stable")
+        self._sorted_dates = dates[self._date_order]
+        self._threshold_orders = {}
+        for name in ("vote_count", "vote_average"):
+            order = np.argsort(self._values[name], kind="stable")
+            self._threshold_orders[name] = (order, self._values[name][order])
+
+        # Bridge rows grouped by movie, for posting lists and genre lookups
+        bridge_ids = dataset.genre_movie_ids()
+        genre_codes = dataset.genres["Genre"].cat.codes.to_numpy()
+        self._genre_names = np.asarray(dataset.genres["Genre"].cat.categories, dtype=object)
+        if not np.all(bridge_ids[1:] >= bridge_ids[:-1]):
+            order = np.argsort(bridge_ids, kind="stable")
+            bridge_ids, genre_codes = bridge_ids[order], genre_codes[order]
+        self._bridge_codes = genre_codes
+        self._genre_offsets = np.concatenate([[0], np.cumsum(np.bincount(bridge_ids, minlength=self._size))])
+
+        by_genre = np.lexsort((bridge_ids, genre_codes))
+        self._genre_postings = self._postings(genre_codes[by_genre], bridge_ids[by_genre], self._genre_names)
+        language_codes, languages = pd.factorize(movies["Original_Language"].astype(str))
+        by_language = np.argsort(language_codes, kind="stable")
+        self._language_postings = self._postings(
+            language_codes[by_language], by_language, np.asarray(languages, dtype=object)
+        )
+        self.genres = sorted(self._genre_names.tolist())
+
+    @staticmethod
+    def _postings(codes: np.ndarray, ids: np.ndarray, names: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Splits ids grouped by code into per-name sorted, unique id arrays.
+
+        Keys are lower-cased so lookups are case-insensitive.
+        """
+        bounds = np.searchsorted(codes, np.arange(len(names) + 1))
+        postings = {}
+        for code, name in enumerate(names):
+            postings[str(name).lower()] = np.unique(ids[bounds[code]:bounds[code + 1]]).astype("int64")
+        return postings
+
+    def _year_bounds(self, year_from: Optional[int], year_to: Optional[int]) -> Tuple[int, int]:
+        """Positions in date order of the first and past-the-last movie in range."""
+        lo, hi = 0, self._size
+        if year_from is not None:
+            lo = int(np.searchsorted(self._sorted_dates, pd.Timestamp(year=year_from, month=1, day=1).value, side="left"))
+        if year_to is not None:
+            hi = int(np.searchsorted(self._sorted_dates, pd.Timestamp(year=year_to + 1, month=1, day=1).value, side="left"))
+        return lo, max(lo, hi)
+
+    def _threshold_start(self, name: str, minimum: float) -> int:
+        """Position in metric order of the first movie at or above ``minimum``."""
+        return int(np.searchsorted(self._threshold_orders[name][1], minimum, side="left"))
+
+    def match(
+        self,
+        genre: Optional[str] = None,
+        language: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        min_votes: Optional[float] = None,
+        min_rating: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        Returns the sorted ids of every movie matching all given filters.
+
+        Args:
+            genre (Optional[str]): Genre name (case-insensitive).
+            language (Optional[str]): Original language code (case-insensitive).
+            year_from (Optional[int]): First release year, inclusive.
+            year_to (Optional[int]): Last release year, inclusive.
+            min_votes (Optional[float]): Minimum vote count.
+            min_rating (Optional[float]): Minimum vote average.
+
+        Returns:
+            np.ndarray: Matching movie ids in ascending order.
+        """
+        # Candidate sources as (size, materialize, probe) triples
+        sources = []
+        for postings, key in ((self._genre_postings, genre), (self._language_postings, language)):
+            if key is None:
+                continue
+            ids = postings.get(key.strip().lower(), np.empty(0, dtype="int64"))
+            sources.append((len(ids), lambda ids=ids: ids, lambda cand, ids=ids: self._probe_sorted(cand, ids)))
+
+        if year_from is not None or year_to is not None:
+            lo, hi = self._year_bounds(year_from, year_to)
+            sources.append((hi - lo, lambda: self._date_slice(lo, hi), lambda cand: self._probe_dates(cand, lo, hi)))
+
+        for name, minimum in (("vote_count", min_votes), ("vote_average", min_rating)):
+            if minimum is None:
+                continue
+            start = self._threshold_start(name, minimum)
+            sources.append((
+                self._size - start,
+                lambda name=name, start=start: np.sort(self._threshold_orders[name][0][start:]),
+                lambda cand, name=name, minimum=minimum: cand[self._values[name][cand] >= minimum],
+            ))
+
+        if not sources:
+            return np.arange(self._size, dtype="int64")
+        sources.sort(key=lambda source: source[0])
+        candidates = np.asarray(sources[0][1](), dtype="int64")
+        for _, _, probe in sources[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = probe(candidates)
+        return candidates
+
+    def _date_slice(self, lo: int, hi: int) -> np.ndarray:
+        """Ids of the movies at date-order positions ``[lo, hi)``, ascending."""
+        if self._dates_monotonic:
+            return np.arange(lo, hi, dtype="int64")
+        return np.sort(self._date_order[lo:hi])
+
+    def _probe_dates(self, candidates: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        """Keeps candidates whose release date falls in date-order positions ``[lo, hi)``."""
+        if self._dates_monotonic:
+            return candidates[np.searchsorted(candidates, lo):np.searchsorted(candidates, hi)]
+        if lo == hi:
+            return candidates[:0]
+        dates = self._values["release_date"][candidates]
+        return candidates[(dates >= self._sorted_dates[lo]) & (dates <= self._sorted_dates[hi - 1])]
+
+    @staticmethod
+    def _probe_sorted(candidates: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """Intersects sorted candidates with a sorted posting list by binary search."""
+        if len(ids) == 0:
+            return candidates[:0]
+        positions = np.minimum(np.searchsorted(ids, candidates), len(ids) - 1)
+        return candidates[ids[positions] == candidates]
+
+    def query(
+        self,
+        sort_by: str = "popularity",
+        descending: bool = True,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> Tuple[pd.DataFrame, int, Optional[str]]:
+        """
+        Filters, sorts and paginates the catalog.
+
+        Rows are ordered by ``sort_by`` with ties broken by ascending
+        Movie_Id, which makes the cursor position unambiguous.
+
+        Args:
+            sort_by (str): One of QUERY_SORT_KEYS.
+            descending (bool): Sort direction. Defaults to True.
+            limit (int): Page size.
+            cursor (Optional[str]): Cursor returned with the previous page.
+            **filters: Keyword filters accepted by ``match``.
+
+        Returns:
+            Tuple[pd.DataFrame, int, Optional[str]]: The page (QUERY_COLUMNS),
+            the total number of matches and the cursor of the next page, or
+            None on the last page.
+
+        Raises:
+            ValueError: If ``sort_by`` is unknown or the cursor is malformed.
+        """
+        if sort_by not in QUERY_SORT_KEYS:
+            raise ValueError(f"Unsupported sort key '{sort_by}'. Expected one of {list(QUERY_SORT_KEYS)}")
+        matches = self.match(**filters)
+        total = len(matches)
+
+        # Ascending order of ``keys`` is the requested order.
+        values = self._values[sort_by][matches]
+        keys = -values if descending else values
+        candidates = matches
+        if cursor is not None:
+            value, last_id = decode_cursor(cursor)
+            last_key = -value if descending else value
+            after = (keys > last_key) | ((keys == last_key) & (candidates > last_id))
+            candidates, keys, values = candidates[after], keys[after], values[after]
+
+        has_more = len(candidates) > limit
+        if has_more:
+            # Keep the leading rows plus every row tied with the last of them.
+            kth = np.partition(keys, limit - 1)[limit - 1]
+            lead = keys <= kth
+            candidates, keys, values = candidates[lead], keys[lead], values[lead]
+        order = np.lexsort((candidates, keys))[:limit]
+        page_ids = candidates[order]
+
+        next_cursor = None
+        if has_more and len(page_ids):
+            last_value = values[order[-1]]
+            last_value = int(last_value) if sort_by == "release_date" else float(last_value)
+            next_cursor = encode_cursor(last_value, page_ids[-1])
+        return self.rows(page_ids), total, next_cursor
+
+    def rows(self, ids: np.ndarray) -> pd.DataFrame:
+        """
+        Materializes result rows in QUERY_COLUMNS layout, including each
+        movie's genre list.
+
+        Args:
+            ids (np.ndarray): Movie ids, in output order.
+
+        Returns:
+            pd.DataFrame: One row per id.
+        """
+        starts, ends = self._genre_offsets[ids], self._genre_offsets[ids + 1]
+        genres = [self._genre_names[self._bridge_codes[s:e]].tolist() for s, e in zip(starts, ends)]
+        return pd.DataFrame({
+            column: genres if column == "Genres" else self._columns[column][ids]
+            for column in QUERY_COLUMNS
+        })
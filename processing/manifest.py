@@ -0,0 +1,174 @@
+"""
+Dataset Manifest
+----------------
+Small JSON file published next to the cleaned dataset, after every other
+artifact, describing the revision just written: a content hash of the
+tables, row counts, column schema and build time. API instances poll
+it to learn which dataset is live and tag caches and responses with its
+version, so hosts sharing a data volume agree on what they serve.
+
+This module imports nothing heavy so the API can poll the manifest
+without loading pandas.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from processing.paths import resolve_source
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Characters of the content hash used as the dataset version tag
+_TAG_LENGTH = 16
+
+_READ_BLOCK = 1 << 20
+
+
+def manifest_path(csv_path: Path) -> Path:
+    """
+    Location of the manifest of a dataset.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+
+    Returns:
+        Path: ``<stem>_manifest.json`` next to the CSV.
+    """
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_manifest.json")
+
+
+def content_hash(paths: Iterable[Path]) -> str:
+    """
+    Hashes the bytes of several files, in order.
+
+    Each file is prefixed with its length, so moving bytes from one file
+    to the next changes the hash.
+
+    Args:
+        paths (Iterable[Path]): Files to hash.
+
+    Returns:
+        str: Hex BLAKE2b digest (128 bits).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        digest.update(os.stat(path).st_size.to_bytes(8, "little"))
+        with open(path, "rb") as f:
+            while block := f.read(_READ_BLOCK):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(
+    tables: Iterable[Path],
+    rows: Dict[str, int],
+    schema: Dict[str, Dict[str, str]],
+    data_format: str,
+) -> dict:
+    """
+    Describes a freshly written dataset.
+
+    Args:
+        tables (Iterable[Path]): The CSV tables, movies then genre bridge.
+            Every pipeline mode writes them byte for byte the same, so the
+            hash depends on the data only.
+        rows (Dict[str, int]): Row count per table.
+        schema (Dict[str, Dict[str, str]]): Column dtypes per table.
+        data_format (str): Columnar format written next to the CSV.
+
+    Returns:
+        dict: The manifest.
+    """
+    digest = content_hash(tables)
+    return {
+        "manifest_version": MANIFEST_VERSION,
+        "version": digest[:_TAG_LENGTH],
+        "content_hash": f"blake2b-128:{digest}",
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "data_format": data_format,
+        "rows": rows,
+        "schema": schema,
+    }
+
+
+def write_manifest(manifest: dict, path: Path) -> None:
+    """
+    Atomically replaces the manifest (temporary file plus rename).
+
+    The temporary file is created with a plain ``open`` so it gets the
+    same umask-derived permissions as the other artifacts, and API
+    instances running as another user can read it.
+
+    Args:
+        manifest (dict): Output of ``build_manifest``.
+        path (Path): Destination, see ``manifest_path``.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def read_manifest(path: Path) -> Optional[dict]:
+    """
+    Loads a manifest.
+
+    Args:
+        path (Path): Manifest path.
+
+    Returns:
+        Optional[dict]: The manifest, or None if it is missing, unreadable
+        or written by an incompatible version. Anything but a missing file
+        is logged, since callers then fall back to a host-local version.
+    """
+    try:
+        manifest = json.loads(Path(path).read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cannot read dataset manifest {path}: {e}")
+        return None
+    if not isinstance(manifest, dict) or manifest.get("manifest_version") != MANIFEST_VERSION:
+        logger.warning(f"Ignoring dataset manifest {path}: unsupported manifest version")
+        return None
+    return manifest
+
+
+def dataset_version(csv_path: Path, data_format: str) -> Tuple[Optional[str], Optional[dict]]:
+    """
+    Identifies the dataset revision currently on disk.
+
+    Reads the manifest, a single small file; reading it (rather than
+    statting it) also sees updates through attribute caches of network
+    file systems. Datasets written before manifests existed are
+    identified by the modification time and size of their data file.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+        data_format (str): Preferred storage format.
+
+    Returns:
+        Tuple[Optional[str], Optional[dict]]: The version tag and the
+        manifest (None without one), or (None, None) if there is no data.
+    """
+    manifest = read_manifest(manifest_path(csv_path))
+    if manifest is not None:
+        return manifest["version"], manifest
+
+    try:
+        st = os.stat(resolve_source(csv_path, data_format)[0])
+    except FileNotFoundError:
+        return None, None
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}", None
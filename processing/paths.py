@@ -0,0 +1,136 @@
+"""
+Dataset Paths
+-------------
+Locations of the cleaned dataset and its companion artifacts, all derived
+from the path of the cleaned CSV.
+
+This module imports nothing heavy, so the API can report and poll the
+dataset without loading pandas or pyarrow; ``processing.storage`` does
+the reading and writing.
+"""
+import importlib.util
+from pathlib import Path
+from typing import Tuple
+
+# Looked up without importing pyarrow, which is slow to load
+_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+SUPPORTED_FORMATS = ("csv", "feather", "parquet")
+
+_SUFFIXES = {
+    "csv": ".csv",
+    "feather": ".feather",
+    "parquet": ".parquet",
+}
+
+
+def artifact_path(csv_path: Path, data_format: str) -> Path:
+    """
+    Derives the on-disk location of a dataset artifact from the CSV path.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV (settings.CLEANED_DATA_PATH).
+        data_format (str): One of SUPPORTED_FORMATS.
+
+    Returns:
+        Path: Sibling path with the extension for ``data_format``.
+    """
+    if data_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported data format '{data_format}'. Expected one of {SUPPORTED_FORMATS}")
+    return Path(csv_path).with_suffix(_SUFFIXES[data_format])
+
+
+def genres_path(movies_path: Path) -> Path:
+    """
+    Location of the genre bridge stored next to a movies artifact.
+
+    Args:
+        movies_path (Path): Path of the movies table in any format.
+
+    Returns:
+        Path: ``<stem>_genres<suffix>`` next to the movies file.
+    """
+    movies_path = Path(movies_path)
+    return movies_path.with_name(f"{movies_path.stem}_genres{movies_path.suffix}")
+
+
+def aggregates_path(csv_path: Path) -> Path:
+    """
+    Location of the materialized aggregates artifact for a dataset.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+
+    Returns:
+        Path: ``<stem>_aggregates.json`` next to the CSV.
+    """
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_aggregates.json")
+
+
+def search_index_path(csv_path: Path) -> Path:
+    """
+    Location of the persisted title search index for a dataset.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+
+    Returns:
+        Path: ``<stem>_search.npz`` next to the CSV.
+    """
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_search.npz")
+
+
+def sketches_path(csv_path: Path) -> Path:
+    """
+    Location of the persisted approximate-analytics sketches for a dataset.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+
+    Returns:
+        Path: ``<stem>_sketches.npz`` next to the CSV.
+    """
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_sketches.npz")
+
+
+def report_path(csv_path: Path) -> Path:
+    """
+    Location of the run report of the last preprocessing run.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+
+    Returns:
+        Path: ``<stem>_report.json`` next to the CSV.
+    """
+    csv_path = Path(csv_path)
+    return csv_path.with_name(f"{csv_path.stem}_report.json")
+
+
+def columnar_available() -> bool:
+    """Whether pyarrow is installed and columnar formats can be used."""
+    return _PYARROW
+
+
+def resolve_source(csv_path: Path, data_format: str) -> Tuple[Path, str]:
+    """
+    Picks the artifact to load for the requested format.
+
+    Falls back to CSV when the columnar artifact has not been written yet
+    or pyarrow is not installed.
+
+    Args:
+        csv_path (Path): Path of the cleaned CSV.
+        data_format (str): Preferred format.
+
+    Returns:
+        Tuple[Path, str]: The path to read and the format it is stored in.
+    """
+    if data_format != "csv" and columnar_available():
+        path = artifact_path(csv_path, data_format)
+        if path.exists():
+            return path, data_format
+    return Path(csv_path), "csv"
@@ -3,41 +3,160 @@ Data Preprocessing Module
 -------------------------
 Handles the transformation of raw movie CSV data into a cleaned, 
 analytics-ready format. Includes logic for date parsing, numeric 
-normalization, and multi-genre explosion.
+normalization, and splitting multi-genre fields into a genre bridge.
 """
+import argparse
+import io
+import json
+import numpy as np
+import os
+import re
 import pandas as pd
 import logging
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from api.core.config import settings
+from processing.storage import (
+    DatasetWriter,
+    artifact_path,
+    genres_path,
+    read_dataset,
+    resolve_source,
+    report_path,
+    search_index_path,
+    sketches_path,
+    write_dataset,
+    aggregates_path,
+)
+from processing.aggregates import AGGREGATE_COLUMNS, changed_keys, dataset_fingerprint, refresh_aggregates, write_aggregates
+from processing.dataset import MovieDataset
+from processing.manifest import build_manifest, manifest_path, write_manifest
+from processing.profiling import PipelineProfiler, compare_reports, format_report, write_report
+from processing.search import TitleIndexBuilder, TitleSearchIndex, refresh_search_index
+from processing.sketches import MovieSketches, refresh_sketches
+from processing.streaming import RunFile, SORT_KEYS, external_sort
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Free-text columns read as strings in streaming mode so every chunk
+# infers the same dtypes.
+TEXT_COLUMNS = ["Title", "Overview", "Original_Language", "Genre", "Poster_Url"]
+
+# Working-set multiplier: a chunk is alive as raw text, cleaned frame and
+# sorted run at the same time.
+_CHUNK_OVERHEAD = 4
+
+# Read size used when scanning the raw file for shard boundaries
+_SCAN_BLOCK = 1 << 20
+_QUOTE_OR_NEWLINE = re.compile(rb'["\n]')
+
+
+def find_record_boundaries(path: Path, shards: int) -> Tuple[bytes, List[int]]:
+    """
+    Splits a CSV file into byte ranges that start and end on record boundaries.
+
+    Each target offset is moved forward to the next newline that is not
+    inside a quoted field. Quote state is tracked by parity, which is exact
+    for standard CSV quoting (embedded quotes doubled), so multi-line
+    overviews are never cut in half.
+
+    Args:
+        path (Path): The CSV file.
+        shards (int): Desired number of ranges.
+
+    Returns:
+        Tuple[bytes, List[int]]: The header line and the ascending shard
+        offsets; shard ``i`` covers ``[offsets[i], offsets[i + 1])``.
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        offsets = [data_start]
+        pos = data_start
+        in_quotes = False
+        for shard in range(1, shards):
+            target = data_start + (size - data_start) * shard // shards
+            if target <= pos:
+                continue
+            while pos < target:
+                block = f.read(min(_SCAN_BLOCK, target - pos))
+                in_quotes ^= block.count(b'"') % 2 == 1
+                pos += len(block)
+
+            boundary = None
+            while boundary is None:
+                block = f.read(_SCAN_BLOCK)
+                if not block:
+                    break
+                for match in _QUOTE_OR_NEWLINE.finditer(block):
+                    if match.group() == b'"':
+                        in_quotes = not in_quotes
+                    elif not in_quotes:
+                        boundary = pos + match.end()
+                        break
+                else:
+                    pos += len(block)
+            if boundary is None or boundary >= size:
+                break
+            offsets.append(boundary)
+            pos = boundary
+            in_quotes = False
+            f.seek(pos)
+        offsets.append(size)
+    return header, offsets
+
+
+def _concat_cleaned(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates cleaned frames in order with the dtypes of a whole-file read.
+
+    A piece that happens to hold only integers would otherwise keep int64
+    where a single read sees float64, changing how values are written.
+    """
+    df = pd.concat(frames, ignore_index=True)
+    for col in df.columns:
+        dtypes = [frame[col].dtype for frame in frames]
+        if all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype) for dtype in dtypes):
+            df[col] = df[col].astype(np.result_type(*dtypes))
+    return df
+
 class MovieDataPreprocessor:
     """
     Handles the end-to-end data engineering pipeline for movie datasets.
 
     This class provides methods to load raw CSV data, perform cleaning and 
-    normalization (including genre explosion), and persist the cleaned data 
-    for downstream analytics.
+    normalization (including the movie-genre bridge), and persist the cleaned
+    data for downstream analytics.
 
     Attributes:
         raw_path (Path): Path to the source raw CSV file.
         output_path (Path): Path where the cleaned CSV will be saved.
+        data_format (str): Columnar format written next to the CSV.
+        profiler (PipelineProfiler): Stage timings and data-quality counters of the run.
     """
 
-    def __init__(self, raw_path: Path, output_path: Path):
+    def __init__(self, raw_path: Path, output_path: Path, data_format: Optional[str] = None):
         """
         Initializes the preprocessor with source and destination paths.
 
         Args:
             raw_path (Path): Absolute path to the raw input data.
             output_path (Path): Absolute path for the cleaned output data.
+            data_format (Optional[str]): "csv", "feather" or "parquet".
+                                         Defaults to settings.DATA_FORMAT.
         """
         self.raw_path = raw_path
         self.output_path = output_path
+        self.data_format = data_format or settings.DATA_FORMAT
+        self.profiler = PipelineProfiler()
 
     def load_data(self) -> pd.DataFrame:
         """
@@ -63,7 +182,151 @@ class MovieDataPreprocessor:
             encoding="utf-8",
         )
 
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def iter_raw_chunks(self, chunk_rows: int, engine: str = "c") -> Iterator[pd.DataFrame]:
+        """
+        Streams the raw dataset in chunks of at most ``chunk_rows`` rows.
+
+        The C engine handles quoted multi-line fields and is much faster than
+        the Python engine; ``round_trip`` float parsing keeps numbers
+        bit-identical to it.
+
+        Args:
+            chunk_rows (int): Rows per chunk.
+            engine (str): "c" or "python".
+
+        Yields:
+            pd.DataFrame: Consecutive raw chunks.
+
+        Raises:
+            FileNotFoundError: If no file exists at the specified raw_path.
+        """
+        if not self.raw_path.exists():
+            logger.error(f"Raw data file not found at {self.raw_path}")
+            raise FileNotFoundError(f"Raw data file not found at {self.raw_path}")
+
+        with pd.read_csv(self.raw_path, chunksize=chunk_rows, **self._read_options(engine)) as reader:
+            yield from reader
+
+    @staticmethod
+    def _read_options(engine: str) -> dict:
+        """``read_csv`` options for reading the raw file in pieces."""
+        options = {
+            "engine": engine,
+            "quotechar": '"',
+            "encoding": "utf-8",
+            "dtype": {col: str for col in TEXT_COLUMNS},
+        }
+        if engine == "c":
+            options["float_precision"] = "round_trip"
+        return options
+
+    def clean_shard(self, header: bytes, start: int, end: int) -> Tuple[pd.DataFrame, int, MovieSketches, PipelineProfiler]:
+        """
+        Parses, cleans and sketches one byte range of the raw file (runs in a worker).
+
+        Args:
+            header (bytes): The raw file's header line.
+            start (int): First byte of the shard (a record boundary).
+            end (int): End of the shard, exclusive.
+
+        Returns:
+            Tuple[pd.DataFrame, int, MovieSketches, PipelineProfiler]: Cleaned
+            rows in source order, the number of raw rows read, the sketches
+            of the rows and the profile of this shard's stages.
+        """
+        # The worker runs on a copy of the preprocessor; profile only this shard.
+        self.profiler = PipelineProfiler()
+        with self.profiler.stage("load") as stage:
+            with open(self.raw_path, "rb") as f:
+                f.seek(start)
+                data = header + f.read(end - start)
+            try:
+                df = pd.read_csv(io.BytesIO(data), **self._read_options("c"))
+            except pd.errors.ParserError:
+                df = pd.read_csv(io.BytesIO(data), **self._read_options("python"))
+            stage.rows_out = len(df)
+        cleaned = self.clean_rows(df)
+        with self.profiler.stage("shard_sketches", rows_in=len(cleaned)):
+            sketches = MovieSketches.from_rows(cleaned)
+        return cleaned, len(df), sketches, self.profiler
+
+    def clean_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the row-local cleaning steps (everything except sorting).
+
+        Rows with unparseable dates are dropped; genres become lists of
+        stripped names. The input frame is not modified.
+
+        Args:
+            df (pd.DataFrame): Raw rows.
+
+        Returns:
+            pd.DataFrame: Cleaned rows in input order, with list-valued 'Genre'.
+        """
+        profiler = self.profiler
+        # Date handling
+        with profiler.stage("parse_dates", rows_in=len(df)) as stage:
+            release_dates = pd.to_datetime(df["Release_Date"], errors="coerce")
+            valid = release_dates.notna()
+            df = df[valid].copy()
+            df["Release_Date"] = release_dates[valid]
+            stage.rows_out = len(df)
+        profiler.count("invalid_dates", (~valid).sum())
+
+        # Numeric coercion
+        with profiler.stage("coerce_numeric", rows_in=len(df)) as stage:
+            numeric_cols = ["Popularity", "Vote_Count", "Vote_Average"]
+            for col in numeric_cols:
+                values = pd.to_numeric(df[col], errors="coerce")
+                profiler.count(f"{col.lower()}_filled", values.isna().sum())
+                df[col] = values.fillna(0)
+            stage.rows_out = len(df)
+
+        # Categorical cleanup
+        with profiler.stage("normalize_language", rows_in=len(df)) as stage:
+            profiler.count("missing_language", df["Original_Language"].isna().sum())
+            df["Original_Language"] = (
+                df["Original_Language"]
+                .fillna("unknown")
+                .astype(str)
+                .str.lower()
+                .str.strip()
+            )
+            stage.rows_out = len(df)
+
+        # Genre normalization
+        with profiler.stage("split_genres", rows_in=len(df)) as stage:
+            profiler.count("missing_genre", df["Genre"].isna().sum())
+            df["Genre"] = (
+                df["Genre"]
+                .fillna("Unknown")
+                .astype(str)
+                .str.split(",")
+            )
+            df["Genre"] = df["Genre"].apply(lambda genres: [g.strip() for g in genres])
+            stage.rows_out = len(df)
+        return df
+
+    @staticmethod
+    def to_dataset(df: pd.DataFrame, first_id: int = 0) -> MovieDataset:
+        """
+        Assigns Movie_Id to sorted, cleaned rows and splits out the genre bridge.
+
+        Args:
+            df (pd.DataFrame): Cleaned rows in final order.
+            first_id (int): Id of the first row. Defaults to 0.
+
+        Returns:
+            MovieDataset: One row per movie plus the genre bridge.
+        """
+        df = df.reset_index(drop=True)
+        df.insert(0, "Movie_Id", np.arange(first_id, first_id + len(df), dtype="int32"))
+
+        # Genre bridge (one row per movie and genre, stored as category codes)
+        genres = MovieDataset.build_bridge(df["Movie_Id"].to_numpy(), df.pop("Genre"))
+        return MovieDataset(movies=df, genres=genres)
+
+    def clean_data(self, df: pd.DataFrame) -> MovieDataset:
         """
         Executes cleaning, type coercion, and normalization logic.
 
@@ -71,86 +334,567 @@ class MovieDataPreprocessor:
         - Date parsing and handling missing dates.
         - Numeric coercion for popularity and vote metrics.
         - Normalizing categorical fields (Language, Genre).
-        - Exploding multi-valued genres into individual rows.
-        - Sorting records for deterministic output.
+        - Sorting records for deterministic output and assigning Movie_Id.
+        - Moving multi-valued genres into a movie-genre bridge table.
 
         Args:
             df (pd.DataFrame): The raw input DataFrame.
 
         Returns:
-            pd.DataFrame: A cleaned and normalized DataFrame.
+            MovieDataset: One row per movie plus the genre bridge.
         """
         logger.info("Starting data cleaning process...")
-        df = df.copy()
-
-        # Date handling
-        df["Release_Date"] = pd.to_datetime(df["Release_Date"], errors="coerce")
         initial_count = len(df)
-        df = df.dropna(subset=["Release_Date"]).copy()
+        df = self.clean_rows(df)
         logger.info(f"Dropped {initial_count - len(df)} rows with invalid dates")
 
-        # Numeric coercion
-        numeric_cols = ["Popularity", "Vote_Count", "Vote_Average"]
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+        # Sorting
+        with self.profiler.stage("sort", rows_in=len(df)) as stage:
+            df = df.sort_values(by=SORT_KEYS)
+            stage.rows_out = len(df)
+        with self.profiler.stage("build_bridge", rows_in=len(df)) as stage:
+            dataset = self.to_dataset(df)
+            stage.rows_out = len(dataset.genres)
+        
+        logger.info(f"Data cleaning complete. Final record count: {len(dataset.movies)} movies, {len(dataset.genres)} genre links")
+        return dataset
 
-        # Categorical cleanup
-        df["Original_Language"] = (
-            df["Original_Language"]
-            .fillna("unknown")
-            .astype(str)
-            .str.lower()
-            .str.strip()
-        )
+    @contextmanager
+    def _staging(self) -> Iterator[Path]:
+        """
+        Provides a scratch directory next to the output for staging a run.
 
-        # Genre normalization
-        df["Genre"] = (
-            df["Genre"]
-            .fillna("Unknown")
-            .astype(str)
-            .str.split(",")
-        )
-        df["Genre"] = df["Genre"].apply(lambda genres: [g.strip() for g in genres])
+        Yields:
+            Path: Staged location of the movies CSV; companions are written
+            next to it and published together by ``save_data``.
+        """
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix=".preprocess-", dir=self.output_path.parent) as tmp:
+            yield Path(tmp) / self.output_path.name
 
-        # Explode genres
-        df = df.explode("Genre").copy()
-        df["Genre"] = df["Genre"].replace("", "Unknown")
+    def save_data(self, dataset: MovieDataset, staged_csv: Optional[Path] = None) -> None:
+        """
+        Persists the processed dataset to CSV and the configured columnar format.
 
-        # Sorting
-        df = df.sort_values(by=["Release_Date", "Title"]).reset_index(drop=True)
-        
-        logger.info(f"Data cleaning complete. Final record count (exploded): {len(df)}")
-        return df
+        The tables are written to a scratch directory next to the output
+        and renamed into place, together with any companions already staged
+        there, so readers never see a partly written file or a mismatched
+        pair; the manifest describing them is published last.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset to save.
+            staged_csv (Optional[Path]): Staged CSV location from ``_staging``.
+                                         Defaults to a fresh scratch directory.
+        """
+        if staged_csv is None:
+            with self._staging() as staged_csv:
+                self.save_data(dataset, staged_csv)
+            return
+        logger.info(f"Saving cleaned data to {self.output_path}")
+        write_dataset(dataset, staged_csv, self.data_format)
+        rows = {"movies": len(dataset.movies), "genres": len(dataset.genres)}
+        self._publish(staged_csv, rows, dataset.schema())
 
-    def save_data(self, df: pd.DataFrame) -> None:
+    def save_aggregates(self, dataset: MovieDataset, csv_path: Optional[Path] = None) -> None:
         """
-        Persists the processed DataFrame to a CSV file.
+        Materializes the dataset-level aggregates served by the API.
 
         Args:
-            df (pd.DataFrame): The cleaned DataFrame to save.
+            dataset (MovieDataset): The cleaned dataset the aggregates describe.
+            csv_path (Optional[Path]): CSV the artifact sits next to, e.g. a
+                                       staged one. Defaults to the output path.
         """
-        logger.info(f"Saving cleaned data to {self.output_path}")
+        write_aggregates(dataset, aggregates_path(csv_path or self.output_path))
+
+    def save_sketches(
+        self, dataset: MovieDataset, sketches: Optional[MovieSketches] = None, csv_path: Optional[Path] = None
+    ) -> None:
+        """
+        Persists the sketches behind the approximate analytics mode.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset the sketches describe.
+            sketches (Optional[MovieSketches]): Already built (e.g. merged
+                shard) sketches. Defaults to sketching ``dataset``.
+            csv_path (Optional[Path]): CSV the artifact sits next to, e.g. a
+                                       staged one. Defaults to the output path.
+        """
+        if sketches is None:
+            sketches = MovieSketches.from_dataset(dataset)
+        sketches.save(sketches_path(csv_path or self.output_path), dataset_fingerprint(dataset))
+
+    def save_search_index(self, dataset: MovieDataset, csv_path: Optional[Path] = None) -> None:
+        """
+        Builds and persists the title search index so API workers can load it.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset to index.
+            csv_path (Optional[Path]): CSV the artifact sits next to, e.g. a
+                                       staged one. Defaults to the output path.
+        """
+        TitleSearchIndex.build(dataset.movies).save(search_index_path(csv_path or self.output_path))
+
+    def _save_outputs(self, dataset: MovieDataset, sketches: Optional[MovieSketches] = None) -> None:
+        """
+        Writes every artifact of a full run, each as its own profiled stage.
+
+        All artifacts are staged first and published together by
+        ``save_data``, so the live companions always match the live tables.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset.
+            sketches (Optional[MovieSketches]): Already built sketches, if any.
+        """
+        rows = len(dataset.movies)
+        with self._staging() as staged_csv:
+            with self.profiler.stage("aggregates", rows_in=rows):
+                self.save_aggregates(dataset, staged_csv)
+            with self.profiler.stage("sketches", rows_in=rows):
+                self.save_sketches(dataset, sketches, staged_csv)
+            with self.profiler.stage("search_index", rows_in=rows):
+                self.save_search_index(dataset, staged_csv)
+            with self.profiler.stage("save", rows_in=rows) as stage:
+                self.save_data(dataset, staged_csv)
+                stage.rows_out = rows
+
+    def _plan_chunks(self, memory_bytes: int) -> int:
+        """
+        Sizes raw chunks so a chunk's working set fits the memory budget.
+
+        Args:
+            memory_bytes (int): Peak memory budget in bytes.
+
+        Returns:
+            int: Rows per chunk (at least 1,000).
+        """
+        sample = next(self.iter_raw_chunks(2000), None)
+        if sample is None or sample.empty:
+            return 1000
+        row_bytes = max(1, int(sample.memory_usage(deep=True).sum() / len(sample)))
+        return max(1000, memory_bytes // (row_bytes * _CHUNK_OVERHEAD))
+
+    def _write_sorted_runs(
+        self, work_dir: Path, chunk_rows: int, block_rows: int, engine: str
+    ) -> Tuple[List[RunFile], MovieSketches]:
+        """
+        Cleans the raw file chunk by chunk and spills each chunk as a sorted run.
+
+        Returns:
+            Tuple[List[RunFile], MovieSketches]: Runs in source order and the
+            merged sketches of all chunks.
+        """
+        runs = []
+        sketches = MovieSketches()
+        rows_in = 0
+        rows_out = 0
+        try:
+            chunks = self.profiler.iterate("load", self.iter_raw_chunks(chunk_rows, engine=engine))
+            for index, chunk in enumerate(chunks):
+                rows_in += len(chunk)
+                cleaned = self.clean_rows(chunk)
+                with self.profiler.stage("sort", rows_in=len(cleaned)) as stage:
+                    cleaned = cleaned.sort_values(by=SORT_KEYS)
+                    stage.rows_out = len(cleaned)
+                rows_out += len(cleaned)
+                with self.profiler.stage("sketches", rows_in=len(cleaned)):
+                    sketches.merge(MovieSketches.from_rows(cleaned))
+                with self.profiler.stage("spill_runs", rows_in=len(cleaned)):
+                    run = RunFile(work_dir / f"run-{index:06d}.run", block_rows)
+                    runs.append(run)
+                    run.append(cleaned)
+                    run.close()
+        except Exception:
+            for run in runs:
+                run.unlink()
+            raise
+        logger.info(f"Wrote {len(runs)} sorted runs ({rows_in} rows read, {rows_in - rows_out} dropped for invalid dates)")
+        return runs, sketches
+
+    def _publish(self, staged_csv: Path, rows: Dict[str, int], schema: Dict[str, Dict[str, str]]) -> None:
+        """
+        Moves staged artifacts over the live ones and writes the manifest.
+
+        Every mode stages all artifacts next to ``staged_csv``. The
+        companions (aggregates, sketches, search index) go first, then the
+        tables with each movies table after its bridge, and the manifest
+        last, so an API that sees a new manifest always finds the matching
+        data and companions.
+
+        Args:
+            staged_csv (Path): Staged movies CSV; its companions sit next to it.
+            rows (Dict[str, int]): Row count per table, for the manifest.
+            schema (Dict[str, Dict[str, str]]): Column dtypes, for the manifest.
+        """
+        manifest = build_manifest([staged_csv, genres_path(staged_csv)], rows, schema, self.data_format)
+        moves = [
+            (aggregates_path(staged_csv), aggregates_path(self.output_path)),
+            (sketches_path(staged_csv), sketches_path(self.output_path)),
+            (search_index_path(staged_csv), search_index_path(self.output_path)),
+        ]
+        staged_tables = [staged_csv]
+        if self.data_format != "csv":
+            staged_tables.append(artifact_path(staged_csv, self.data_format))
+        for staged in staged_tables:
+            final = self.output_path.with_suffix(staged.suffix)
+            moves.append((genres_path(staged), genres_path(final)))
+        for staged in staged_tables:
+            moves.append((staged, self.output_path.with_suffix(staged.suffix)))
+        for source, target in moves:
+            if source.exists():
+                os.replace(source, target)
+        write_manifest(manifest, manifest_path(self.output_path))
+        logger.info(f"Published dataset version {manifest['version']}")
+
+    def run_streaming(self, memory_mb: Optional[int] = None) -> None:
+        """
+        Runs the pipeline with bounded memory for raw files larger than RAM.
+
+        Reads the raw CSV in chunks (C engine, falling back to the Python
+        engine if the quoting defeats it), cleans each chunk independently,
+        spills sorted runs to disk and merges them with an external k-way
+        merge into the final (Release_Date, Title) order. The output is the
+        same as ``run``; only peak memory differs.
+
+        Args:
+            memory_mb (Optional[int]): Peak memory budget in MB.
+                                       Defaults to settings.PREPROCESS_MEMORY_MB.
+        """
+        memory_bytes = (memory_mb or settings.PREPROCESS_MEMORY_MB) * 1024 * 1024
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(self.output_path, index=False)
+        try:
+            chunk_rows = self._plan_chunks(memory_bytes)
+            # Merge buffers hold one block per run plus the merged batch.
+            block_rows = max(100, chunk_rows // 8)
+            fan_in = max(2, (chunk_rows * _CHUNK_OVERHEAD) // (2 * block_rows))
+            logger.info(f"Streaming preprocessing: {chunk_rows} rows per chunk, fan-in {fan_in}")
+
+            with tempfile.TemporaryDirectory(prefix=".preprocess-", dir=self.output_path.parent) as tmp:
+                work_dir = Path(tmp)
+                try:
+                    runs, sketches = self._write_sorted_runs(work_dir, chunk_rows, block_rows, engine="c")
+                except pd.errors.ParserError as e:
+                    logger.warning(f"C parser failed ({e}); retrying with the Python engine")
+                    # Start the report over so the failed attempt is not counted twice
+                    self.profiler = PipelineProfiler()
+                    runs, sketches = self._write_sorted_runs(work_dir, chunk_rows, block_rows, engine="python")
+
+                staged_csv = work_dir / self.output_path.name
+                # The search index is fed batch by batch, holding only token ids
+                search = TitleIndexBuilder()
+                popularity = []
+                with self.profiler.stage("merge_save") as stage:
+                    writer = DatasetWriter(staged_csv, self.data_format, work_dir / "columnar.spool")
+                    for batch in external_sort(runs, fan_in, work_dir, block_rows):
+                        merged = self.to_dataset(batch, first_id=writer.movie_rows)
+                        search.add_titles(merged.movies["Movie_Id"].to_numpy(), merged.movies)
+                        popularity.append(merged.movies["Popularity"].to_numpy(dtype="float64"))
+                        writer.write(merged)
+                    writer.close()
+                    stage.rows_out = writer.movie_rows
+                logger.info(f"Merged {writer.movie_rows} movies")
+
+                staged_format = writer.data_format
+                staged_source = staged_csv if staged_format == "csv" else artifact_path(staged_csv, staged_format)
+                with self.profiler.stage("aggregates") as stage:
+                    staged = read_dataset(staged_source, staged_format, columns=AGGREGATE_COLUMNS)
+                    stage.rows_in = len(staged.movies)
+                    write_aggregates(staged, aggregates_path(staged_csv))
+                with self.profiler.stage("sketches"):
+                    sketches.save(sketches_path(staged_csv), dataset_fingerprint(staged))
+                with self.profiler.stage("search_index", rows_in=writer.movie_rows):
+                    search.build(np.concatenate(popularity or [np.empty(0)])).save(search_index_path(staged_csv))
+                with self.profiler.stage("publish"):
+                    self._publish(staged_csv, {"movies": writer.movie_rows, "genres": writer.genre_rows}, writer.schema)
+            logger.info("Streaming pipeline executed successfully.")
+        except Exception as e:
+            logger.error(f"Pipeline failed: {str(e)}")
+            raise
+
+    def run_parallel(self, workers: int) -> None:
+        """
+        Runs the pipeline with row cleaning spread over a process pool.
+
+        The raw file is split into one byte-range shard per worker on record
+        boundaries. Workers parse, clean and sketch their shards
+        independently; the parent concatenates the results in shard order
+        and applies the same stable sort as ``run``, so the output is
+        byte-identical to it, and merges the shard sketches.
+
+        Args:
+            workers (int): Number of worker processes.
+
+        Raises:
+            FileNotFoundError: If no file exists at the specified raw_path.
+        """
+        try:
+            if not self.raw_path.exists():
+                logger.error(f"Raw data file not found at {self.raw_path}")
+                raise FileNotFoundError(f"Raw data file not found at {self.raw_path}")
+
+            with self.profiler.stage("find_boundaries"):
+                header, offsets = find_record_boundaries(self.raw_path, workers)
+            starts, ends = offsets[:-1], offsets[1:]
+            logger.info(f"Cleaning {len(starts)} shards of {self.raw_path} with {workers} workers")
+            with self.profiler.stage("clean_shards") as stage:
+                with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+                    results = list(pool.map(self.clean_shard, repeat(header), starts, ends))
+                stage.rows_in = sum(rows for _, rows, _, _ in results)
+                stage.rows_out = sum(len(frame) for frame, _, _, _ in results)
+            for _, _, _, shard_profile in results:
+                self.profiler.merge(shard_profile)
+
+            initial_count = sum(rows for _, rows, _, _ in results)
+            with self.profiler.stage("concat", rows_in=initial_count) as stage:
+                df = _concat_cleaned([frame for frame, _, _, _ in results])
+                stage.rows_out = len(df)
+            logger.info(f"Dropped {initial_count - len(df)} rows with invalid dates")
+            with self.profiler.stage("sort", rows_in=len(df)) as stage:
+                df = df.sort_values(by=SORT_KEYS)
+                stage.rows_out = len(df)
+            with self.profiler.stage("build_bridge", rows_in=len(df)) as stage:
+                dataset = self.to_dataset(df)
+                stage.rows_out = len(dataset.genres)
+            logger.info(f"Data cleaning complete. Final record count: {len(dataset.movies)} movies, {len(dataset.genres)} genre links")
+
+            sketches = MovieSketches()
+            for _, _, shard_sketches, _ in results:
+                sketches.merge(shard_sketches)
+
+            self._save_outputs(dataset, sketches)
+            logger.info("Parallel pipeline executed successfully.")
+        except Exception as e:
+            logger.error(f"Pipeline failed: {str(e)}")
+            raise
+
+    def read_delta(self, delta_path: Path) -> pd.DataFrame:
+        """
+        Loads a delta file of new or updated movies in the raw CSV layout.
+
+        Args:
+            delta_path (Path): The delta CSV.
+
+        Returns:
+            pd.DataFrame: The raw delta rows.
+
+        Raises:
+            FileNotFoundError: If no file exists at ``delta_path``.
+        """
+        if not delta_path.exists():
+            logger.error(f"Delta file not found at {delta_path}")
+            raise FileNotFoundError(f"Delta file not found at {delta_path}")
+        logger.info(f"Loading delta from {delta_path}")
+        try:
+            return pd.read_csv(delta_path, **self._read_options("c"))
+        except pd.errors.ParserError:
+            return pd.read_csv(delta_path, **self._read_options("python"))
+
+    @staticmethod
+    def merge_delta(current: MovieDataset, delta: pd.DataFrame) -> Tuple[MovieDataset, np.ndarray, np.ndarray]:
+        """
+        Merges cleaned delta rows into an existing dataset.
+
+        A delta row replaces every existing movie with the same
+        (Release_Date, Title) key; other delta rows are inserted. Surviving
+        movies and their genre links are carried over as arrays and only
+        renumbered, so no existing row is parsed or cleaned again.
+
+        Args:
+            current (MovieDataset): The cleaned store before the change.
+            delta (pd.DataFrame): Cleaned delta rows with list-valued 'Genre',
+                                  at most one row per key.
+
+        Returns:
+            Tuple[MovieDataset, np.ndarray, np.ndarray]: The merged dataset,
+            the ids of replaced movies in ``current`` and the ids of the
+            delta movies in the merged dataset.
+        """
+        movies = current.movies
+        replaced = pd.MultiIndex.from_frame(movies[SORT_KEYS]).isin(pd.MultiIndex.from_frame(delta[SORT_KEYS]))
+        kept = movies[~replaced]
+        combined = _concat_cleaned([kept.drop(columns=["Movie_Id"]), delta.drop(columns=["Genre"])])
+
+        # Kept rows precede delta rows, and no key is shared between them,
+        # so a stable sort reproduces the order of a full re-ingest.
+        order = combined.sort_values(by=SORT_KEYS, kind="stable").index.to_numpy()
+        new_ids = np.empty(len(combined), dtype="int32")
+        new_ids[order] = np.arange(len(combined), dtype="int32")
+        merged = combined.iloc[order].reset_index(drop=True)
+        merged.insert(0, "Movie_Id", np.arange(len(merged), dtype="int32"))
+
+        remap = np.full(len(movies), -1, dtype="int32")
+        remap[kept["Movie_Id"].to_numpy()] = new_ids[:len(kept)]
+        old_links = remap[current.genre_movie_ids()]
+        carried = old_links >= 0
+        delta_ids = new_ids[len(kept):]
+        added = MovieDataset.build_bridge(delta_ids, delta["Genre"])
+        genres = pd.DataFrame({
+            "Movie_Id": np.concatenate([old_links[carried], added["Movie_Id"].to_numpy()]),
+            "Genre": np.concatenate([
+                current.genres["Genre"].to_numpy(dtype=object)[carried],
+                added["Genre"].to_numpy(dtype=object),
+            ]),
+        })
+        genres = genres.iloc[np.argsort(genres["Movie_Id"].to_numpy(), kind="stable")].reset_index(drop=True)
+        genres["Genre"] = genres["Genre"].astype("category")
+
+        replaced_ids = movies["Movie_Id"].to_numpy()[replaced]
+        return MovieDataset(movies=merged, genres=genres), replaced_ids, delta_ids
+
+    def ingest_delta(self, delta_path: Path) -> None:
+        """
+        Applies a delta file to the existing cleaned store.
+
+        Only the delta rows are parsed and cleaned. They are merged into the
+        stored dataset by (Release_Date, Title), and only the aggregate
+        groups (years, genres, languages) touched by replaced or new movies
+        are recomputed; the delta's sketches are merged into the stored
+        ones. The search index keeps the tokens of unchanged movies and
+        tokenizes only the delta titles. Other indexes are rebuilt by the
+        API when it reloads the updated files.
+
+        Args:
+            delta_path (Path): CSV of new or updated movies in the raw layout.
+
+        Raises:
+            FileNotFoundError: If the delta file or the cleaned store is missing.
+        """
+        try:
+            source, source_format = resolve_source(self.output_path, self.data_format)
+            if not source.exists():
+                logger.error(f"No cleaned dataset at {source}; run a full preprocessing first")
+                raise FileNotFoundError(f"No cleaned dataset at {source}; run a full preprocessing first")
+
+            with self.profiler.stage("load") as stage:
+                raw_delta = self.read_delta(delta_path)
+                stage.rows_out = len(raw_delta)
+            delta = self.clean_rows(raw_delta)
+            # The latest version of a movie in the delta wins.
+            with self.profiler.stage("sort", rows_in=len(delta)) as stage:
+                delta = delta.drop_duplicates(subset=SORT_KEYS, keep="last").sort_values(by=SORT_KEYS)
+                stage.rows_out = len(delta)
+            logger.info(f"Cleaned {len(delta)} delta rows ({len(raw_delta) - len(delta)} dropped or superseded)")
+
+            with self.profiler.stage("load_current") as stage:
+                current = read_dataset(source, source_format)
+                stage.rows_out = len(current.movies)
+            with self.profiler.stage("merge_delta", rows_in=len(current.movies) + len(delta)) as stage:
+                dataset, replaced_ids, delta_ids = self.merge_delta(current, delta)
+                stage.rows_out = len(dataset.movies)
+            logger.info(f"Merged delta: {len(replaced_ids)} movies replaced, {len(delta_ids)} written, {len(dataset.movies)} movies in total")
+
+            rows = len(dataset.movies)
+            # Refreshed from the live companions, published with the tables
+            with self._staging() as staged_csv:
+                with self.profiler.stage("aggregates", rows_in=rows):
+                    touched = changed_keys(current, replaced_ids)
+                    for name, keys in changed_keys(dataset, delta_ids).items():
+                        touched[name] |= keys
+                    refresh_aggregates(aggregates_path(self.output_path), current, dataset, touched,
+                                       target=aggregates_path(staged_csv))
+                with self.profiler.stage("sketches", rows_in=rows):
+                    refresh_sketches(sketches_path(self.output_path), current, dataset, delta, replaced_ids,
+                                     target=sketches_path(staged_csv))
+                with self.profiler.stage("search_index", rows_in=rows):
+                    refresh_search_index(search_index_path(self.output_path), current.movies, dataset.movies,
+                                         replaced_ids, delta_ids, target=search_index_path(staged_csv))
+                with self.profiler.stage("save", rows_in=rows) as stage:
+                    self.save_data(dataset, staged_csv)
+                    stage.rows_out = rows
+            logger.info("Delta ingestion executed successfully.")
+        except Exception as e:
+            logger.error(f"Pipeline failed: {str(e)}")
+            raise
 
     def run(self) -> None:
         """
         Orchestrates the full preprocessing pipeline.
 
-        Reads source -> Cleans -> Writes destination.
+        Reads source -> Cleans -> Materializes aggregates -> Writes destination.
         """
         try:
-            raw_df = self.load_data()
-            cleaned_df = self.clean_data(raw_df)
-            self.save_data(cleaned_df)
+            with self.profiler.stage("load") as stage:
+                raw_df = self.load_data()
+                stage.rows_out = len(raw_df)
+            dataset = self.clean_data(raw_df)
+            self._save_outputs(dataset)
             logger.info("Pipeline executed successfully.")
         except Exception as e:
             logger.error(f"Pipeline failed: {str(e)}")
             raise
 
-if __name__ == "__main__":
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point for the preprocessing pipeline.
+
+    Every run writes a report of per-stage timings, memory, row counts and
+    data-quality counters; with ``--compare`` the stages that regressed
+    against an earlier report are flagged.
+
+    Args:
+        argv (Optional[List[str]]): Arguments, defaults to sys.argv.
+
+    Returns:
+        int: Exit status, 1 if the comparison found a regression.
+    """
+    parser = argparse.ArgumentParser(description="Clean the raw movie dataset for analytics.")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Process the raw file in chunks with bounded memory.")
+    parser.add_argument("--memory-mb", type=int, default=None,
+                        help="Peak memory budget for --streaming (default: PREPROCESS_MEMORY_MB).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Clean the raw file with N processes (0 = one per CPU core).")
+    parser.add_argument("--delta", type=Path, default=None,
+                        help="Merge a CSV of new or updated movies into the existing cleaned data.")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Where to write the run report (default: <cleaned>_report.json).")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Flag stages that regressed against this earlier run report.")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Relative growth that counts as a regression (default: 0.5).")
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    if workers < 0:
+        parser.error("--workers must be zero or positive")
+    if args.streaming and workers > 1:
+        parser.error("--workers cannot be combined with --streaming")
+    if args.delta and (args.streaming or workers > 1):
+        parser.error("--delta cannot be combined with --streaming or --workers")
+
+    # Read before running: the default report path is overwritten by this run
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
     preprocessor = MovieDataPreprocessor(
         raw_path=settings.RAW_DATA_PATH,
         output_path=settings.CLEANED_DATA_PATH
     )
-    preprocessor.run()
\ No newline at end of file
+    if args.delta:
+        mode, raw_path = "delta", args.delta
+        preprocessor.ingest_delta(args.delta)
+    elif args.streaming:
+        mode, raw_path = "streaming", preprocessor.raw_path
+        preprocessor.run_streaming(memory_mb=args.memory_mb)
+    elif workers > 1:
+        mode, raw_path = "parallel", preprocessor.raw_path
+        preprocessor.run_parallel(workers)
+    else:
+        mode, raw_path = "run", preprocessor.raw_path
+        preprocessor.run()
+
+    report = preprocessor.profiler.report(mode, raw_path=str(raw_path), output_path=str(preprocessor.output_path))
+    if baseline is not None:
+        report["baseline"] = str(args.compare)
+        report["regressions"] = compare_reports(report, baseline, args.threshold)
+    destination = args.report or report_path(preprocessor.output_path)
+    write_report(report, destination)
+    print(format_report(report))
+    logger.info(f"Run report written to {destination}")
+
+    for entry in report.get("regressions", []):
+        logger.warning(
+            f"Regression in stage '{entry['stage']}': {entry['metric']} {entry['baseline']} -> "
+            f"{entry['current']} ({entry['change']:+.0%}, rows {entry['rows_change'] or 0:+.0%})"
+        )
+    return 1 if report.get("regressions") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,332 @@
+"""
+Pipeline Profiling
+------------------
+Per-stage instrumentation of the preprocessing pipeline: wall time, CPU
+time, peak memory and rows in and out of every stage, plus data-quality
+counters, collected into a JSON run report that can be compared with
+the report of a previous run to spot the stage that regressed.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - optional dependency (POSIX only)
+    resource = None
+
+REPORT_VERSION = 1
+
+# Metrics compared between runs, with the smallest absolute increase that
+# can count as a regression (so that millisecond stages do not flap).
+COMPARED_METRICS = {
+    "wall_seconds": 0.05,
+    "cpu_seconds": 0.05,
+    "peak_rss_mb": 16.0,
+}
+
+# Seconds between memory samples while a stage runs
+_SAMPLE_INTERVAL = 0.01
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, if the platform exposes it."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process and its finished children so far."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)) * 1024
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus that of its finished children (e.g. pool workers)."""
+    seconds = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        seconds += children.ru_utime + children.ru_stime
+    return seconds
+
+
+class _PeakSampler:
+    """Background thread tracking the highest RSS seen until stopped."""
+
+    def __init__(self):
+        self.peak = _rss_bytes()
+        self._stop = threading.Event()
+        self._thread = None
+        if self.peak is not None:
+            self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+            self._thread.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, _rss_bytes() or 0)
+
+    def stop(self) -> Optional[int]:
+        """Stops sampling and returns the peak in bytes (None if unavailable)."""
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        return max(self.peak, _rss_bytes() or 0)
+
+
+@dataclass
+class StageRun:
+    """
+    Row counts of one execution of a stage, filled in by the caller.
+
+    Attributes:
+        rows_in (Optional[int]): Rows the stage received.
+        rows_out (Optional[int]): Rows the stage produced.
+    """
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+
+
+@dataclass
+class StageProfile:
+    """
+    Accumulated measurements of one pipeline stage.
+
+    A stage that runs several times (once per chunk or shard) is reported
+    once, with its times and rows summed and the highest memory peak.
+    Stages running in worker processes report the sum over the workers.
+
+    Attributes:
+        name (str): Stage name.
+        calls (int): Number of executions.
+        wall_seconds (float): Elapsed time.
+        cpu_seconds (float): CPU time, including finished child processes.
+        peak_rss_mb (Optional[float]): Highest resident set size while the
+            stage ran (None where the platform does not expose it).
+        rows_in (Optional[int]): Rows received.
+        rows_out (Optional[int]): Rows produced.
+    """
+    name: str
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+
+    def add(self, other: "StageProfile") -> None:
+        """Folds another measurement of the same stage into this one."""
+        self.calls += other.calls
+        self.wall_seconds += other.wall_seconds
+        self.cpu_seconds += other.cpu_seconds
+        if other.peak_rss_mb is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, other.peak_rss_mb)
+        if other.rows_in is not None:
+            self.rows_in = (self.rows_in or 0) + other.rows_in
+        if other.rows_out is not None:
+            self.rows_out = (self.rows_out or 0) + other.rows_out
+
+
+class PipelineProfiler:
+    """
+    Collects stage measurements and data-quality counters of one run.
+
+    Stages are timed with ``with profiler.stage(name) as run:``; the
+    caller sets ``run.rows_out`` (and ``rows_in`` if not passed). Stages
+    may nest, e.g. the cleaning steps inside a chunk loop. Profilers are
+    picklable between stages, so worker processes can profile their part
+    and send it back to be merged.
+
+    Attributes:
+        stages (Dict[str, StageProfile]): Stages by name, in first-run order.
+        quality (Dict[str, int]): Data-quality counters.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageProfile] = {}
+        self.quality: Dict[str, int] = {}
+        self._started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._started_cpu = _cpu_seconds()
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageRun]:
+        """
+        Measures one execution of a stage.
+
+        Args:
+            name (str): Stage name; repeated executions accumulate.
+            rows_in (Optional[int]): Rows the stage receives.
+
+        Yields:
+            StageRun: Row counts to fill in.
+        """
+        run = StageRun(rows_in=rows_in)
+        sampler = _PeakSampler()
+        started, started_cpu = time.perf_counter(), _cpu_seconds()
+        try:
+            yield run
+        finally:
+            peak = sampler.stop()
+            self.stages.setdefault(name, StageProfile(name)).add(StageProfile(
+                name=name,
+                calls=1,
+                wall_seconds=time.perf_counter() - started,
+                cpu_seconds=_cpu_seconds() - started_cpu,
+                peak_rss_mb=None if peak is None else peak / 2**20,
+                rows_in=run.rows_in,
+                rows_out=run.rows_out,
+            ))
+
+    def iterate(self, name: str, items: Iterable) -> Iterator:
+        """
+        Yields from ``items``, timing each ``next`` call as a stage.
+
+        Used for readers that produce data lazily, e.g. chunked CSV reads;
+        ``rows_out`` counts the ``len`` of the items produced.
+        """
+        iterator = iter(items)
+        while True:
+            with self.stage(name) as run:
+                item = next(iterator, StopIteration)
+                run.rows_out = 0 if item is StopIteration else len(item)
+            if item is StopIteration:
+                return
+            yield item
+
+    def count(self, name: str, value: int) -> None:
+        """Adds to a data-quality counter."""
+        self.quality[name] = self.quality.get(name, 0) + int(value)
+
+    def merge(self, other: "PipelineProfiler") -> None:
+        """
+        Folds the stages and counters of another profiler (e.g. a worker's) into this one.
+
+        Args:
+            other (PipelineProfiler): Profiler of another part of the run.
+        """
+        for name, profile in other.stages.items():
+            self.stages.setdefault(name, StageProfile(name)).add(profile)
+        for name, value in other.quality.items():
+            self.count(name, value)
+
+    def report(self, mode: str, **context) -> dict:
+        """
+        Builds the JSON run report.
+
+        Args:
+            mode (str): Pipeline entry point ("run", "streaming", "parallel", "delta").
+            **context: Extra top-level fields, e.g. input and output paths.
+
+        Returns:
+            dict: Run totals, stages in execution order and data-quality counters.
+        """
+        peak = _max_rss_bytes()
+        stages = []
+        for profile in self.stages.values():
+            entry = asdict(profile)
+            entry["wall_seconds"] = round(profile.wall_seconds, 4)
+            entry["cpu_seconds"] = round(profile.cpu_seconds, 4)
+            if profile.peak_rss_mb is not None:
+                entry["peak_rss_mb"] = round(profile.peak_rss_mb, 1)
+            stages.append(entry)
+        return {
+            "report_version": REPORT_VERSION,
+            "mode": mode,
+            "started_at": self._started_at.isoformat(),
+            **context,
+            "total": {
+                "wall_seconds": round(time.perf_counter() - self._started, 4),
+                "cpu_seconds": round(_cpu_seconds() - self._started_cpu, 4),
+                "peak_rss_mb": None if peak is None else round(peak / 2**20, 1),
+            },
+            "stages": stages,
+            "data_quality": dict(self.quality),
+        }
+
+
+def write_report(report: dict, path: Path) -> None:
+    """
+    Saves a run report as indented JSON.
+
+    Args:
+        report (dict): Output of ``PipelineProfiler.report``.
+        path (Path): Destination file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+
+def compare_reports(report: dict, baseline: dict, threshold: float) -> List[dict]:
+    """
+    Finds the stages (and totals) that got slower or hungrier than in a baseline run.
+
+    A metric regresses when it grew by more than ``threshold`` relative to
+    the baseline and by more than its floor in COMPARED_METRICS. The change
+    in rows received is included so that growth explained by more input
+    can be told apart from a stage becoming slower per row.
+
+    Args:
+        report (dict): The current run report.
+        baseline (dict): The report of a previous run.
+        threshold (float): Relative growth that counts as a regression (0.5 = 50%).
+
+    Returns:
+        List[dict]: One entry per regressed metric: stage, metric, baseline
+        and current values, relative change and relative change in rows.
+    """
+    previous = {entry["name"]: entry for entry in baseline.get("stages", [])}
+    previous["total"] = {"name": "total", **baseline.get("total", {})}
+    current = [{"name": "total", **report["total"]}] + report["stages"]
+    regressions = []
+    for entry in current:
+        before = previous.get(entry["name"])
+        if before is None:
+            continue
+        rows_change = None
+        if entry.get("rows_in") and before.get("rows_in"):
+            rows_change = round(entry["rows_in"] / before["rows_in"] - 1, 4)
+        for metric, floor in COMPARED_METRICS.items():
+            old, new = before.get(metric), entry.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            if new - old > floor and new / old - 1 > threshold:
+                regressions.append({
+                    "stage": entry["name"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": round(new / old - 1, 4),
+                    "rows_change": rows_change,
+                })
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    """Renders a run report's stages as a fixed-width table, flagging regressions."""
+    flagged = {(entry["stage"], entry["metric"]) for entry in report.get("regressions", [])}
+    lines = [f"{'stage':<20}  {'calls':>6}  {'wall s':>9}  {'cpu s':>9}  {'peak MB':>9}  {'rows in':>10}  {'rows out':>10}"]
+    for entry in [{"name": "total", "calls": 1, **report["total"]}] + report["stages"]:
+        peak = "-" if entry.get("peak_rss_mb") is None else f"{entry['peak_rss_mb']:.1f}"
+        rows_in = "-" if entry.get("rows_in") is None else f"{entry['rows_in']:,}"
+        rows_out = "-" if entry.get("rows_out") is None else f"{entry['rows_out']:,}"
+        flags = [metric for stage, metric in flagged if stage == entry["name"]]
+        flag = f"  REGRESSION ({', '.join(sorted(flags))})" if flags else ""
+        lines.append(
+            f"{entry['name']:<20}  {entry['calls']:>6}  {entry['wall_seconds']:>9.3f}  {entry['cpu_seconds']:>9.3f}  "
+            f"{peak:>9}  {rows_in:>10}  {rows_out:>10}{flag}"
+        )
+    return "\n".join(lines)
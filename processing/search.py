@@ -0,0 +1,455 @@
+"""
+Title Search Index
+------------------
+Token inverted index over movie titles with prefix (typeahead) lookups
+ranked by popularity. Built at preprocessing time and persisted next to
+the cleaned data, so API workers load it instead of rebuilding it.
+"""
+import json
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_VERSION = 2
+
+# Prefixes up to this length have their top matches precomputed, since
+# they cover too many titles to rank on each keystroke.
+PREFIX_CACHE_LENGTH = 3
+PREFIX_CACHE_SIZE = 50
+
+_TOKEN = re.compile(r"\w+")
+_COMBINING_MARKS = "[\u0300-\u036f]"
+# Candidates checked in the first verification batch, per requested result
+_BATCH_FACTOR = 4
+# Sorts after every string that starts with a given prefix
+_PREFIX_END = "\U0010ffff"
+_HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def normalize(text: str) -> str:
+    """Case-folds text and strips accents so 'Amélie' matches 'amelie'."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return re.sub(_COMBINING_MARKS, "", decomposed).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into normalized word tokens."""
+    return _TOKEN.findall(normalize(text))
+
+
+def _title_hash(movies: pd.DataFrame) -> int:
+    """
+    Sum of per-movie hashes of title and popularity, modulo 2**64.
+
+    Being a sum, the hash of a catalog can be assembled from the hashes
+    of its parts, and a part can be subtracted again.
+    """
+    # Hashed as float64 so a compacted (float32) column hashes the same
+    columns = movies[["Title", "Popularity"]].astype({"Popularity": "float64"})
+    hashed = pd.util.hash_pandas_object(columns, index=False)
+    return int(hashed.sum()) & _HASH_MASK
+
+
+def title_fingerprint(movies: pd.DataFrame) -> str:
+    """
+    Summary of the columns the index depends on, used to reject stale files.
+
+    Returns:
+        str: Row count plus a hash of titles and popularity.
+    """
+    return f"{len(movies)}-{_title_hash(movies):x}"
+
+
+class TitleSearchIndex:
+    """
+    Inverted index from title tokens to movies, ordered by popularity.
+
+    Movies are relabeled by popularity rank (0 = most popular). The
+    vocabulary is sorted, and each token's postings are stored as a
+    rank-sorted slice of one flat array, laid out in vocabulary order.
+    Consequences:
+
+    - the tokens sharing a prefix form one contiguous vocabulary range,
+      whose postings are one contiguous slice of the flat array;
+    - the best matches are simply the smallest ranks.
+
+    Multi-word queries walk the shortest posting list in rank order and
+    verify candidates in batches against a forward index (rank -> token
+    ids), stopping as soon as ``limit`` matches are found. Short prefixes
+    match too many titles to rank per keystroke, so their top
+    ``PREFIX_CACHE_SIZE`` ranks are precomputed.
+    """
+
+    def __init__(
+        self,
+        vocabulary: List[str],
+        offsets: np.ndarray,
+        postings: np.ndarray,
+        forward_offsets: np.ndarray,
+        forward_tokens: np.ndarray,
+        rank_to_id: np.ndarray,
+        prefix_tops: Dict[str, np.ndarray],
+        fingerprint: str,
+    ):
+        """
+        Wraps prebuilt index arrays; use ``build`` or ``load`` instead.
+        """
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.postings = postings
+        self.forward_offsets = forward_offsets
+        self.forward_tokens = forward_tokens
+        self.rank_to_id = rank_to_id
+        self.prefix_tops = prefix_tops
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, movies: pd.DataFrame) -> "TitleSearchIndex":
+        """
+        Builds the index from the movies table.
+
+        Args:
+            movies (pd.DataFrame): Movies with 'Title' and 'Popularity';
+                                   row positions are the movie ids.
+
+        Returns:
+            TitleSearchIndex: The built index.
+        """
+        builder = TitleIndexBuilder()
+        builder.add_titles(np.arange(len(movies), dtype="int64"), movies)
+        return builder.build(movies["Popularity"].to_numpy(dtype="float64"))
+
+    @classmethod
+    def _assemble(
+        cls, vocabulary: List[str], token_ids: np.ndarray, ranks: np.ndarray, rank_to_id: np.ndarray, fingerprint: str
+    ) -> "TitleSearchIndex":
+        """
+        Lays out the index arrays from (token, rank) pairs.
+
+        Args:
+            vocabulary (List[str]): Sorted tokens.
+            token_ids (np.ndarray): Vocabulary position of each pair.
+            ranks (np.ndarray): Popularity rank of each pair's movie.
+            rank_to_id (np.ndarray): Movie id of each rank.
+            fingerprint (str): See ``title_fingerprint``.
+
+        Returns:
+            TitleSearchIndex: The built index.
+        """
+        # One posting per (token, movie), grouped by token and ordered by rank
+        pairs = np.unique(token_ids.astype("int64") * len(rank_to_id) + ranks)
+        pair_tokens = pairs // max(1, len(rank_to_id))
+        postings = (pairs - pair_tokens * len(rank_to_id)).astype("int32")
+        offsets = np.searchsorted(pair_tokens, np.arange(len(vocabulary) + 1)).astype("int64")
+        by_rank = np.lexsort((pair_tokens, postings))
+        forward_tokens = pair_tokens[by_rank].astype("int32")
+        forward_offsets = np.searchsorted(postings[by_rank], np.arange(len(rank_to_id) + 1)).astype("int64")
+
+        prefix_tops = {}
+        prefixes = sorted({token[:length] for token in vocabulary for length in range(1, PREFIX_CACHE_LENGTH + 1)})
+        for prefix in prefixes:
+            lo, hi = cls._range(vocabulary, prefix)
+            prefix_tops[prefix] = np.unique(postings[offsets[lo]:offsets[hi]])[:PREFIX_CACHE_SIZE]
+
+        logger.info(f"Built title search index: {len(vocabulary)} tokens, {len(postings)} postings")
+        return cls(
+            vocabulary, offsets, postings, forward_offsets, forward_tokens,
+            rank_to_id, prefix_tops, fingerprint,
+        )
+
+    @staticmethod
+    def _range(vocabulary: List[str], prefix: str) -> Tuple[int, int]:
+        """Vocabulary positions ``[lo, hi)`` of the tokens starting with ``prefix``."""
+        return bisect_left(vocabulary, prefix), bisect_left(vocabulary, prefix + _PREFIX_END)
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> np.ndarray:
+        """
+        Finds the most popular movies whose title contains every query token.
+
+        Args:
+            query (str): Free text.
+            limit (int): Maximum number of results.
+            prefix (bool): Treat the last token as a prefix (typeahead).
+                           Defaults to True.
+
+        Returns:
+            np.ndarray: Matching movie ids, most popular first.
+        """
+        tokens = tokenize(query)
+        if not tokens or limit <= 0:
+            return np.empty(0, dtype="int32")
+        complete, partial = (tokens[:-1], tokens[-1]) if prefix else (tokens, None)
+
+        required = []
+        for token in complete:
+            position = self._token_position(token)
+            if position is None:
+                return np.empty(0, dtype="int32")
+            required.append(position)
+
+        lo = hi = None
+        if partial is not None:
+            lo, hi = self._range(self.vocabulary, partial)
+            if lo == hi:
+                return np.empty(0, dtype="int32")
+            if not required:
+                ranks = self.prefix_tops.get(partial) if limit <= PREFIX_CACHE_SIZE else None
+                if ranks is None:
+                    ranks = np.unique(self.postings[self.offsets[lo]:self.offsets[hi]])
+                return self.rank_to_id[ranks[:limit]]
+
+        # Walk the rarest word's postings in rank order, verifying batches.
+        required.sort(key=lambda position: self.offsets[position + 1] - self.offsets[position])
+        driver = self.postings[self.offsets[required[0]]:self.offsets[required[0] + 1]]
+        matches, found, start = [], 0, 0
+        batch = max(limit * _BATCH_FACTOR, 64)
+        while start < len(driver) and found < limit:
+            ranks = driver[start:start + batch]
+            ranks = ranks[self._verify(ranks, required[1:], lo, hi)]
+            matches.append(ranks)
+            found += len(ranks)
+            start += batch
+            batch *= 2
+        return self.rank_to_id[np.concatenate(matches)[:limit]] if matches else np.empty(0, dtype="int32")
+
+    def _token_position(self, token: str) -> Optional[int]:
+        """Vocabulary position of an exact token, or None if it is unknown."""
+        position = bisect_left(self.vocabulary, token)
+        if position == len(self.vocabulary) or self.vocabulary[position] != token:
+            return None
+        return position
+
+    def _verify(self, ranks: np.ndarray, required: List[int], lo: Optional[int], hi: Optional[int]) -> np.ndarray:
+        """
+        Checks candidate titles against the forward index.
+
+        Returns:
+            np.ndarray: Mask of the candidates that contain every ``required``
+            token and, if ``lo``/``hi`` are given, a token in that range.
+        """
+        starts = self.forward_offsets[ranks]
+        lengths = self.forward_offsets[ranks + 1] - starts
+        owners = np.repeat(np.arange(len(ranks)), lengths)
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        tokens = self.forward_tokens[positions]
+
+        keep = np.ones(len(ranks), dtype=bool)
+        conditions = [tokens == position for position in required]
+        if lo is not None:
+            conditions.append((tokens >= lo) & (tokens < hi))
+        for condition in conditions:
+            present = np.zeros(len(ranks), dtype=bool)
+            present[owners[condition]] = True
+            keep &= present
+        return keep
+
+    def save(self, path: Path) -> None:
+        """
+        Persists the index as an uncompressed ``.npz`` archive.
+
+        Args:
+            path (Path): Destination file.
+        """
+        prefixes = sorted(self.prefix_tops)
+        tops = [self.prefix_tops[prefix] for prefix in prefixes]
+        logger.info(f"Saving title search index to {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                meta=np.array(json.dumps({"version": SEARCH_INDEX_VERSION, "fingerprint": self.fingerprint})),
+                vocabulary=np.array(self.vocabulary, dtype=str),
+                offsets=self.offsets,
+                postings=self.postings,
+                forward_offsets=self.forward_offsets,
+                forward_tokens=self.forward_tokens,
+                rank_to_id=self.rank_to_id,
+                prefixes=np.array(prefixes, dtype=str),
+                prefix_offsets=np.concatenate([[0], np.cumsum([len(top) for top in tops])]).astype("int64"),
+                prefix_ranks=np.concatenate(tops).astype("int32") if tops else np.empty(0, dtype="int32"),
+            )
+
+    @classmethod
+    def load(cls, path: Path, movies: pd.DataFrame) -> Optional["TitleSearchIndex"]:
+        """
+        Loads a persisted index if it matches the given movies table.
+
+        Args:
+            path (Path): Location of the ``.npz`` archive.
+            movies (pd.DataFrame): The movies table currently loaded.
+
+        Returns:
+            Optional[TitleSearchIndex]: The index, or None if the file is
+            missing, unreadable or was built from different data.
+        """
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                meta = json.loads(str(archive["meta"]))
+                if meta.get("version") != SEARCH_INDEX_VERSION:
+                    return None
+                if meta.get("fingerprint") != title_fingerprint(movies):
+                    logger.warning(f"Search index {path} does not match the loaded dataset; rebuilding")
+                    return None
+                prefixes = archive["prefixes"].tolist()
+                prefix_offsets = archive["prefix_offsets"]
+                prefix_ranks = archive["prefix_ranks"]
+                return cls(
+                    vocabulary=archive["vocabulary"].tolist(),
+                    offsets=archive["offsets"],
+                    postings=archive["postings"],
+                    forward_offsets=archive["forward_offsets"],
+                    forward_tokens=archive["forward_tokens"],
+                    rank_to_id=archive["rank_to_id"],
+                    prefix_tops={
+                        prefix: prefix_ranks[prefix_offsets[i]:prefix_offsets[i + 1]]
+                        for i, prefix in enumerate(prefixes)
+                    },
+                    fingerprint=meta["fingerprint"],
+                )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable search index {path}: {e}")
+            return None
+
+
+class TitleIndexBuilder:
+    """
+    Assembles a ``TitleSearchIndex`` from parts of the catalog.
+
+    Only the vocabulary and integer (movie id, token id) pairs are held,
+    so the streaming pipeline can add each merged batch as it is written,
+    and a delta can carry the postings of unchanged movies over from the
+    stored index instead of tokenizing every title again. The result is
+    identical to ``TitleSearchIndex.build`` over the whole catalog.
+    """
+
+    def __init__(self):
+        """
+        Starts an empty index.
+        """
+        self._token_positions: Dict[str, int] = {}
+        self._movie_ids: List[np.ndarray] = [np.empty(0, dtype="int32")]
+        self._token_ids: List[np.ndarray] = [np.empty(0, dtype="int32")]
+        self._rows = 0
+        self._hash = 0
+
+    def _positions(self, tokens: List[str]) -> np.ndarray:
+        """Builder-local ids of tokens, registering new ones."""
+        known = self._token_positions
+        return np.array([known.setdefault(token, len(known)) for token in tokens], dtype="int32")
+
+    def add_titles(self, movie_ids: np.ndarray, movies: pd.DataFrame) -> None:
+        """
+        Tokenizes the titles of some movies.
+
+        Args:
+            movie_ids (np.ndarray): Final id of each row of ``movies``.
+            movies (pd.DataFrame): Movies with 'Title' and 'Popularity'.
+        """
+        tokens = (
+            movies["Title"].fillna("").astype(str)
+            .str.normalize("NFKD")
+            .str.replace(_COMBINING_MARKS, "", regex=True)
+            .str.casefold()
+            .str.findall(_TOKEN.pattern)
+        )
+        lengths = tokens.str.len().to_numpy()
+        flat = np.concatenate(tokens.to_numpy()) if lengths.sum() else np.array([], dtype=object)
+        words, inverse = np.unique(flat.astype(object), return_inverse=True)
+        self._token_ids.append(self._positions(words.tolist())[inverse.reshape(-1)])
+        self._movie_ids.append(np.repeat(np.asarray(movie_ids, dtype="int32"), lengths))
+        self._rows += len(movies)
+        self._hash = (self._hash + _title_hash(movies)) & _HASH_MASK
+
+    def carry_over(self, index: TitleSearchIndex, id_map: np.ndarray, dropped: pd.DataFrame) -> None:
+        """
+        Takes the postings of surviving movies from an existing index.
+
+        Args:
+            index (TitleSearchIndex): Index of the previous catalog.
+            id_map (np.ndarray): New id of each previous movie id, -1 for
+                                 movies that did not survive.
+            dropped (pd.DataFrame): 'Title' and 'Popularity' of the movies
+                                    that did not survive.
+        """
+        counts = np.diff(index.forward_offsets)
+        movie_ids = id_map[index.rank_to_id[np.repeat(np.arange(len(counts)), counts)]]
+        kept = movie_ids >= 0
+        self._token_ids.append(self._positions(index.vocabulary)[index.forward_tokens[kept]])
+        self._movie_ids.append(movie_ids[kept])
+        rows, hashed = index.fingerprint.split("-")
+        self._rows += int(rows) - len(dropped)
+        self._hash = (self._hash + int(hashed, 16) - _title_hash(dropped)) & _HASH_MASK
+
+    def build(self, popularity: np.ndarray) -> TitleSearchIndex:
+        """
+        Ranks the movies and lays out the index.
+
+        Args:
+            popularity (np.ndarray): Popularity of every movie, by id.
+
+        Returns:
+            TitleSearchIndex: The built index.
+        """
+        rank_to_id = np.argsort(-np.asarray(popularity, dtype="float64"), kind="stable").astype("int32")
+        id_to_rank = np.empty_like(rank_to_id)
+        id_to_rank[rank_to_id] = np.arange(len(rank_to_id), dtype="int32")
+
+        # Only tokens that still occur make it into the sorted vocabulary
+        used, token_ids = np.unique(np.concatenate(self._token_ids), return_inverse=True)
+        words = np.array(list(self._token_positions), dtype=object)[used]
+        vocabulary, order = np.unique(words, return_inverse=True)
+        ranks = id_to_rank[np.concatenate(self._movie_ids)]
+        return TitleSearchIndex._assemble(
+            vocabulary.tolist(), order.reshape(-1)[token_ids.reshape(-1)], ranks, rank_to_id,
+            f"{self._rows}-{self._hash:x}",
+        )
+
+
+def refresh_search_index(path: Path, previous: pd.DataFrame, dataset: pd.DataFrame, replaced_ids: np.ndarray,
+                         delta_ids: np.ndarray, target: Optional[Path] = None) -> None:
+    """
+    Updates the persisted search index after a delta was merged.
+
+    Surviving movies keep their tokens, relabeled to their new ids; only
+    the delta titles are tokenized. The result equals building the index
+    over ``dataset`` from scratch. If the stored index is missing or does
+    not describe ``previous``, it is rebuilt instead.
+
+    Args:
+        path (Path): Location of the ``.npz`` archive.
+        previous (pd.DataFrame): Movies the stored index was built from.
+        dataset (pd.DataFrame): Movies of the merged dataset.
+        replaced_ids (np.ndarray): Ids of the replaced movies in ``previous``.
+        delta_ids (np.ndarray): Ids of the delta movies in ``dataset``.
+        target (Optional[Path]): Where to write the result, e.g. a staging
+                                 path. Defaults to ``path``.
+    """
+    target = target or path
+    index = TitleSearchIndex.load(path, previous)
+    if index is None:
+        logger.info("No reusable search index; rebuilding it")
+        TitleSearchIndex.build(dataset).save(target)
+        return
+
+    kept = np.ones(len(previous), dtype=bool)
+    kept[replaced_ids] = False
+    new_ids = np.ones(len(dataset), dtype=bool)
+    new_ids[delta_ids] = False
+    # Surviving movies keep their relative order, see merge_delta
+    id_map = np.full(len(previous), -1, dtype="int32")
+    id_map[kept] = np.flatnonzero(new_ids)
+
+    builder = TitleIndexBuilder()
+    builder.carry_over(index, id_map, previous.iloc[replaced_ids])
+    builder.add_titles(delta_ids, dataset.iloc[delta_ids])
+    builder.build(dataset["Popularity"].to_numpy(dtype="float64")).save(target)
@@ -0,0 +1,336 @@
+"""
+Shared Dataset Store
+--------------------
+Publishes the loaded dataset's columns as memory-mapped files so that
+every API worker process on a host maps the same physical pages instead
+of holding its own copy. Point the store at a tmpfs directory
+(e.g. ``/dev/shm``) to keep it in RAM, or at any local disk to share the
+page cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from processing.dataset import MovieDataset
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - optional dependency (POSIX only)
+    fcntl = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+STORE_VERSION = 1
+_CURRENT = "CURRENT"
+_LOCK = "lock"
+# Arrays smaller than this are pickled inline rather than mapped
+_MIN_SHARED_BYTES = 64 * 1024
+
+
+def _generation_dir(root: Path, generation: int) -> Path:
+    return root / f"gen-{generation:06d}"
+
+
+def release_scratch_memory() -> None:
+    """
+    Returns freed Arrow scratch memory to the OS.
+
+    Index builds over Arrow-backed text leave freed blocks cached in
+    pyarrow's allocator, which would otherwise stay private to each worker.
+    """
+    if pa is not None:
+        pa.default_memory_pool().release_unused()
+
+
+def _code_fingerprint() -> str:
+    """Hash of the processing package sources; shared objects are only reused by the same code."""
+    digest = hashlib.blake2b(digest_size=8)
+    for source in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _dataset_refs(dataset: MovieDataset) -> Dict[int, tuple]:
+    """Persistent ids for the dataset objects that shared state may point at."""
+    refs = {id(dataset.movies): ("dataset", "movies"), id(dataset.genres): ("dataset", "genres")}
+    for column in dataset.movies.columns:
+        values = dataset.movies[column].array
+        if isinstance(values, pd.arrays.ArrowStringArray):
+            refs[id(values)] = ("column", column)
+    return refs
+
+
+class _SharingPickler(pickle.Pickler):
+    """Pickler that stores large arrays as ``.npy`` files beside the pickle."""
+
+    def __init__(self, file, target: Path, name: str, refs: Dict[int, tuple]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._target = target
+        self._name = name
+        self._refs = refs
+        self._arrays = 0
+
+    def persistent_id(self, obj: Any) -> Optional[tuple]:
+        ref = self._refs.get(id(obj))
+        if ref is not None:
+            return ref
+        if isinstance(obj, np.ndarray) and not obj.dtype.hasobject and obj.nbytes >= _MIN_SHARED_BYTES:
+            file = f"{self._name}.{self._arrays}.npy"
+            self._arrays += 1
+            np.save(self._target / file, obj)
+            return ("array", file)
+        return None
+
+
+class _SharingUnpickler(pickle.Unpickler):
+    """Counterpart of ``_SharingPickler``; maps the arrays instead of reading them."""
+
+    def __init__(self, file, source: Path, dataset: MovieDataset):
+        super().__init__(file)
+        self._source = source
+        self._dataset = dataset
+
+    def persistent_load(self, pid: tuple) -> Any:
+        kind, value = pid
+        if kind == "array":
+            return np.load(self._source / value, mmap_mode="r")
+        if kind == "dataset":
+            return getattr(self._dataset, value)
+        if kind == "column":
+            return self._dataset.movies[value].array
+        raise pickle.UnpicklingError(f"Unknown shared reference {pid!r}")
+
+
+def _arrow_strings(values: pd.Series) -> Optional["pa.Array"]:
+    """Converts a text column to an Arrow string array, or None if it is not one."""
+    if pa is None or pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty"):
+        return None
+    return pa.array(values.to_numpy(dtype=object), type=pa.large_string(), from_pandas=True)
+
+
+class SharedDatasetStore:
+    """
+    Generation-numbered column store shared by the processes of one host.
+
+    Each generation is a directory holding one file per column and a
+    manifest. A ``CURRENT`` pointer names the live generation and
+    the dataset version it was built from, and is replaced atomically.
+
+    The first process to ask for a version that is not published yet
+    builds the generation under an exclusive file lock; every other
+    process waits for the lock and then maps the published files.
+    Numeric, datetime and categorical-code columns are ``.npy`` files
+    mapped read-only and wrapped in pandas without copying. Text columns
+    are Arrow IPC files exposed as ``string[pyarrow]`` columns over the
+    map; without pyarrow they are pickled and loaded into each process.
+
+    Objects derived from the dataset, such as the analytics indexes, can
+    be published into the same generation with ``share``.
+
+    Older generations are unlinked once a new one is published. Their
+    pages stay valid for processes that still have them mapped and are
+    released by the OS when the last one moves on.
+
+    Attributes:
+        root (Path): Directory holding the generations.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root (Path): Directory for the store; created if missing.
+        """
+        self.root = Path(root)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Holds the store-wide exclusive lock for the duration of the block."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / _LOCK, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def current(self) -> Optional[dict]:
+        """
+        Reads the ``CURRENT`` pointer.
+
+        Returns:
+            Optional[dict]: Keys 'generation' and 'key', or None if nothing
+            valid has been published.
+        """
+        try:
+            pointer = json.loads((self.root / _CURRENT).read_text())
+        except (OSError, ValueError):
+            return None
+        if pointer.get("store_version") != STORE_VERSION:
+            return None
+        return pointer
+
+    def open(self, key: str, loader: Callable[[], MovieDataset]) -> MovieDataset:
+        """
+        Returns the dataset for ``key``, backed by the shared generation.
+
+        Args:
+            key (str): Identifies the dataset version (source path, mtime and size).
+            loader (Callable[[], MovieDataset]): Reads the dataset from its
+                source; only called if this process has to publish it.
+
+        Returns:
+            MovieDataset: Dataset whose shareable columns are read-only
+            memory maps of the store.
+        """
+        with self._locked():
+            pointer = self.current()
+            if pointer is None or pointer["key"] != key:
+                generation = (pointer["generation"] + 1) if pointer else 1
+                self._publish(loader(), key, generation)
+                pointer = self.current()
+            dataset = self._attach(_generation_dir(self.root, pointer["generation"]))
+        logger.info(f"Attached shared dataset generation {pointer['generation']} from {self.root}")
+        return dataset
+
+    def share(self, key: str, name: str, dataset: MovieDataset, build: Callable[[], Any]) -> Any:
+        """
+        Returns an object derived from a shared dataset, built once per generation.
+
+        The first caller builds the object and pickles it into the
+        generation, writing its large NumPy arrays as separate ``.npy``
+        files; every caller then unpickles it with those arrays memory-mapped
+        read-only. References to ``dataset`` and its Arrow text columns are
+        stored as references, not copies. Pickles are keyed by a hash of the
+        processing code, so a deploy never unpickles state of older classes.
+
+        Args:
+            key (str): Dataset version ``dataset`` was opened with.
+            name (str): Name of the object within the generation.
+            dataset (MovieDataset): The dataset returned by ``open``.
+            build (Callable[[], Any]): Builds the object from ``dataset``.
+
+        Returns:
+            Any: The shared object, or a private one from ``build`` if a
+            newer generation has replaced ``key`` in the meantime.
+        """
+        with self._locked():
+            pointer = self.current()
+            if pointer is None or pointer["key"] != key:
+                return build()
+            source = _generation_dir(self.root, pointer["generation"])
+            name = f"{name}-{_code_fingerprint()}"
+            path = source / f"{name}.pkl"
+            if not path.exists():
+                staged = source / f"{name}.pkl.tmp"
+                with open(staged, "wb") as f:
+                    _SharingPickler(f, source, name, _dataset_refs(dataset)).dump(build())
+                os.replace(staged, path)
+            try:
+                with open(path, "rb") as f:
+                    return _SharingUnpickler(f, source, dataset).load()
+            except (OSError, ValueError, EOFError, AttributeError, pickle.UnpicklingError) as e:
+                logger.warning(f"Ignoring unreadable shared object {path}: {e}")
+                return build()
+
+    def _publish(self, dataset: MovieDataset, key: str, generation: int) -> None:
+        """Writes a generation, repoints ``CURRENT`` at it and prunes older ones."""
+        target = _generation_dir(self.root, generation)
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir(parents=True)
+        manifest = {
+            "movies": self._write_table(dataset.movies, target, "movies"),
+            "genres": self._write_table(dataset.genres, target, "genres"),
+        }
+        (target / "manifest.json").write_text(json.dumps(manifest))
+
+        pointer = self.root / f"{_CURRENT}.tmp"
+        pointer.write_text(json.dumps({"store_version": STORE_VERSION, "generation": generation, "key": key}))
+        os.replace(pointer, self.root / _CURRENT)
+        for stale in self.root.glob("gen-*"):
+            if stale != target:
+                shutil.rmtree(stale, ignore_errors=True)
+        logger.info(f"Published shared dataset generation {generation} ({len(dataset)} movies) to {self.root}")
+
+    @staticmethod
+    def _write_table(df: pd.DataFrame, target: Path, table: str) -> list:
+        """
+        Saves each column of ``df`` as ``<table>.<i>.npy`` (or ``.arrow``).
+
+        Returns:
+            list: Manifest entries describing how to rebuild each column.
+        """
+        entries = []
+        for i, column in enumerate(df.columns):
+            values = df[column]
+            entry = {"name": column, "file": f"{table}.{i}.npy"}
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                entry.update(kind="category", categories=values.cat.categories.tolist())
+                array = values.cat.codes.to_numpy()
+            elif pd.api.types.is_datetime64_dtype(values.dtype):
+                entry.update(kind="datetime", dtype=str(values.dtype))
+                array = values.to_numpy().view("int64")
+            elif pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+                entry.update(kind="array")
+                array = values.to_numpy()
+            else:
+                strings = _arrow_strings(values)
+                if strings is not None:
+                    entry.update(kind="string", file=f"{table}.{i}.arrow")
+                    with pa.OSFile(str(target / entry["file"]), "wb") as sink:
+                        with pa.ipc.new_file(sink, pa.schema([("values", strings.type)])) as writer:
+                            writer.write_table(pa.table({"values": strings}))
+                    entries.append(entry)
+                    continue
+                entry.update(kind="object")
+                array = values.to_numpy(dtype=object)
+            np.save(target / entry["file"], array, allow_pickle=entry["kind"] == "object")
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _read_table(source: Path, entries: list) -> pd.DataFrame:
+        """Rebuilds one table from its column files, mapping what can be shared."""
+        columns: Dict[str, object] = {}
+        for entry in entries:
+            path = source / entry["file"]
+            if entry["kind"] == "object":
+                # Written by this store, so unpickling it is safe
+                columns[entry["name"]] = np.load(path, allow_pickle=True)
+                continue
+            if entry["kind"] == "string":
+                table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+                columns[entry["name"]] = pd.arrays.ArrowStringArray(table.column("values"))
+                continue
+            array = np.load(path, mmap_mode="r")
+            if entry["kind"] == "category":
+                columns[entry["name"]] = pd.Categorical.from_codes(array, categories=entry["categories"])
+            elif entry["kind"] == "datetime":
+                columns[entry["name"]] = array.view(entry["dtype"])
+            else:
+                columns[entry["name"]] = array
+        # copy=False keeps one block per column, each a view of its map
+        return pd.DataFrame(columns, copy=False)
+
+    def _attach(self, source: Path) -> MovieDataset:
+        """Maps a published generation."""
+        manifest = json.loads((source / "manifest.json").read_text())
+        return MovieDataset(
+            movies=self._read_table(source, manifest["movies"]),
+            genres=self._read_table(source, manifest["genres"]),
+        )
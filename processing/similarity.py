@@ -0,0 +1,164 @@
+"""
+Similar Movies Index
+--------------------
+Nearest-neighbour lookups over a compact per-movie feature vector:
+genre membership, original language, rating and popularity. Built at
+load time; each lookup is one matrix-vector product and a partial sort.
+"""
+import logging
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from processing.dataset import MovieDataset
+
+logger = logging.getLogger(__name__)
+
+# Feature weights. A movie's genre vector has unit length, so two movies
+# with disjoint genres are sqrt(2) apart on genres alone; the other
+# features are scaled to [0, 1] before weighting.
+LANGUAGE_WEIGHT = 0.5
+RATING_WEIGHT = 0.5
+POPULARITY_WEIGHT = 0.5
+
+# Query rows per matrix product when precomputing the neighbour table
+_TABLE_BLOCK = 256
+
+
+def _unit_range(values: np.ndarray) -> np.ndarray:
+    """Min-max scales values to [0, 1]; missing values and constant columns map to 0."""
+    finite = np.isfinite(values)
+    if not finite.any():
+        return np.zeros(len(values))
+    low, high = values[finite].min(), values[finite].max()
+    if high <= low:
+        return np.zeros(len(values))
+    return np.where(finite, (values - low) / (high - low), 0.0)
+
+
+class SimilarityIndex:
+    """
+    Finds the movies closest to a given one in feature space.
+
+    Each movie is a float32 row of a dense matrix: its genres as a
+    multi-hot vector normalized to unit length, then its weighted vote
+    average and log-popularity. Original language is kept as an integer
+    code and contributes a fixed penalty when two languages differ,
+    which equals the distance of a weighted one-hot encoding without
+    widening the matrix.
+
+    Squared distances to every movie come from one matrix-vector product
+    (``|a - b|^2 = |a|^2 - 2 a.b + |b|^2``) and the k nearest from
+    ``argpartition``, so a lookup is O(n * features) vectorized work.
+    With ``table_size`` > 0 the k nearest neighbours of every movie are
+    precomputed in blocks and lookups up to that size become a row read;
+    building the table is O(n^2), so it suits small and medium catalogs.
+
+    Attributes:
+        table_size (int): Neighbours precomputed per movie (0 if none).
+    """
+
+    def __init__(self, dataset: MovieDataset, table_size: int = 0):
+        """
+        Builds the feature matrix and, optionally, the neighbour table.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset.
+            table_size (int): Neighbours to precompute per movie. Defaults to 0.
+        """
+        movies = dataset.movies
+        self._size = len(movies)
+
+        genre_codes = dataset.genres["Genre"].cat.codes.to_numpy()
+        genre_count = len(dataset.genres["Genre"].cat.categories)
+        genres = np.zeros((self._size, genre_count), dtype="float32")
+        genres[dataset.genre_movie_ids(), genre_codes] = 1.0
+        lengths = np.sqrt(genres.sum(axis=1, keepdims=True))
+        np.divide(genres, lengths, out=genres, where=lengths > 0)
+
+        rating = RATING_WEIGHT * _unit_range(movies["Vote_Average"].to_numpy(dtype="float64"))
+        popularity = POPULARITY_WEIGHT * _unit_range(np.log1p(np.clip(movies["Popularity"].to_numpy(dtype="float64"), 0, None)))
+        self._features = np.ascontiguousarray(np.hstack([genres, np.column_stack([rating, popularity]).astype("float32")]))
+        self._norms = np.einsum("ij,ij->i", self._features, self._features)
+        self._languages = pd.factorize(movies["Original_Language"].astype(str))[0].astype("int32")
+
+        self.table_size = min(table_size, max(self._size - 1, 0))
+        self._table: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        if self.table_size > 0:
+            self._table = self._build_table(self.table_size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _distances(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Squared feature distances from each of ``ids`` to every movie.
+
+        Returns:
+            np.ndarray: Array of shape (len(ids), n); a movie's distance to
+            itself is set to infinity so it is never its own neighbour.
+        """
+        distances = self._norms[ids, None] - 2.0 * (self._features[ids] @ self._features.T) + self._norms[None, :]
+        distances += np.float32(LANGUAGE_WEIGHT ** 2) * (self._languages[ids, None] != self._languages[None, :])
+        np.maximum(distances, 0.0, out=distances)
+        distances[np.arange(len(ids)), ids] = np.inf
+        return distances
+
+    def _nearest(self, ids: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the ``limit`` (< n) nearest neighbours of each of ``ids``.
+
+        Candidates are selected with the fast expanded distances, whose
+        float32 cancellation error is only relevant between near-equal
+        neighbours; their exact distances are then recomputed in float64
+        and used for the final order (ties broken by id).
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Neighbour ids and distances, both
+            of shape (len(ids), limit), closest first.
+        """
+        neighbours = np.argpartition(self._distances(ids), limit - 1, axis=1)[:, :limit]
+        offsets = self._features[neighbours].astype("float64") - self._features[ids, None, :]
+        exact = np.einsum("ijk,ijk->ij", offsets, offsets)
+        exact += LANGUAGE_WEIGHT ** 2 * (self._languages[neighbours] != self._languages[ids, None])
+        order = np.lexsort((neighbours, exact), axis=1)
+        return np.take_along_axis(neighbours, order, axis=1), np.sqrt(np.take_along_axis(exact, order, axis=1))
+
+    def _build_table(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Precomputes the ``size`` nearest neighbours of every movie."""
+        start_time = time.perf_counter()
+        neighbours = np.empty((self._size, size), dtype="int32")
+        distances = np.empty((self._size, size), dtype="float64")
+        for start in range(0, self._size, _TABLE_BLOCK):
+            ids = np.arange(start, min(start + _TABLE_BLOCK, self._size))
+            neighbours[ids], distances[ids] = self._nearest(ids, size)
+        logger.info(f"Built {size}-nearest neighbour table for {self._size} movies in {time.perf_counter() - start_time:.1f}s")
+        return neighbours, distances
+
+    def similar(self, movie_id: int, limit: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Finds the movies most similar to ``movie_id``.
+
+        Args:
+            movie_id (int): Id of the reference movie.
+            limit (int): Number of neighbours. Defaults to 10.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Neighbour ids, closest first, and
+            their feature distances.
+
+        Raises:
+            KeyError: If ``movie_id`` is not in the dataset.
+        """
+        if not 0 <= movie_id < self._size:
+            raise KeyError(movie_id)
+        limit = min(limit, self._size - 1)
+        if limit <= 0:
+            return np.empty(0, dtype="int32"), np.empty(0, dtype="float64")
+        if self._table is not None and limit <= self.table_size:
+            neighbours, distances = self._table
+            return neighbours[movie_id, :limit], distances[movie_id, :limit]
+        ids, distances = self._nearest(np.array([movie_id]), limit)
+        return ids[0], distances[0]
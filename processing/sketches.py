@@ -0,0 +1,650 @@
+"""
+Mergeable Sketches
+------------------
+Fixed-size summaries built during preprocessing for the approximate
+analytics mode: HyperLogLog counters of distinct titles per release
+year, language and genre, and a relative-error quantile sketch of vote
+counts for the weighted-rating prior. Sketches of disjoint parts of the
+data (ingest shards, streaming chunks, deltas) merge into exactly the
+sketch of the whole, and every answer comes with an error bound.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from processing.aggregates import dataset_fingerprint
+from processing.dataset import MovieDataset
+from processing.streaming import SORT_KEYS
+
+logger = logging.getLogger(__name__)
+
+SKETCHES_VERSION = 1
+
+# HyperLogLog registers per group are 2**HLL_PRECISION (4 KiB at 12),
+# for a standard error of 1.04 / sqrt(2**HLL_PRECISION), about 1.6%.
+HLL_PRECISION = 12
+
+# Vote counts are bucketed so that every bucket's representative value
+# is within this relative distance of the values it holds.
+QUANTILE_ACCURACY = 0.01
+
+# Groupings of the distinct-title counters
+DIMENSIONS = ("year", "language", "genre")
+
+# Standard errors in the reported HyperLogLog bound (about 95% confidence)
+_HLL_SIGMAS = 2
+_HLL_CONFIDENCE = 0.95
+
+
+def hash_titles(titles) -> np.ndarray:
+    """
+    64-bit hashes of titles, stable across processes and runs.
+
+    Args:
+        titles: Title strings.
+
+    Returns:
+        np.ndarray: uint64 hash of each title.
+    """
+    return pd.util.hash_array(np.asarray(titles, dtype=object))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``int.bit_length`` of uint64 values."""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (np.uint64(1) << np.uint64(shift))
+        values[high] >>= np.uint64(shift)
+        length[high] += shift
+    length += (values > 0).astype(np.uint8)
+    return length
+
+
+def _sigma(x: float) -> float:
+    """Series ``x + sum(x**(2**k) * 2**(k-1))`` of Ertl's estimator (empty registers)."""
+    if x == 1:
+        return np.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    """Series correcting for saturated registers in Ertl's estimator."""
+    if x == 0 or x == 1:
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = np.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class GroupedHyperLogLog:
+    """
+    One HyperLogLog distinct counter per group key.
+
+    The registers of all groups form one ``(groups, 2**precision)``
+    uint8 matrix, with rows in sorted key order. A hash picks a register
+    with its top ``precision`` bits; the register keeps the highest rank
+    (leading zeros + 1) seen among the remaining bits. Registers only
+    ever grow, so merging two counters is their element-wise maximum and
+    the result is identical to counting the union directly.
+
+    Attributes:
+        precision (int): Index bits per hash.
+        keys (np.ndarray): Sorted group keys.
+        registers (np.ndarray): Register matrix, one row per key.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION, keys: Optional[np.ndarray] = None,
+                 registers: Optional[np.ndarray] = None):
+        """
+        Args:
+            precision (int): Index bits per hash. Defaults to HLL_PRECISION.
+            keys (Optional[np.ndarray]): Sorted group keys of ``registers``.
+            registers (Optional[np.ndarray]): Existing register matrix.
+        """
+        self.precision = precision
+        self.keys = np.asarray(keys) if keys is not None else np.empty(0)
+        self.registers = (registers if registers is not None
+                          else np.zeros((len(self.keys), 1 << precision), dtype=np.uint8))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of an estimate, relative to the true count."""
+        return 1.04 / np.sqrt(1 << self.precision)
+
+    def _aligned(self, keys: np.ndarray) -> np.ndarray:
+        """Registers re-laid out for a sorted superset of the current keys."""
+        registers = np.zeros((len(keys), 1 << self.precision), dtype=np.uint8)
+        if len(self.keys):
+            registers[np.searchsorted(keys, self.keys)] = self.registers
+        return registers
+
+    def add(self, keys, hashes: np.ndarray, counted: Optional[np.ndarray] = None) -> None:
+        """
+        Adds hashed items to their groups.
+
+        Args:
+            keys: Group key of each item.
+            hashes (np.ndarray): uint64 hash of each item.
+            counted (Optional[np.ndarray]): Mask of the items to count; the
+                groups of the others are created but stay empty.
+        """
+        new_keys, codes = np.unique(np.asarray(keys), return_inverse=True)
+        if len(self.keys):
+            new_keys = np.union1d(self.keys, new_keys)
+            codes = np.searchsorted(new_keys, np.asarray(keys))
+        self.registers = self._aligned(new_keys)
+        self.keys = new_keys
+        if counted is not None:
+            codes, hashes = codes[counted], hashes[counted]
+        if len(hashes) == 0:
+            return
+        index_bits = np.uint64(self.precision)
+        slots = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << index_bits
+        ranks = np.minimum(64 - _bit_length(rest).astype(np.int64), 64 - self.precision) + 1
+        np.maximum.at(self.registers, (codes.reshape(-1), slots), ranks.astype(np.uint8))
+
+    def merge(self, other: "GroupedHyperLogLog") -> None:
+        """
+        Folds another counter with the same precision into this one.
+
+        Raises:
+            ValueError: If the precisions differ.
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLog precision {other.precision} into {self.precision}")
+        keys = np.union1d(self.keys, other.keys) if len(self.keys) else other.keys
+        registers = self._aligned(keys)
+        rows = np.searchsorted(keys, other.keys)
+        registers[rows] = np.maximum(registers[rows], other.registers)
+        self.keys, self.registers = keys, registers
+
+    def drop(self, keys) -> None:
+        """Removes the given groups, e.g. before recounting them from scratch."""
+        kept = ~np.isin(self.keys, np.asarray(list(keys)))
+        self.keys, self.registers = self.keys[kept], self.registers[kept]
+
+    def estimates(self) -> pd.Series:
+        """
+        Estimated distinct count of every group.
+
+        Uses Ertl's improved estimator over the histogram of register
+        values, which stays unbiased across the switch from small to
+        large cardinalities where the classic raw estimate needs
+        empirical bias correction.
+
+        Returns:
+            pd.Series: Rounded estimates (int64) indexed by group key.
+        """
+        m = 1 << self.precision
+        q = 64 - self.precision
+        rows = np.arange(len(self.keys))[:, None]
+        histograms = np.bincount((rows * (q + 2) + self.registers).ravel(), minlength=len(self.keys) * (q + 2))
+        estimates = []
+        for counts in histograms.reshape(len(self.keys), q + 2):
+            z = m * _tau(1 - counts[q + 1] / m)
+            for k in range(q, 0, -1):
+                z = 0.5 * (z + counts[k])
+            z += m * _sigma(counts[0] / m)
+            estimates.append(m * m / (2 * np.log(2) * z))
+        return pd.Series(np.rint(np.array(estimates, dtype="float64")).astype("int64"), index=self.keys)
+
+    def error_bound(self) -> dict:
+        """Relative error bound of ``estimates`` (about 95% confidence)."""
+        return {
+            "method": "hyperloglog",
+            "confidence": _HLL_CONFIDENCE,
+            "relative_error": round(float(_HLL_SIGMAS * self.relative_error), 4),
+            "estimate": None,
+            "lower": None,
+            "upper": None,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GroupedHyperLogLog):
+            return NotImplemented
+        return (self.precision == other.precision and np.array_equal(self.keys, other.keys)
+                and np.array_equal(self.registers, other.registers))
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch over non-negative values.
+
+    Positive values fall in logarithmic buckets ``(gamma**(k-1),
+    gamma**k]`` with ``gamma = (1 + a) / (1 - a)``, so a bucket's
+    representative is within relative accuracy ``a`` of every value in
+    it; zeros are counted separately. Only bucket counts are kept, so
+    sketches merge (and values are removed) by adding (subtracting)
+    counts, exactly.
+
+    Attributes:
+        accuracy (float): Relative accuracy ``a`` of returned values.
+        offset (int): Index of the first stored bucket.
+        counts (np.ndarray): Values per bucket from ``offset`` on.
+        zeros (int): Number of zero values.
+    """
+
+    def __init__(self, accuracy: float = QUANTILE_ACCURACY, offset: int = 0,
+                 counts: Optional[np.ndarray] = None, zeros: int = 0):
+        """
+        Args:
+            accuracy (float): Relative accuracy. Defaults to QUANTILE_ACCURACY.
+            offset (int): Index of the first bucket in ``counts``.
+            counts (Optional[np.ndarray]): Existing bucket counts.
+            zeros (int): Existing count of zero values.
+        """
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.offset = int(offset)
+        self.counts = counts if counts is not None else np.zeros(0, dtype="int64")
+        self.zeros = int(zeros)
+
+    def __len__(self) -> int:
+        return self.zeros + int(self.counts.sum())
+
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(values) / np.log(self.gamma)).astype("int64")
+
+    def _combine(self, offset: int, counts: np.ndarray, zeros: int, sign: int) -> None:
+        """Adds (sign 1) or subtracts (sign -1) bucket counts, then trims empty edges."""
+        if len(counts):
+            lo = min(self.offset, offset) if len(self.counts) else offset
+            hi = max(self.offset + len(self.counts), offset + len(counts))
+            combined = np.zeros(hi - lo, dtype="int64")
+            combined[self.offset - lo:self.offset - lo + len(self.counts)] = self.counts
+            combined[offset - lo:offset - lo + len(counts)] += sign * counts
+            if combined.min() < 0:
+                raise ValueError("Cannot remove values that were never added to the sketch")
+            used = np.flatnonzero(combined)
+            if len(used):
+                self.offset, self.counts = lo + int(used[0]), combined[used[0]:used[-1] + 1]
+            else:
+                self.offset, self.counts = 0, np.zeros(0, dtype="int64")
+        self.zeros += sign * zeros
+        if self.zeros < 0:
+            raise ValueError("Cannot remove values that were never added to the sketch")
+
+    def _histogram(self, values) -> tuple:
+        values = np.asarray(values, dtype="float64")
+        positive = values[values > 0]
+        if not len(positive):
+            return 0, np.zeros(0, dtype="int64"), len(values)
+        buckets = self._bucket(positive)
+        offset = int(buckets.min())
+        return offset, np.bincount(buckets - offset).astype("int64"), len(values) - len(positive)
+
+    def add(self, values) -> None:
+        """Adds values (negative ones count as zero)."""
+        self._combine(*self._histogram(values), sign=1)
+
+    def remove(self, values) -> None:
+        """
+        Removes values that were previously added.
+
+        Raises:
+            ValueError: If a bucket would become negative.
+        """
+        self._combine(*self._histogram(values), sign=-1)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Folds another sketch with the same accuracy into this one.
+
+        Raises:
+            ValueError: If the accuracies differ.
+        """
+        if other.accuracy != self.accuracy:
+            raise ValueError(f"Cannot merge quantile sketch accuracy {other.accuracy} into {self.accuracy}")
+        self._combine(other.offset, other.counts, other.zeros, sign=1)
+
+    def _locate(self, rank: int) -> tuple:
+        """Bounds ``(lower, upper)`` of the value at a 0-based rank."""
+        if rank < self.zeros:
+            return 0.0, 0.0
+        k = self.offset + int(np.searchsorted(np.cumsum(self.counts), rank - self.zeros, side="right"))
+        return float(self.gamma ** (k - 1)), float(self.gamma ** k)
+
+    def threshold_quantile(self, q: float, threshold: float) -> Optional[dict]:
+        """
+        Estimates the linear-interpolated ``q`` quantile of values >= threshold.
+
+        The values at or above ``threshold`` are a suffix of the sorted
+        data. Its length is known except for the bucket holding the
+        threshold, which bounds the rank of the quantile; the returned
+        interval covers every value that rank range can take, widened to
+        the edges of the buckets involved, so it holds the exact answer
+        with certainty.
+
+        Args:
+            q (float): Quantile in [0, 1].
+            threshold (float): Minimum value, inclusive.
+
+        Returns:
+            Optional[dict]: Estimate, lower and upper bound of the
+            quantile, or None if no value can reach the threshold.
+        """
+        total = len(self)
+        if threshold <= 0:
+            below, ambiguous = 0, 0
+        else:
+            k = int(self._bucket(np.array([threshold]))[0])
+            position = min(max(k - self.offset, 0), len(self.counts))
+            below = self.zeros + int(self.counts[:position].sum())
+            ambiguous = int(self.counts[position]) if position < len(self.counts) and k >= self.offset else 0
+        longest = total - below
+        if longest == 0:
+            return None
+        shortest = longest - ambiguous
+
+        def position_of(count: int) -> float:
+            # Global 0-based position of the quantile of a suffix of ``count`` values
+            return total - count + (count - 1) * q
+
+        lower, _ = self._locate(int(np.floor(position_of(longest))))
+        _, upper = self._locate(min(total - 1, int(np.ceil(position_of(max(shortest, 1))))))
+        bucket_lo, bucket_hi = self._locate(int(round(position_of(longest - ambiguous // 2))))
+        estimate = 0.0 if bucket_hi == 0 else 2 * bucket_hi / (self.gamma + 1)
+        return {"estimate": estimate, "lower": lower, "upper": upper}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, QuantileSketch):
+            return NotImplemented
+        return (self.accuracy == other.accuracy and self.offset == other.offset
+                and self.zeros == other.zeros and np.array_equal(self.counts, other.counts))
+
+
+class MovieSketches:
+    """
+    The sketches of one dataset: distinct titles per year, language and
+    genre, and vote counts over the genre bridge.
+
+    Vote counts are sketched once per genre link, the population the
+    weighted-rating prior is taken over (see WeightedRatingIndex).
+
+    Attributes:
+        titles (Dict[str, GroupedHyperLogLog]): Distinct-title counters by dimension.
+        votes (QuantileSketch): Vote count of every genre link.
+    """
+
+    def __init__(self, titles: Optional[Dict[str, GroupedHyperLogLog]] = None,
+                 votes: Optional[QuantileSketch] = None):
+        """
+        Args:
+            titles (Optional[Dict[str, GroupedHyperLogLog]]): Existing counters; empty by default.
+            votes (Optional[QuantileSketch]): Existing vote-count sketch; empty by default.
+        """
+        self.titles = titles or {dimension: GroupedHyperLogLog() for dimension in DIMENSIONS}
+        self.votes = votes or QuantileSketch()
+        self._estimates: Dict[str, pd.Series] = {}
+
+    @classmethod
+    def _build(cls, movies: pd.DataFrame, link_rows: np.ndarray, link_genres: np.ndarray) -> "MovieSketches":
+        """Sketches a movies table and its genre links (row position and genre name)."""
+        sketches = cls()
+        titles = movies["Title"]
+        hashes = hash_titles(titles.astype(object))
+        counted = titles.notna().to_numpy()
+        sketches.titles["year"].add(movies["Release_Date"].dt.year.to_numpy(dtype="int64"), hashes, counted)
+        sketches.titles["language"].add(movies["Original_Language"].astype(str).to_numpy(dtype=str), hashes, counted)
+        sketches.titles["genre"].add(np.asarray(link_genres, dtype=str), hashes[link_rows], counted[link_rows])
+        sketches.votes.add(movies["Vote_Count"].to_numpy(dtype="float64")[link_rows])
+        return sketches
+
+    @classmethod
+    def from_dataset(cls, dataset: MovieDataset) -> "MovieSketches":
+        """
+        Sketches a cleaned dataset.
+
+        Args:
+            dataset (MovieDataset): The dataset.
+
+        Returns:
+            MovieSketches: Its sketches.
+        """
+        return cls._build(dataset.movies, dataset.genre_movie_ids(), dataset.genres["Genre"].astype(str).to_numpy())
+
+    @classmethod
+    def from_rows(cls, df: pd.DataFrame) -> "MovieSketches":
+        """
+        Sketches cleaned rows with list-valued 'Genre' (a shard or chunk).
+
+        Genres are split out exactly as ``MovieDataset.build_bridge`` does,
+        so the merged sketches of all shards equal those of the dataset.
+
+        Args:
+            df (pd.DataFrame): Output of ``MovieDataPreprocessor.clean_rows``.
+
+        Returns:
+            MovieSketches: The sketches of these rows.
+        """
+        bridge = MovieDataset.build_bridge(np.arange(len(df)), df["Genre"])
+        return cls._build(df.reset_index(drop=True), bridge["Movie_Id"].to_numpy(), bridge["Genre"].astype(str).to_numpy())
+
+    def merge(self, other: "MovieSketches") -> "MovieSketches":
+        """
+        Folds the sketches of disjoint data into these.
+
+        Args:
+            other (MovieSketches): Sketches of other movies.
+
+        Returns:
+            MovieSketches: ``self``, now describing both.
+        """
+        for dimension, counter in other.titles.items():
+            self.titles[dimension].merge(counter)
+        self.votes.merge(other.votes)
+        self._estimates.clear()
+        return self
+
+    def recount(self, dimension: str, keys, dataset: MovieDataset) -> None:
+        """
+        Rebuilds the counters of some groups from a dataset.
+
+        HyperLogLog cannot forget an item, so groups that lost a movie
+        are counted again from the rows that now feed them.
+
+        Args:
+            dimension (str): One of DIMENSIONS.
+            keys: Group keys to rebuild.
+            dataset (MovieDataset): The current dataset.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        fresh = MovieSketches.from_dataset(_restrict(dataset, dimension, keys)).titles[dimension]
+        fresh.drop([key for key in fresh.keys.tolist() if key not in keys])
+        self.titles[dimension].drop(keys)
+        self.titles[dimension].merge(fresh)
+        self._estimates.clear()
+
+    def distinct_titles(self, dimension: str) -> pd.Series:
+        """
+        Estimated distinct titles per group of a dimension.
+
+        Args:
+            dimension (str): One of DIMENSIONS.
+
+        Returns:
+            pd.Series: Estimates indexed by sorted group key.
+
+        Raises:
+            ValueError: If ``dimension`` is unknown.
+        """
+        if dimension not in self.titles:
+            raise ValueError(f"Unsupported dimension '{dimension}'. Expected one of {list(DIMENSIONS)}")
+        estimates = self._estimates.get(dimension)
+        if estimates is None:
+            estimates = self._estimates[dimension] = self.titles[dimension].estimates()
+        return estimates.copy()
+
+    def save(self, path: Path, fingerprint: dict) -> None:
+        """
+        Persists the sketches as an ``.npz`` archive.
+
+        Args:
+            path (Path): Destination file.
+            fingerprint (dict): ``dataset_fingerprint`` of the data sketched.
+        """
+        meta = {
+            "version": SKETCHES_VERSION,
+            "fingerprint": fingerprint,
+            "precision": self.titles["year"].precision,
+            "accuracy": self.votes.accuracy,
+            "votes_offset": self.votes.offset,
+            "votes_zeros": self.votes.zeros,
+        }
+        arrays = {"meta": np.array(json.dumps(meta)), "votes_counts": self.votes.counts}
+        for dimension, counter in self.titles.items():
+            arrays[f"{dimension}_keys"] = counter.keys
+            arrays[f"{dimension}_registers"] = counter.registers
+        logger.info(f"Saving analytics sketches to {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: dict) -> Optional["MovieSketches"]:
+        """
+        Loads persisted sketches if they describe the given data.
+
+        Args:
+            path (Path): Location of the ``.npz`` archive.
+            fingerprint (dict): ``dataset_fingerprint`` of the loaded dataset.
+
+        Returns:
+            Optional[MovieSketches]: The sketches, or None if the file is
+            missing, unreadable or was built from different data.
+        """
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                meta = json.loads(str(archive["meta"]))
+                if meta.get("version") != SKETCHES_VERSION:
+                    return None
+                if meta.get("fingerprint") != fingerprint:
+                    logger.warning(f"Sketches {path} do not match the loaded dataset; rebuilding")
+                    return None
+                titles = {
+                    dimension: GroupedHyperLogLog(meta["precision"], archive[f"{dimension}_keys"],
+                                                  archive[f"{dimension}_registers"])
+                    for dimension in DIMENSIONS
+                }
+                votes = QuantileSketch(meta["accuracy"], meta["votes_offset"], archive["votes_counts"],
+                                       meta["votes_zeros"])
+                return cls(titles, votes)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable sketches {path}: {e}")
+            return None
+
+
+def _restrict(dataset: MovieDataset, dimension: str, keys: set) -> MovieDataset:
+    """Narrows a dataset to the movies (and links) feeding some groups of a dimension."""
+    movies, genres = dataset.movies, dataset.genres
+    if dimension == "genre":
+        links = genres[genres["Genre"].astype(str).isin(keys)]
+        ids = np.unique(links["Movie_Id"].to_numpy())
+        positions = np.searchsorted(ids, links["Movie_Id"].to_numpy())
+        return MovieDataset(
+            movies=movies.iloc[ids].reset_index(drop=True),
+            genres=pd.DataFrame({"Movie_Id": positions.astype("int32"), "Genre": links["Genre"].astype(str).to_numpy()}),
+        )
+    if dimension == "year":
+        selected = movies["Release_Date"].dt.year.isin(keys)
+    else:
+        selected = movies["Original_Language"].astype(str).isin(keys)
+    return MovieDataset(movies=movies[selected.to_numpy()].reset_index(drop=True), genres=genres.iloc[:0])
+
+
+def _left_groups(previous: MovieDataset, replaced_ids: np.ndarray, delta: pd.DataFrame) -> Dict[str, Set[str]]:
+    """
+    Language and genre groups that replaced movies no longer belong to.
+
+    A replacement keeps its (Release_Date, Title) key, so its title still
+    counts in every group its new version belongs to; only the groups its
+    old version was in and its new version is not need a recount.
+
+    Args:
+        previous (MovieDataset): Dataset before the delta.
+        replaced_ids (np.ndarray): Ids of the replaced movies in ``previous``.
+        delta (pd.DataFrame): Cleaned delta rows with list-valued 'Genre'.
+
+    Returns:
+        Dict[str, Set[str]]: Dimension ('language', 'genre') to group keys.
+    """
+    replaced_ids = np.asarray(replaced_ids, dtype="int64")
+    old = previous.movies.iloc[replaced_ids]
+    old_keys = list(zip(old[SORT_KEYS[0]], old[SORT_KEYS[1]]))
+    new_keys = list(zip(delta[SORT_KEYS[0]], delta[SORT_KEYS[1]]))
+
+    old_languages = set(zip(old_keys, old["Original_Language"].astype(str)))
+    new_languages = set(zip(new_keys, delta["Original_Language"].astype(str)))
+
+    key_of = dict(zip(replaced_ids.tolist(), old_keys))
+    links = previous.genres[previous.genres["Movie_Id"].isin(key_of)]
+    old_genres = set(zip(links["Movie_Id"].map(key_of), links["Genre"].astype(str)))
+    new_genres = {(key, str(genre)) for key, genres in zip(new_keys, delta["Genre"]) for genre in genres}
+
+    return {
+        "language": {group for _, group in old_languages - new_languages},
+        "genre": {group for _, group in old_genres - new_genres},
+    }
+
+
+def refresh_sketches(path: Path, previous: MovieDataset, dataset: MovieDataset, delta: pd.DataFrame,
+                     replaced_ids: np.ndarray, target: Optional[Path] = None) -> None:
+    """
+    Updates persisted sketches after a delta was merged into the dataset.
+
+    The delta's sketches are merged in and the vote counts of replaced
+    movies are removed from the quantile sketch. A replaced movie keeps
+    its title and release year, so the per-year counters stay valid; the
+    language and genre groups it left are recounted, since a HyperLogLog
+    cannot forget a title, while groups it stayed in still count it. The
+    result equals sketching ``dataset`` from scratch. If the stored
+    sketches are missing or do not describe ``previous``, they are
+    rebuilt instead.
+
+    Args:
+        path (Path): Location of the ``.npz`` archive.
+        previous (MovieDataset): Dataset the stored sketches were built from.
+        dataset (MovieDataset): The merged dataset.
+        delta (pd.DataFrame): Cleaned delta rows with list-valued 'Genre'.
+        replaced_ids (np.ndarray): Ids of the replaced movies in ``previous``.
+        target (Optional[Path]): Where to write the result, e.g. a staging
+                                 path. Defaults to ``path``.
+    """
+    target = target or path
+    sketches = MovieSketches.load(path, dataset_fingerprint(previous))
+    if sketches is None:
+        logger.info("No reusable sketches; rebuilding them")
+        MovieSketches.from_dataset(dataset).save(target, dataset_fingerprint(dataset))
+        return
+
+    links = previous.genre_movie_ids()
+    sketches.votes.remove(previous.movies["Vote_Count"].to_numpy(dtype="float64")[links[np.isin(links, replaced_ids)]])
+    sketches.merge(MovieSketches.from_rows(delta))
+    left = _left_groups(previous, replaced_ids, delta)
+    sketches.recount("language", left["language"], dataset)
+    sketches.recount("genre", left["genre"], dataset)
+    logger.info(
+        f"Refreshed sketches for {len(delta)} delta movies ({len(replaced_ids)} replaced, "
+        f"{len(left['language'])} languages and {len(left['genre'])} genres recounted)"
+    )
+    sketches.save(target, dataset_fingerprint(dataset))
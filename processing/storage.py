@@ -0,0 +1,246 @@
+"""
+Dataset Storage Module
+----------------------
+Reads and writes the cleaned movie dataset (movies table plus genre
+bridge). CSV is always produced as a portable fallback; typed columnar
+artifacts (Arrow IPC/Feather or Parquet) are written alongside it and
+memory-mapped on load when available.
+"""
+import pandas as pd
+import logging
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from processing.dataset import MovieDataset
+# Path helpers live in the lightweight paths module; re-exported for callers
+from processing.paths import (
+    SUPPORTED_FORMATS,
+    aggregates_path,
+    artifact_path,
+    columnar_available,
+    genres_path,
+    report_path,
+    resolve_source,
+    search_index_path,
+    sketches_path,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    feather = None
+    pq = None
+
+CATEGORICAL_COLUMNS = ["Genre", "Original_Language"]
+
+
+def _read_table(path: Path, data_format: str, columns: Optional[List[str]] = None, **csv_kwargs) -> pd.DataFrame:
+    """
+    Reads one table, optionally projecting a subset of columns; requested
+    columns the file does not have are skipped. Columnar files are opened
+    through a memory map so that several worker processes share the OS
+    page cache.
+    """
+    if data_format == "feather":
+        table = feather.read_table(path, memory_map=True)
+        return (table if columns is None else table.select([c for c in columns if c in table.column_names])).to_pandas()
+    if data_format == "parquet":
+        if columns is not None:
+            columns = [c for c in columns if c in pq.read_schema(path).names]
+        return pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+    if columns is not None:
+        wanted = set(columns)
+        return pd.read_csv(path, usecols=lambda column: column in wanted, **csv_kwargs)
+    return pd.read_csv(path, **csv_kwargs)
+
+
+def _write_table(df: pd.DataFrame, path: Path, data_format: str) -> None:
+    """Writes one table in the given format."""
+    if data_format == "feather":
+        # Uncompressed so the file can be memory-mapped without decoding.
+        df.reset_index(drop=True).to_feather(path, compression="uncompressed")
+    elif data_format == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def read_dataset(path: Path, data_format: str, columns: Optional[List[str]] = None) -> MovieDataset:
+    """
+    Loads a cleaned dataset artifact and its genre bridge.
+
+    Files produced before the normalized layout (one row per movie and
+    genre, no ``Movie_Id``) are normalized on the fly.
+
+    Args:
+        path (Path): Movies artifact path.
+        data_format (str): Storage format of ``path``.
+        columns (Optional[List[str]]): Movie columns to load. ``Movie_Id`` is
+                                       always included. Defaults to all columns.
+
+    Returns:
+        MovieDataset: The cleaned, normalized dataset.
+    """
+    if columns is not None:
+        # Genre is only present (and needed) in legacy exploded files
+        columns = ["Movie_Id"] + [c for c in columns if c != "Movie_Id"] + ["Genre"]
+    parse_dates = ["Release_Date"] if columns is None or "Release_Date" in columns else False
+    movies = _read_table(path, data_format, columns=columns, parse_dates=parse_dates)
+    if "Movie_Id" not in movies.columns:
+        logger.warning(f"{path} uses the legacy exploded layout; normalizing in memory")
+        return MovieDataset.from_exploded(movies)
+
+    genres = _read_table(genres_path(path), data_format, dtype={"Movie_Id": "int32", "Genre": "category"})
+    return MovieDataset(movies=movies, genres=genres)
+
+
+def write_dataset(dataset: MovieDataset, csv_path: Path, data_format: str) -> None:
+    """
+    Persists the cleaned dataset as CSV plus the configured columnar artifacts.
+
+    The genre bridge is written before the movies table in each format, so
+    a reader watching the movies file never sees it without its bridge.
+    Categorical columns keep a compact dictionary encoding in columnar files.
+
+    Args:
+        dataset (MovieDataset): The cleaned dataset to save.
+        csv_path (Path): Destination of the movies CSV.
+        data_format (str): Additional format to write ("csv" writes CSV only).
+    """
+    csv_path = Path(csv_path)
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_table(dataset.genres, genres_path(csv_path), "csv")
+    _write_table(dataset.movies, csv_path, "csv")
+
+    if data_format == "csv":
+        return
+    if not columnar_available():
+        logger.warning(f"pyarrow is not installed; skipping {data_format} artifact (CSV only)")
+        return
+
+    path = artifact_path(csv_path, data_format)
+    logger.info(f"Saving {data_format} artifacts to {path}")
+    movies = dataset.movies.astype({col: "category" for col in CATEGORICAL_COLUMNS if col in dataset.movies.columns})
+    _write_table(dataset.genres, genres_path(path), data_format)
+    _write_table(movies, path, data_format)
+
+
+class _ColumnarAppender:
+    """Appends DataFrame batches to one Feather (Arrow IPC) or Parquet file."""
+
+    def __init__(self, path: Path, data_format: str):
+        self.path = path
+        self.data_format = data_format
+        self._schema = None
+        self._writer = None
+
+    def append(self, df: pd.DataFrame) -> None:
+        if self._schema is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # A batch whose text column is entirely missing infers the null
+            # type; pin such columns to string so later batches still fit.
+            self._schema = pa.schema(
+                [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema],
+                metadata=table.schema.metadata,
+            )
+            table = table.cast(self._schema)
+            if self.data_format == "feather":
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+            else:
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class DatasetWriter:
+    """
+    Writes a cleaned dataset incrementally, one sorted batch at a time.
+
+    CSV artifacts are appended as batches arrive. Columnar artifacts need
+    the final category sets for their dictionaries, so batches are spooled
+    to disk and converted in a second streaming pass on ``close``.
+
+    Attributes:
+        csv_path (Path): Destination of the movies CSV.
+        data_format (str): Additional columnar format, or "csv".
+        movie_rows (int): Movies written so far.
+        genre_rows (int): Bridge rows written so far.
+        schema (Optional[Dict[str, Dict[str, str]]]): Column dtypes of the
+            first batch (see MovieDataset.schema).
+    """
+
+    def __init__(self, csv_path: Path, data_format: str, spool_path: Path):
+        """
+        Args:
+            csv_path (Path): Destination of the movies CSV.
+            data_format (str): "csv", "feather" or "parquet".
+            spool_path (Path): Scratch file used for the columnar pass.
+        """
+        self.csv_path = Path(csv_path)
+        self.data_format = data_format
+        if data_format != "csv" and not columnar_available():
+            logger.warning(f"pyarrow is not installed; skipping {data_format} artifact (CSV only)")
+            self.data_format = "csv"
+        self.movie_rows = 0
+        self.genre_rows = 0
+        self.schema: Optional[Dict[str, Dict[str, str]]] = None
+        self._spool_path = Path(spool_path)
+        self._spool = open(self._spool_path, "wb") if self.data_format != "csv" else None
+        self._categories = {col: set() for col in CATEGORICAL_COLUMNS}
+
+    def write(self, batch: MovieDataset) -> None:
+        """
+        Appends one batch. Batches must arrive in final sort order.
+
+        Args:
+            batch (MovieDataset): Movies and bridge rows for this batch.
+        """
+        first = self.movie_rows == 0
+        if first:
+            self.schema = batch.schema()
+        batch.genres.to_csv(genres_path(self.csv_path), mode="w" if first else "a", header=first, index=False)
+        batch.movies.to_csv(self.csv_path, mode="w" if first else "a", header=first, index=False)
+        self.movie_rows += len(batch.movies)
+        self.genre_rows += len(batch.genres)
+
+        if self._spool is not None:
+            self._categories["Original_Language"].update(batch.movies["Original_Language"].unique())
+            self._categories["Genre"].update(batch.genres["Genre"].unique())
+            pickle.dump((batch.movies, batch.genres), self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def close(self) -> None:
+        """Finishes the CSV artifacts and builds the columnar ones."""
+        if self.movie_rows == 0:
+            raise ValueError("No cleaned rows were written; nothing to publish")
+        if self._spool is None:
+            return
+        self._spool.close()
+
+        language_dtype = pd.CategoricalDtype(sorted(self._categories["Original_Language"]))
+        genre_dtype = pd.CategoricalDtype(sorted(self._categories["Genre"]))
+        path = artifact_path(self.csv_path, self.data_format)
+        logger.info(f"Saving {self.data_format} artifacts to {path}")
+        movies_out = _ColumnarAppender(path, self.data_format)
+        genres_out = _ColumnarAppender(genres_path(path), self.data_format)
+        with open(self._spool_path, "rb") as f:
+            while True:
+                try:
+                    movies, genres = pickle.load(f)
+                except EOFError:
+                    break
+                movies_out.append(movies.astype({"Original_Language": language_dtype}))
+                genres_out.append(genres.astype({"Genre": genre_dtype}))
+        movies_out.close()
+        genres_out.close()
+        self._spool_path.unlink(missing_ok=True)
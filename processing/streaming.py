@@ -0,0 +1,182 @@
+"""
+Streaming Sort Helpers
+----------------------
+Bounded-memory building blocks for preprocessing raw files larger than
+RAM: sorted runs spilled to disk in fixed-size blocks, and a vectorized
+k-way external merge that restores the global (Release_Date, Title) order.
+"""
+import logging
+import pickle
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ["Release_Date", "Title"]
+
+
+def _sort_key(release_date: pd.Timestamp, title) -> Tuple:
+    """
+    Python-comparable key matching ``sort_values(SORT_KEYS)`` ordering,
+    where missing titles sort after every title of the same date.
+    """
+    if isinstance(title, str):
+        return (release_date.value, 0, title)
+    return (release_date.value, 1, "")
+
+
+def _rows_up_to(block: pd.DataFrame, bound: Tuple) -> int:
+    """
+    Counts the leading rows of a sorted block whose key is <= ``bound``.
+
+    Args:
+        block (pd.DataFrame): A block sorted by SORT_KEYS.
+        bound (Tuple): Key produced by ``_sort_key``.
+
+    Returns:
+        int: Length of the qualifying prefix.
+    """
+    bound_date, bound_missing, bound_title = bound
+    dates = block["Release_Date"].to_numpy().view("int64")
+    if bound_missing:
+        same_date_ok = True
+    else:
+        titles = block["Title"]
+        same_date_ok = (titles.notna() & (titles.astype(object) <= bound_title)).to_numpy()
+    mask = (dates < bound_date) | ((dates == bound_date) & same_date_ok)
+    return int(mask.sum())
+
+
+class RunFile:
+    """
+    A sorted run stored on disk as a sequence of pickled DataFrame blocks.
+
+    Blocks can be read back one at a time, so merging never needs more
+    than one block per run in memory.
+
+    Attributes:
+        path (Path): Location of the run file.
+        rows (int): Number of rows written.
+    """
+
+    def __init__(self, path: Path, block_rows: int):
+        """
+        Opens a new, empty run for writing.
+
+        Args:
+            path (Path): Destination file (overwritten).
+            block_rows (int): Maximum rows per stored block.
+        """
+        self.path = Path(path)
+        self.block_rows = max(1, block_rows)
+        self.rows = 0
+        self._handle = open(self.path, "wb")
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Appends already-sorted rows to the run, split into blocks."""
+        for start in range(0, len(df), self.block_rows):
+            pickle.dump(df.iloc[start:start + self.block_rows], self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(df)
+
+    def close(self) -> "RunFile":
+        """Finishes writing; the run can then be read with ``blocks``."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        return self
+
+    def blocks(self) -> Iterator[pd.DataFrame]:
+        """Yields the stored blocks in order."""
+        with open(self.path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def unlink(self) -> None:
+        """Deletes the run from disk."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def merge_runs(runs: List[RunFile]) -> Iterator[pd.DataFrame]:
+    """
+    Merges sorted runs into globally sorted batches.
+
+    At each step the smallest "last key" among the buffered blocks is a
+    safe bound: every buffered row at or below it can be emitted. The
+    emitted rows are concatenated in run order and stably sorted, so ties
+    keep the order of the runs (and therefore of the source file).
+
+    Args:
+        runs (List[RunFile]): Runs in source order, each sorted by SORT_KEYS.
+
+    Yields:
+        pd.DataFrame: Consecutive sorted batches of the merged output.
+    """
+    iterators = [run.blocks() for run in runs]
+    buffers: List[Optional[pd.DataFrame]] = [next(it, None) for it in iterators]
+
+    while True:
+        active = [i for i, block in enumerate(buffers) if block is not None]
+        if not active:
+            return
+
+        bound = min(
+            _sort_key(buffers[i]["Release_Date"].iloc[-1], buffers[i]["Title"].iloc[-1])
+            for i in active
+        )
+        parts = []
+        for i in active:
+            block = buffers[i]
+            count = _rows_up_to(block, bound)
+            if count:
+                parts.append(block.iloc[:count])
+            if count == len(block):
+                buffers[i] = next(iterators[i], None)
+            else:
+                buffers[i] = block.iloc[count:]
+
+        batch = pd.concat(parts, ignore_index=True)
+        if len(parts) > 1:
+            batch = batch.sort_values(by=SORT_KEYS, kind="stable").reset_index(drop=True)
+        yield batch
+
+
+def external_sort(runs: List[RunFile], fan_in: int, work_dir: Path, block_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Merges any number of runs while keeping at most ``fan_in`` open at once.
+
+    Extra passes merge consecutive groups of runs into larger runs until
+    the final merge fits within the fan-in.
+
+    Args:
+        runs (List[RunFile]): Sorted runs in source order.
+        fan_in (int): Maximum runs merged in a single pass.
+        work_dir (Path): Directory for intermediate runs.
+        block_rows (int): Block size for intermediate runs.
+
+    Yields:
+        pd.DataFrame: Globally sorted batches.
+    """
+    fan_in = max(2, fan_in)
+    level = 0
+    while len(runs) > fan_in:
+        level += 1
+        logger.info(f"Merge pass {level}: {len(runs)} runs, fan-in {fan_in}")
+        merged = []
+        for group_start in range(0, len(runs), fan_in):
+            group = runs[group_start:group_start + fan_in]
+            out = RunFile(work_dir / f"merge-{level}-{group_start}.run", block_rows)
+            for batch in merge_runs(group):
+                out.append(batch)
+            merged.append(out.close())
+            for run in group:
+                run.unlink()
+        runs = merged
+
+    yield from merge_runs(runs)
+    for run in runs:
+        run.unlink()
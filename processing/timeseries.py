@@ -0,0 +1,290 @@
+"""
+Release Time Series
+-------------------
+Release-date ordered index answering time-series questions over
+arbitrary date ranges: release counts per month, quarter or year and
+rolling averages of rating and popularity, for the whole catalog or
+per genre or language. Built once at load time; each query is a handful
+of binary searches and prefix-sum differences.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from processing.dataset import MovieDataset
+
+# Period name -> (numpy calendar unit, months per period)
+FREQUENCIES = {
+    "month": ("M", 1),
+    "quarter": ("M", 3),
+    "year": ("Y", 1),
+}
+
+# Breakdowns a series can be split by; None is the whole catalog
+GROUPINGS = ("genre", "language")
+
+# Upper bound on groups x periods in one result
+MAX_POINTS = 50_000
+
+_DAY_NS = 86_400 * 10**9
+
+
+class _GroupedDates:
+    """
+    Release dates and metric prefix sums of several groups of movies.
+
+    Groups are stored back to back: group ``g`` owns positions
+    ``offsets[g]:offsets[g + 1]``, sorted by release date. The prefix sums
+    run over the concatenation, so the sum over any run of positions
+    inside one group is the difference of two entries.
+    """
+
+    def __init__(self, names: np.ndarray, codes: np.ndarray, dates: np.ndarray, metrics: np.ndarray):
+        """
+        Args:
+            names (np.ndarray): Group names, indexed by code.
+            codes (np.ndarray): Group code of each row.
+            dates (np.ndarray): Release date of each row, as int64 nanoseconds.
+            metrics (np.ndarray): (rows, 2) vote average and popularity of each row.
+        """
+        order = np.lexsort((dates, codes))
+        self.names = np.asarray(names, dtype=object)
+        self.lookup = {str(name).lower(): code for code, name in enumerate(self.names)}
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(names)))]).astype("int64")
+        self.dates = dates[order]
+        self.prefix = np.concatenate([np.zeros((1, 2)), np.cumsum(metrics[order], axis=0)])
+
+    def segment(self, code: int) -> Tuple[int, np.ndarray]:
+        """Offset of a group's rows and its sorted release dates."""
+        start, end = self.offsets[code], self.offsets[code + 1]
+        return int(start), self.dates[start:end]
+
+
+class ReleaseTimeline:
+    """
+    Answers release-count and rolling-average queries over date ranges.
+
+    Movies are kept in release-date order once per grouping (all movies,
+    per genre via the bridge, per language), together with cumulative
+    sums of ``Vote_Average`` and ``Popularity`` in the same order. For a
+    query, the boundaries of every requested period are located with one
+    vectorized binary search per group; counts are differences of
+    positions and window means are differences of prefix sums divided by
+    counts. A query therefore costs O(periods * log n) per group, however
+    many movies fall in the range, instead of a scan and groupby over the
+    catalog.
+
+    Only movies released within ``[start, end]`` contribute, so the
+    first and last periods of a range may be partial.
+
+    Attributes:
+        first_date (Optional[pd.Timestamp]): Earliest release date (None if empty).
+        last_date (Optional[pd.Timestamp]): Latest release date (None if empty).
+    """
+
+    def __init__(self, dataset: MovieDataset):
+        """
+        Builds the index.
+
+        Args:
+            dataset (MovieDataset): The cleaned dataset.
+        """
+        movies = dataset.movies
+        dates = movies["Release_Date"].to_numpy(dtype="datetime64[ns]").view("int64")
+        metrics = np.column_stack([
+            movies["Vote_Average"].to_numpy(dtype="float64"),
+            movies["Popularity"].to_numpy(dtype="float64"),
+        ])
+
+        bridge_ids = dataset.genre_movie_ids()
+        language_codes, languages = pd.factorize(movies["Original_Language"].astype(str), sort=True)
+        self._groups: Dict[Optional[str], _GroupedDates] = {
+            None: _GroupedDates(np.array(["all"]), np.zeros(len(movies), dtype="int64"), dates, metrics),
+            "genre": _GroupedDates(
+                dataset.genres["Genre"].cat.categories,
+                dataset.genres["Genre"].cat.codes.to_numpy().astype("int64"),
+                dates[bridge_ids],
+                metrics[bridge_ids],
+            ),
+            "language": _GroupedDates(languages, language_codes.astype("int64"), dates, metrics),
+        }
+        catalog = self._groups[None].dates
+        self.first_date = pd.Timestamp(catalog[0]) if len(catalog) else None
+        self.last_date = pd.Timestamp(catalog[-1]) if len(catalog) else None
+
+    def __len__(self) -> int:
+        return len(self._groups[None].dates)
+
+    def _periods(self, freq: str, start, end) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Labels and boundaries of the periods covering ``[start, end]``.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Period labels and the ``periods + 1``
+            boundaries in int64 nanoseconds, clipped to the range.
+
+        Raises:
+            ValueError: If ``freq`` is unknown or the range is empty.
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unsupported frequency '{freq}'. Expected one of {list(FREQUENCIES)}")
+        first = np.datetime64(start if start is not None else self.first_date, "D")
+        last = np.datetime64(end if end is not None else self.last_date, "D")
+        if last < first:
+            raise ValueError(f"Empty date range: {first} is after {last}")
+
+        unit, step = FREQUENCIES[freq]
+        lo, hi = first.astype(f"datetime64[{unit}]"), last.astype(f"datetime64[{unit}]")
+        if step > 1:
+            lo -= lo.astype("int64") % step
+            hi -= hi.astype("int64") % step
+        starts = np.arange(lo, hi + step, step)
+        bounds = np.append(starts, starts[-1] + step).astype("datetime64[ns]").view("int64")
+        bounds = np.clip(bounds, first.astype("datetime64[ns]").astype("int64"),
+                         last.astype("datetime64[ns]").astype("int64") + _DAY_NS)
+
+        if freq == "quarter":
+            years = starts.astype("datetime64[Y]").astype("int64") + 1970
+            quarters = starts.astype("int64") % 12 // 3 + 1
+            labels = np.array([f"{year}-Q{quarter}" for year, quarter in zip(years, quarters)], dtype=object)
+        else:
+            labels = np.datetime_as_string(starts).astype(object)
+        return labels, bounds
+
+    def _codes(self, by: Optional[str], group: Optional[str]) -> Tuple[_GroupedDates, np.ndarray]:
+        """
+        Resolves a grouping and optional group name to group codes.
+
+        Raises:
+            ValueError: If ``by`` is unknown, or ``group`` is given without ``by``.
+        """
+        if by is not None and by not in GROUPINGS:
+            raise ValueError(f"Unsupported grouping '{by}'. Expected one of {list(GROUPINGS)}")
+        if by is None and group is not None:
+            raise ValueError("Selecting a group requires a grouping ('by')")
+        groups = self._groups[by]
+        if group is None:
+            return groups, np.arange(len(groups.names))
+        code = groups.lookup.get(group.strip().lower())
+        return groups, np.array([] if code is None else [code], dtype="int64")
+
+    def _series(self, freq: str, start, end, by: Optional[str], group: Optional[str]) -> tuple:
+        """
+        Locates the period boundaries in every selected group.
+
+        Returns:
+            tuple: The grouping, the period labels and one ``(name, offset,
+            positions)`` triple per group, ``positions`` being the group-local
+            index of each period boundary.
+
+        Raises:
+            ValueError: If a parameter is invalid or the result too large.
+        """
+        groups, codes = self._codes(by, group)
+        labels, bounds = self._periods(freq, start, end)
+        if len(codes) * len(labels) > MAX_POINTS:
+            raise ValueError(
+                f"Result would have {len(codes) * len(labels)} points (limit {MAX_POINTS}); "
+                "narrow the date range, use a coarser frequency or pick one group"
+            )
+        series = []
+        for code in codes:
+            offset, dates = groups.segment(code)
+            series.append((groups.names[code], offset, np.searchsorted(dates, bounds, side="left")))
+        return groups, labels, series
+
+    @staticmethod
+    def _frame(labels: np.ndarray, series: list, columns: Dict[str, list]) -> pd.DataFrame:
+        """Stacks per-group columns into one long frame with 'Group' and 'Period' first."""
+        frame = pd.DataFrame({
+            "Group": np.repeat(np.array([name for name, _, _ in series], dtype=object), len(labels)).astype(str),
+            "Period": np.tile(labels, len(series)).astype(str),
+        })
+        for column, parts in columns.items():
+            frame[column] = np.concatenate(parts) if parts else np.empty(0)
+        return frame
+
+    def release_counts(
+        self,
+        freq: str = "year",
+        start=None,
+        end=None,
+        by: Optional[str] = None,
+        group: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Counts releases per period.
+
+        Args:
+            freq (str): "month", "quarter" or "year". Defaults to "year".
+            start: First release date, inclusive. Defaults to the earliest.
+            end: Last release date, inclusive. Defaults to the latest.
+            by (Optional[str]): "genre" or "language" to split by group.
+            group (Optional[str]): Single group to return (case-insensitive).
+
+        Returns:
+            pd.DataFrame: Columns ['Group', 'Period', 'movie_count'], one row
+            per group and period, empty periods included.
+
+        Raises:
+            ValueError: If a parameter is invalid or the result too large.
+        """
+        if len(self) == 0:
+            return pd.DataFrame(columns=["Group", "Period", "movie_count"])
+        _, labels, series = self._series(freq, start, end, by, group)
+        counts = [np.diff(positions) for _, _, positions in series]
+        return self._frame(labels, series, {"movie_count": counts})
+
+    def rolling_averages(
+        self,
+        freq: str = "month",
+        window: int = 12,
+        start=None,
+        end=None,
+        by: Optional[str] = None,
+        group: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Trailing-window means of vote average and popularity per period.
+
+        The window of a period spans it and the ``window - 1`` periods
+        before it, within ``[start, end]``.
+
+        Args:
+            freq (str): "month", "quarter" or "year". Defaults to "month".
+            window (int): Periods per window. Defaults to 12.
+            start: First release date, inclusive. Defaults to the earliest.
+            end: Last release date, inclusive. Defaults to the latest.
+            by (Optional[str]): "genre" or "language" to split by group.
+            group (Optional[str]): Single group to return (case-insensitive).
+
+        Returns:
+            pd.DataFrame: Columns ['Group', 'Period', 'movie_count',
+            'Vote_Average', 'Popularity']; ``movie_count`` counts the window
+            and the means are None for empty windows.
+
+        Raises:
+            ValueError: If a parameter is invalid or the result too large.
+        """
+        columns = ["Group", "Period", "movie_count", "Vote_Average", "Popularity"]
+        if window < 1:
+            raise ValueError(f"Window must be at least 1 period, got {window}")
+        if len(self) == 0:
+            return pd.DataFrame(columns=columns)
+        groups, labels, series = self._series(freq, start, end, by, group)
+        tails = np.maximum(np.arange(1, len(labels) + 1) - window, 0)
+        counts, means = [], []
+        for _, offset, positions in series:
+            hi, lo = positions[1:], positions[tails]
+            count = hi - lo
+            sums = groups.prefix[offset + hi] - groups.prefix[offset + lo]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means.append(sums / count[:, None])
+            counts.append(count)
+        frame = self._frame(labels, series, {"movie_count": counts})
+        stacked = np.concatenate(means) if means else np.empty((0, 2))
+        for i, column in enumerate(["Vote_Average", "Popularity"]):
+            values = pd.Series(stacked[:, i]).round(3)
+            frame[column] = values.astype(object).where(values.notna(), None)
+        return frame[columns]
@@ -0,0 +1,115 @@
+"""
+Fast Encoding Parity Tests
+--------------------------
+Every analytics response must be byte-identical with and without the
+fast JSON encoder (FAST_JSON), so that the fast path stays a pure
+optimization. A small synthetic catalog is preprocessed once, and each
+endpoint is called in both modes against the same dataset snapshot.
+"""
+import pandas as pd
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from api.core.cache import response_cache
+from api.core.config import settings
+from api.core.encoding import orjson, records_payload
+from api.core.engine import engine
+from api.core.warmup import WARMUP_PATHS
+from api.main import app
+from api.schemas import TopPopularMovie
+from benchmarks.generate import SyntheticMovieGenerator
+from processing.preprocess import MovieDataPreprocessor
+
+# Rows of the synthetic raw dump; enough for every group and index to be populated
+RAW_ROWS = 3_000
+
+# Requests compared in both modes, relative to settings.API_V1_STR: the
+# warm-up set, which calls every endpoint once, plus parameter variants
+# that take other branches of the encoders.
+PATHS = WARMUP_PATHS + (
+    "/movies/most-popular?limit=50",
+    "/movies/ranked?by=popularity&limit=1",
+    "/movies/top-rated?min_votes=0&limit=50",
+    "/movies/top-rated?min_votes=1000000",
+    "/movies/query?language=en&min_rating=7&sort_by=vote_average&order=asc&limit=100",
+    "/movies/query?genre=no-such-genre",
+    "/movies/search?q=the%20lo&prefix=false",
+    "/movies/1/similar?limit=50",
+    "/movies/yearly-trends?approximate=true",
+    "/movies/timeseries/releases?freq=quarter&by=language&group=en",
+    "/movies/timeseries/rolling?freq=year&window=3&by=genre",
+)
+
+BATCH = {
+    "panels": [
+        {"panel": "most-popular"},
+        {"panel": "ranked", "by": "vote_average"},
+        {"panel": "top-rated", "approximate": True},
+        {"panel": "query", "language": "en"},
+        {"panel": "search", "q": "lo"},
+        {"panel": "similar", "movie_id": 0},
+        {"panel": "by-genre"},
+        {"panel": "yearly-trends"},
+        {"panel": "language-stats"},
+        {"panel": "release-counts", "freq": "month", "by": "genre"},
+        {"panel": "rolling-averages"},
+    ]
+}
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """A test client serving a freshly preprocessed synthetic catalog, without response caching."""
+    root = tmp_path_factory.mktemp("encoding")
+    raw_path = root / "raw_movies.csv"
+    SyntheticMovieGenerator(seed=7).generate(RAW_ROWS).to_csv(raw_path, index=False)
+    output_path = root / "cleaned_movies.csv"
+    MovieDataPreprocessor(raw_path=raw_path, output_path=output_path).run()
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(engine, "data_path", output_path)
+        patch.setattr(engine, "_snapshot", None)
+        # Cached bodies would make both modes return the same bytes
+        patch.setattr(response_cache, "max_entries", 0)
+        # Not entered as a context manager: no lifespan, hence no warm-up
+        yield TestClient(app)
+
+
+def _both_modes(monkeypatch, send) -> tuple:
+    """Sends the same request with FAST_JSON on and off."""
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    fast = send()
+    monkeypatch.setattr(settings, "FAST_JSON", False)
+    slow = send()
+    return fast, slow
+
+
+def test_every_endpoint_is_compared():
+    paths = [path.partition("?")[0] for path in PATHS]
+    for route in app.routes:
+        if isinstance(route, APIRoute) and "GET" in route.methods and route.path.startswith(f"{settings.API_V1_STR}/movies"):
+            assert any(route.path_regex.match(settings.API_V1_STR + path) for path in paths), route.path
+
+
+def test_fast_path_is_taken(monkeypatch):
+    if orjson is None:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(settings, "FAST_JSON", True)
+    df = pd.DataFrame({"Title": ["A", "B"], "Popularity": [1.5, 2.0], "Vote_Average": [7.0, 6.5], "Vote_Count": [10, 20]})
+    columns = {"Title": "title", "Popularity": "popularity", "Vote_Average": "vote_average", "Vote_Count": "vote_count"}
+    assert isinstance(records_payload(df, TopPopularMovie, columns), bytes)
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_get_responses_are_identical(client, monkeypatch, path):
+    fast, slow = _both_modes(monkeypatch, lambda: client.get(settings.API_V1_STR + path))
+    assert fast.status_code == slow.status_code == 200
+    assert fast.content == slow.content
+
+
+def test_batch_response_is_identical(client, monkeypatch):
+    fast, slow = _both_modes(monkeypatch, lambda: client.post(f"{settings.API_V1_STR}/movies/batch", json=BATCH))
+    assert fast.status_code == slow.status_code == 200
+    assert not fast.json()["errors"]
+    assert fast.content == slow.content